@@ -0,0 +1,112 @@
+"""
+Occupancy and dwell-time reports over a synthetic visit history:
+vectorized analytics on all visits vs plain Python loops over
+a slice of them(scaled up to all visits).
+
+usage: PYTHONPATH=. python3 benchmarks/bench_analytics.py [--visits 10000000] [--spots 2000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from parking_lot import analytics
+
+S = analytics.NS_PER_SECOND
+
+
+def build_history(visits: int, spots: int, seed: int = 0) -> analytics.VisitHistory:
+    """
+    Visits back to back per parking-spot, dwell times of minutes
+    to hours, gaps of up to half an hour, last visits in progress.
+    """
+    rng = np.random.default_rng(seed)
+    per_spot = -(-visits // spots)
+    dwell_ns = rng.integers(60 * S, 4 * 3600 * S, size=(spots, per_spot))
+    gap_ns = rng.integers(0, 1800 * S, size=(spots, per_spot))
+    entry_ns = np.cumsum(dwell_ns + gap_ns, axis=1) - dwell_ns
+    exit_ns = entry_ns + dwell_ns
+    as_of_ns = int(np.median(exit_ns[:, -1]))
+    exit_ns[exit_ns > as_of_ns] = -1
+    spot_ids = np.repeat(np.arange(1, spots + 1), per_spot)
+    keep = (entry_ns.ravel() < as_of_ns)[:visits]
+    epoch_ns = time.time_ns() - as_of_ns
+    return analytics.VisitHistory(
+        spot_ids[:visits][keep],
+        rng.integers(0, 8, size=visits)[keep],
+        entry_ns.ravel()[:visits][keep] + epoch_ns,
+        np.where(exit_ns.ravel()[:visits] < 0, -1, exit_ns.ravel()[:visits] + epoch_ns)[keep],
+        ["white", "black", "red", "blue", "grey", "silver", "green", "yellow"],
+        as_of_ns + epoch_ns,
+    )
+
+def report_numpy(history: analytics.VisitHistory, spots: int) -> None:
+    analytics.peak_occupancy(history)
+    analytics.occupancy_curve(history, 900 * S)
+    analytics.dwell_time_percentiles(history)
+    analytics.mean_dwell_time_by_hour(history)
+    analytics.mean_dwell_time_by_color(history)
+    analytics.spot_utilization(history, spots)
+    analytics.spot_turnover(history, spots)
+
+def report_python(visits: list, spots: int, start_ns: int, stop_ns: int) -> None:
+    """
+    Same reports with Python loops over (spot id, colour id, entry, exit) rows.
+    """
+    events = []
+    for __, __, entry_ns, exit_ns in visits:
+        events.append((entry_ns, 1))
+        events.append((exit_ns, -1))
+    events.sort()
+    occupancy = peak = 0
+    for __, change in events:
+        occupancy += change
+        peak = max(peak, occupancy)
+
+    dwell = sorted(exit_ns - entry_ns for __, __, entry_ns, exit_ns in visits)
+    [dwell[int(p / 100 * (len(dwell) - 1))] for p in analytics.DWELL_TIME_PERCENTILES]
+    by_hour = [[0, 0] for __ in range(24)]
+    by_color = {}
+    occupied_ns = [0] * spots
+    turnover = [0] * spots
+    for spot_id, color_id, entry_ns, exit_ns in visits:
+        hour = entry_ns // analytics.NS_PER_HOUR % 24
+        by_hour[hour][0] += 1
+        by_hour[hour][1] += exit_ns - entry_ns
+        totals = by_color.setdefault(color_id, [0, 0])
+        totals[0] += 1
+        totals[1] += exit_ns - entry_ns
+        occupied_ns[spot_id - 1] += min(exit_ns, stop_ns) - max(entry_ns, start_ns)
+        turnover[spot_id - 1] += 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--visits', type=int, default=10_000_000)
+    parser.add_argument('--spots', type=int, default=2000)
+    parser.add_argument(
+        '--python-visits', type=int, default=500_000,
+        help='visits reported with Python loops, scaled up to all visits')
+    args = parser.parse_args()
+
+    history = build_history(args.visits, args.spots)
+    print(f"visits: {len(history):,} (in progress: {history.in_progress:,})")
+
+    start = time.perf_counter()
+    report_numpy(history, args.spots)
+    numpy_s = time.perf_counter() - start
+
+    n = min(args.python_visits, len(history))
+    visits = list(zip(
+        history.spot_ids[:n].tolist(), history.color_ids[:n].tolist(),
+        history.entry_ns[:n].tolist(), history.exit_ns[:n].tolist()))
+    start_ns, stop_ns = history.window()
+    start = time.perf_counter()
+    report_python(visits, args.spots, start_ns, stop_ns)
+    python_s = (time.perf_counter() - start) * len(history) / n
+
+    print(f"{'numpy':>8}  {numpy_s:>8.2f}s")
+    print(f"{'python':>8}  {python_s:>8.2f}s  (scaled from {n:,} visits)")
+    print(f"{'speed-up':>8}  {python_s / numpy_s:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Throughput of park_many/leave_many against single park/leave in a loop.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_batch.py [--burst 100000]
+"""
+import argparse
+import time
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.vehicle import Car
+
+
+def build_parking_lot(max_four_wheeler_spots: int):
+    director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+    director.build_parking_lot(max_four_wheeler_spots)
+    return director.get_parking_lot()
+
+def bench_single(burst: int):
+    parking_lot = build_parking_lot(burst)
+    cars = [Car(f"KA-{i}", "White") for i in range(burst)]
+    spot_ids = list(range(1, burst + 1))
+
+    start = time.perf_counter()
+    for car in cars:
+        parking_lot.allocate_parking_spot(car)
+    park = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for spot_id in spot_ids:
+        parking_lot.free_up_parking_spot(spot_id)
+    leave = time.perf_counter() - start
+    return park, leave
+
+def bench_batch(burst: int):
+    parking_lot = build_parking_lot(burst)
+    cars = [Car(f"KA-{i}", "White") for i in range(burst)]
+    spot_ids = list(range(1, burst + 1))
+
+    start = time.perf_counter()
+    parking_lot.park_many(cars)
+    park = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parking_lot.leave_many(spot_ids)
+    leave = time.perf_counter() - start
+    return park, leave
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--burst', type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'mode':>8}  {'park ops/s':>12}  {'leave ops/s':>12}")
+    for mode, bench in (('single', bench_single), ('batch', bench_batch)):
+        park, leave = bench(args.burst)
+        print(f"{mode:>8}  {args.burst / park:>12,.0f}  {args.burst / leave:>12,.0f}")
+
+if __name__ == '__main__':
+    main()
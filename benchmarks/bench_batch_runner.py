@@ -0,0 +1,67 @@
+"""
+Replay speed of a synthetic gate log, shell playback vs batch runner.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_batch_runner.py [--lines 1000000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from command_line_prompt import ParkingLotPrompt
+from parking_lot.command_runner import BatchCommandRunner
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+
+
+def write_gate_log(path: str, lines: int, spots: int, seed: int) -> None:
+    rng = random.Random(seed)
+    colors = ('White', 'Black', 'Red', 'Blue', 'Silver')
+    with open(path, 'w') as f:
+        f.write(f"create_parking_lot {spots}\n")
+        for i in range(lines - 1):
+            if rng.random() < 0.5:
+                f.write(f"park KA-{i:08d} {rng.choice(colors)}\n")
+            else:
+                f.write(f"leave {rng.randint(1, spots)}\n")
+
+def bench_shell(path: str) -> float:
+    FourWheelerParkingLotCommand.reset()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        # exit is read from stdin once played back commands are drained
+        prompt = ParkingLotPrompt(stdin=io.StringIO("exit\n"))
+        prompt.use_rawinput = False
+        prompt.prompt = ''
+        prompt.cmdqueue.append(f"playback {path}")
+        prompt.cmdloop()
+        return time.perf_counter() - start
+
+def bench_batch(path: str) -> float:
+    FourWheelerParkingLotCommand.reset()
+    with open(os.devnull, 'w', buffering=1 << 20) as devnull:
+        start = time.perf_counter()
+        with open(path) as f:
+            BatchCommandRunner(devnull).run(f)
+        devnull.flush()
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=1_000_000)
+    parser.add_argument('--spots', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'gate.log')
+        write_gate_log(path, args.lines, args.spots, args.seed)
+        print(f"{'mode':>8}  {'seconds':>8}  {'lines/s':>10}")
+        for mode, bench in (('shell', bench_shell), ('batch', bench_batch)):
+            elapsed = bench(path)
+            print(f"{mode:>8}  {elapsed:>8.2f}  {args.lines / elapsed:>10,.0f}")
+
+if __name__ == '__main__':
+    main()
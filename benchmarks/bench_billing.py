@@ -0,0 +1,58 @@
+"""
+End-of-day invoicing of a day of visits: batch pricing with NumPy
+vs pricing visit by visit in a Python loop, fees must match.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_billing.py [--visits 500000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from parking_lot.billing import Billing, NS_PER_HOUR
+from parking_lot.constants import ParkingSpotType
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--visits', type=int, default=500_000)
+    parser.add_argument('--spots', type=int, default=20_000)
+    args = parser.parse_args()
+
+    fees = Billing(
+        [
+            (1, ParkingSpotType.FOUR_WHEELER),
+            (args.spots * 8 // 10 + 1, ParkingSpotType.TWO_WHEELER),
+            (args.spots * 9 // 10 + 1, ParkingSpotType.LARGE),
+        ],
+        utc_offset_s=0)
+    rng = np.random.default_rng(0)
+    day_start_ns = time.time_ns() // (24 * NS_PER_HOUR) * (24 * NS_PER_HOUR)
+    spot_ids = rng.integers(1, args.spots + 1, size=args.visits)
+    # exits over the day, dwell times of minutes to days
+    exit_ns = day_start_ns + rng.integers(0, 24 * NS_PER_HOUR, size=args.visits)
+    entry_ns = exit_ns - np.minimum(
+        rng.lognormal(np.log(2 * NS_PER_HOUR), 1.2, size=args.visits),
+        72 * NS_PER_HOUR).astype(np.int64)
+
+    start = time.perf_counter()
+    batch_fees = fees.price_visits(spot_ids, entry_ns, exit_ns)
+    batch_s = time.perf_counter() - start
+
+    rows = list(zip(spot_ids.tolist(), entry_ns.tolist(), exit_ns.tolist()))
+    start = time.perf_counter()
+    loop_fees = [
+        fees.charge(row, fees.get_spot_type(spot_id), entry, exit_)
+        for row, (spot_id, entry, exit_) in enumerate(rows)
+    ]
+    loop_s = time.perf_counter() - start
+
+    if loop_fees != batch_fees.tolist():
+        raise Exception("Batch fees differ from fees charged on exit")
+    print(f"visits: {args.visits:,}, total fee: {int(batch_fees.sum()):,}")
+    print(f"{'per visit':>10}  {loop_s:>8.3f}s  ({loop_s / args.visits * 1e6:.2f}us per exit)")
+    print(f"{'batch':>10}  {batch_s:>8.3f}s")
+    print(f"{'speed-up':>10}  {loop_s / batch_s:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Scaling of park/leave throughput on a shared thread-safe parking-lot,
+1 to 16 gate threads. Speed-up needs a free-threaded CPython build,
+under the GIL numbers show locking overhead and contention.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_concurrent.py [--ops 200000] [--spots 10000]
+"""
+import argparse
+import sys
+import threading
+import time
+
+from parking_lot import (
+    ConcurrentFourWheelerParkingLotBuilder, FourWheelerParkingLotBuilder,
+    ParkingLotDirector
+)
+from parking_lot.vehicle import Car
+
+
+def build_parking_lot(builder, max_four_wheeler_spots: int):
+    director = ParkingLotDirector(builder)
+    director.build_parking_lot(max_four_wheeler_spots)
+    return director.get_parking_lot()
+
+def gate(parking_lot, gate_id: int, cycles: int, start_barrier) -> None:
+    cars = [Car(f"KA-{gate_id}-{i}", "White") for i in range(cycles)]
+    start_barrier.wait()
+    for car in cars:
+        if parking_lot.allocate_parking_spot(car):
+            parking_lot.free_up_parking_spot(car.parking_spot.id_)
+
+def bench(builder, threads_count: int, ops: int, spots: int) -> float:
+    parking_lot = build_parking_lot(builder, spots)
+    cycles = ops // (2 * threads_count)
+    start_barrier = threading.Barrier(threads_count + 1)
+    threads = [
+        threading.Thread(target=gate, args=(parking_lot, i, cycles, start_barrier))
+        for i in range(threads_count)
+    ]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return 2 * cycles * threads_count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ops', type=int, default=200_000)
+    parser.add_argument('--spots', type=int, default=10_000)
+    args = parser.parse_args()
+
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled else 'disabled'}")
+    baseline = bench(FourWheelerParkingLotBuilder(), 1, args.ops, args.spots)
+    print(f"{'threads':>8}  {'ops/s':>12}  {'vs 1 thread':>12}")
+    print(f"{'plain':>8}  {baseline:>12,.0f}")
+    single = None
+    for threads_count in (1, 2, 4, 8, 16):
+        throughput = bench(
+            ConcurrentFourWheelerParkingLotBuilder(), threads_count,
+            args.ops, args.spots)
+        single = single or throughput
+        print(f"{threads_count:>8}  {throughput:>12,.0f}  {throughput / single:>11.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Creating a large parking-lot and parking its first car: parking-spots
+made on first touch vs one parking-spot object made per spot up front,
+plus adding and retiring parking-spots of a live parking-lot.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_create_parking_lot.py [--spots 5000000]
+"""
+import argparse
+import time
+from typing import List, Tuple
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.constants import ParkingSpotType
+from parking_lot.parking_spot import PARKING_SPOTS
+from parking_lot.vehicle import Car
+
+
+class EagerFourWheelerParkingLotBuilder(FourWheelerParkingLotBuilder):
+    """
+    Builder making every parking-spot object up front.
+    """
+    def _create_parking_spots(
+        self, spot_blocks: List[Tuple[ParkingSpotType, int]]
+    ):
+        parking_spots = []
+        for spot_type, max_spots in spot_blocks:
+            parking_spot = PARKING_SPOTS[spot_type]
+            first_id = len(parking_spots) + 1
+            parking_spots.extend(
+                parking_spot(spot_id)
+                for spot_id in range(first_id, first_id + max_spots))
+        return parking_spots
+
+def time_to_first_car(builder, spots: int):
+    start = time.perf_counter()
+    director = ParkingLotDirector(builder)
+    director.build_parking_lot(spots)
+    parking_lot = director.get_parking_lot()
+    parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White"))
+    return parking_lot, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--spots', type=int, default=5_000_000)
+    parser.add_argument('--resizes', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'builder':<10}{'first car ms':>14}")
+    for name, builder in (
+        ('eager', EagerFourWheelerParkingLotBuilder()),
+        ('lazy', FourWheelerParkingLotBuilder()),
+    ):
+        parking_lot, elapsed_s = time_to_first_car(builder, args.spots)
+        print(f"{name:<10}{elapsed_s * 1e3:>14.3f}")
+
+    start = time.perf_counter()
+    for __ in range(args.resizes):
+        parking_lot.expand_parking_lot(1000)
+    expand_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for __ in range(args.resizes):
+        parking_lot.shrink_parking_lot(1000)
+    shrink_s = time.perf_counter() - start
+    print(
+        f"expand by 1000 slots: {expand_s / args.resizes * 1e6:.1f}us, "
+        f"shrink by 1000 slots: {shrink_s / args.resizes * 1e6:.1f}us "
+        f"(lot of {parking_lot.max_spots():,} slots)")
+
+if __name__ == '__main__':
+    main()
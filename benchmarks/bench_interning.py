@@ -0,0 +1,82 @@
+"""
+Dictionary-encoded colours and plates vs string-keyed maps: memory
+held by colour strings and plate indexes, and cost of lookups.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_interning.py [--vehicles 1000000] [--colors 16]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from parking_lot.interning import StringTable
+
+
+def measure_memory(build):
+    """
+    Return (result of build, bytes it allocated and still holds).
+    """
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, held
+
+def measure_time(lookup, keys):
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+def report(name, string_keyed, encoded, unit):
+    print(f"{name:>24}  {string_keyed:>14,.0f}  {encoded:>14,.0f}  {unit}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vehicles', type=int, default=1_000_000)
+    parser.add_argument('--colors', type=int, default=16)
+    parser.add_argument('--lookups', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    colors = [f"Color{i}" for i in range(args.colors)]
+    raw_colors = [rng.choice(colors) for __ in range(args.vehicles)]
+    plates = [f"KA-{i:08d}" for i in range(args.vehicles)]
+    print(f"vehicles: {args.vehicles:,}, colours: {args.colors}")
+    print(f"{'':>24}  {'string-keyed':>14}  {'encoded':>14}")
+
+    # colour kept by every vehicle: own lower-cased copy vs colour id
+    table = StringTable(str.lower)
+    __, string_bytes = measure_memory(lambda: [color.lower() for color in raw_colors])
+    __, id_bytes = measure_memory(lambda: [table.encode(color) for color in raw_colors])
+    report('vehicle colours', string_bytes, id_bytes, 'bytes')
+    report(
+        'normalize colour',
+        measure_time(str.lower, raw_colors), measure_time(table.encode, raw_colors), 'ns')
+
+    # colour index lookup, from colour as typed in a query
+    color_index = {color.lower(): i for i, color in enumerate(colors)}
+    color_id_index = {table.encode(color): i for i, color in enumerate(colors)}
+    queries = [rng.choice(colors) for __ in range(args.lookups)]
+    report(
+        'colour index lookup',
+        measure_time(lambda color: color_index.get(color.lower()), queries),
+        measure_time(lambda color: color_id_index.get(table.find(color)), queries),
+        'ns')
+
+    # plate -> vehicle: one string-keyed dict vs plate table and id-keyed dict
+    plate_index, string_bytes = measure_memory(
+        lambda: {plate: i for i, plate in enumerate(plates)})
+    plate_table = StringTable()
+    plate_id_index, id_bytes = measure_memory(
+        lambda: {plate_table.encode(plate): i for i, plate in enumerate(plates)})
+    report('plate index', string_bytes, id_bytes, 'bytes')
+    queries = [rng.choice(plates) for __ in range(args.lookups)]
+    report(
+        'plate index lookup',
+        measure_time(plate_index.get, queries),
+        measure_time(lambda plate: plate_id_index.get(plate_table.find(plate)), queries),
+        'ns')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Overhead of operation metrics: park/leave cycles and colour queries
+on a parking-lot never instrumented, with metrics enabled, and with
+metrics enabled then disabled again.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_metrics.py [--ops 200000] [--repeat 5]
+"""
+import argparse
+import time
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.vehicle import Car
+
+
+def build_parking_lot(max_four_wheeler_spots: int):
+    director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+    director.build_parking_lot(max_four_wheeler_spots)
+    return director.get_parking_lot()
+
+def bench(mode: str, ops: int) -> float:
+    parking_lot = build_parking_lot(1000)
+    if mode != 'plain':
+        parking_lot.enable_metrics()
+    if mode == 'disabled':
+        parking_lot.disable_metrics()
+    parking_lot.park_many([Car(f"MH-{i}", "Red") for i in range(500)])
+    cars = [Car(f"KA-{i}", "White") for i in range(ops // 3)]
+
+    start = time.perf_counter()
+    for car in cars:
+        parking_lot.allocate_parking_spot(car)
+        parking_lot.free_up_parking_spot(car.parking_spot.id_)
+        parking_lot.get_vehicle_spot_number("MH-1")
+    return 3 * len(cars) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--ops', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # modes interleaved, best of repeats
+    modes = ('plain', 'enabled', 'disabled')
+    best = dict.fromkeys(modes, 0.0)
+    for __ in range(args.repeat):
+        for mode in modes:
+            best[mode] = max(best[mode], bench(mode, args.ops))
+
+    print(f"{'mode':>10}  {'ops/s':>12}  {'overhead':>8}")
+    for mode in modes:
+        print(f"{mode:>10}  {best[mode]:>12,.0f}  {best['plain'] / best[mode] - 1:>7.1%}")
+
+if __name__ == '__main__':
+    main()
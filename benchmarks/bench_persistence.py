@@ -0,0 +1,116 @@
+"""
+Journal write overhead and restart time of snapshot plus journal tail.
+
+Overhead: park/leave churn with no journal vs journal at several
+group commit sizes.
+Restart: restore from snapshot and journal tail vs replaying the
+full command history through the batch runner.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_persistence.py [--spots 100000]
+"""
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.command_runner import BatchCommandRunner
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+from parking_lot.persistence import (
+    ParkingLotJournal, restore_parking_lot, write_snapshot
+)
+from parking_lot.vehicle import Car
+
+
+def build_parking_lot(max_four_wheeler_spots: int):
+    director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+    director.build_parking_lot(max_four_wheeler_spots)
+    return director.get_parking_lot()
+
+def churn(parking_lot, spots: int, events: int, rng: random.Random, commands: list = None):
+    """
+    Fill parking-lot to 90% then leave/park randomly.
+    """
+    parked = int(spots * 0.9)
+    for i in range(parked):
+        parking_lot.allocate_parking_spot(Car(f"KA-{i:08d}", "White"))
+        if commands is not None:
+            commands.append(f"park KA-{i:08d} White")
+    for i in range(events):
+        spot_id = rng.randint(1, parked)
+        parking_lot.free_up_parking_spot(spot_id)
+        parking_lot.allocate_parking_spot(Car(f"DL-{i:08d}", "Red"))
+        if commands is not None:
+            commands.append(f"leave {spot_id}")
+            commands.append(f"park DL-{i:08d} Red")
+
+def bench_journal_overhead(tmp_dir: str, spots: int, events: int, seed: int) -> None:
+    print(f"{'journal':>14}  {'seconds':>8}  {'overhead':>8}")
+    baseline = None
+    for group_size in (None, 1, 64, 1024):
+        parking_lot = build_parking_lot(spots)
+        journal = None
+        if group_size:
+            journal = ParkingLotJournal(
+                os.path.join(tmp_dir, f'overhead-{group_size}.journal'),
+                group_size=group_size, group_interval=float('inf'))
+            parking_lot.add_event_listener(journal)
+        start = time.perf_counter()
+        churn(parking_lot, spots, events, random.Random(seed))
+        if journal:
+            journal.close()
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        label = f"group={group_size}" if group_size else 'none'
+        print(f"{label:>14}  {elapsed:>8.2f}  {elapsed / baseline:>7.2f}x")
+
+def bench_restart(tmp_dir: str, spots: int, events: int, seed: int) -> None:
+    snapshot_path = os.path.join(tmp_dir, 'restart.snapshot')
+    journal_path = os.path.join(tmp_dir, 'restart.journal')
+    commands = [f"create_parking_lot {spots}"]
+
+    parking_lot = build_parking_lot(spots)
+    journal = ParkingLotJournal(journal_path, truncate=True)
+    parking_lot.add_event_listener(journal)
+    rng = random.Random(seed)
+    churn(parking_lot, spots, events, rng, commands)
+    write_snapshot(parking_lot, snapshot_path, journal)
+    # journal tail written after snapshot
+    for i in range(events // 10):
+        spot_id = rng.randint(1, spots)
+        parking_lot.free_up_parking_spot(spot_id)
+        parking_lot.allocate_parking_spot(Car(f"MH-{i:08d}", "Blue"))
+        commands.append(f"leave {spot_id}")
+        commands.append(f"park MH-{i:08d} Blue")
+    journal.close()
+
+    start = time.perf_counter()
+    restored = restore_parking_lot(snapshot_path, journal_path)
+    restore = time.perf_counter() - start
+    assert restored.get_parking_lot_status() == parking_lot.get_parking_lot_status()
+
+    FourWheelerParkingLotCommand.reset()
+    start = time.perf_counter()
+    BatchCommandRunner(io.StringIO()).run(commands)
+    replay = time.perf_counter() - start
+    FourWheelerParkingLotCommand.reset()
+
+    print(f"\n{'restart':>14}  {'seconds':>8}")
+    print(f"{'snapshot+tail':>14}  {restore:>8.2f}")
+    print(f"{'full replay':>14}  {replay:>8.2f}  ({len(commands):,} commands)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--spots', type=int, default=100_000)
+    parser.add_argument('--events', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bench_journal_overhead(tmp_dir, args.spots, args.events, args.seed)
+        bench_restart(tmp_dir, args.spots, args.events, args.seed)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Registration-number prefix queries(state, district, series) on a full
+parking-lot: sorted registration index vs scan of parked vehicles.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_registration_prefix.py [--spots 1000000]
+"""
+import argparse
+import random
+import time
+
+from parking_lot import ColumnarFourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.vehicle import Car
+
+STATES = ('KA', 'MH', 'DL', 'TN', 'KL', 'AP', 'GJ', 'RJ', 'UP', 'WB')
+
+
+def random_plate(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(STATES)}-{rng.randint(1, 99):02d}-"
+        f"{chr(65 + rng.randrange(26))}{chr(65 + rng.randrange(26))}-"
+        f"{rng.randint(1, 9999):04d}"
+    )
+
+def scan(parking_lot, prefix: str) -> list:
+    return sorted(
+        vehicle.parking_spot.id_
+        for registration_number, vehicle in parking_lot.parked_vehicles.items()
+        if registration_number.startswith(prefix)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--spots', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=100)
+    args = parser.parse_args()
+
+    director = ParkingLotDirector(ColumnarFourWheelerParkingLotBuilder())
+    director.build_parking_lot(args.spots)
+    parking_lot = director.get_parking_lot()
+    rng = random.Random(0)
+    parking_lot.park_many([Car(random_plate(rng), 'White') for __ in range(args.spots)])
+    plates = list(parking_lot.parked_vehicles)
+
+    print(f"{'prefix':<12}{'matches':>10}{'index ms':>11}{'scan ms':>11}")
+    for length in (2, 5, 8):
+        prefixes = [rng.choice(plates)[:length] for __ in range(args.queries)]
+        start = time.perf_counter()
+        matches = sum(
+            len(parking_lot.get_parking_spot_numbers_of_registration_prefix(prefix))
+            for prefix in prefixes)
+        index_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for prefix in prefixes[:max(1, args.queries // 10)]:
+            scan(parking_lot, prefix)
+        scan_s = (time.perf_counter() - start) * args.queries / max(1, args.queries // 10)
+        print(
+            f"{prefixes[0]:<12}{matches // args.queries:>10}"
+            f"{index_s / args.queries * 1e3:>11.3f}{scan_s / args.queries * 1e3:>11.3f}")
+
+if __name__ == '__main__':
+    main()
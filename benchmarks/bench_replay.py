@@ -0,0 +1,75 @@
+"""
+Wall-clock of shell playback(BatchCommandRunner over the whole log)
+against sharding plus process-pool replay of a synthetic multi-lot
+command corpus tagged with lot ids; final lot states must match.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_replay.py [--commands 10000000] [--lots 16] [--workers N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from parking_lot.command_runner import BatchCommandRunner
+from parking_lot.parallel_replay import replay_shards, shard_tagged_command_log
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+
+
+def write_corpus(path: str, commands: int, lots: int, spots: int = 10_000) -> None:
+    rng = random.Random(42)
+    colors = ("White", "Black", "Red", "Blue", "Green")
+    with open(path, 'w', buffering=1 << 20) as f:
+        # lots get ids 1..lots in order of creation
+        for __ in range(lots):
+            f.write(f"create_parking_lot {spots}\n")
+        for i in range(commands - lots):
+            lot_id = rng.randint(1, lots)
+            if rng.random() < 0.55:
+                f.write(f"park KA-{i:08d} {rng.choice(colors)} @{lot_id}\n")
+            else:
+                f.write(f"leave {rng.randint(1, spots)} @{lot_id}\n")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--commands', type=int, default=10_000_000)
+    parser.add_argument('--lots', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = os.path.join(tmp_dir, 'corpus.txt')
+        write_corpus(corpus, args.commands, args.lots)
+
+        start = time.perf_counter()
+        FourWheelerParkingLotCommand.reset()
+        with open(corpus) as f, open(os.devnull, 'w') as out:
+            BatchCommandRunner(out).run(f)
+        registry = FourWheelerParkingLotCommand.get_registry()
+        playback_status = [
+            list(registry.get_parking_lot(lot_id).iter_parking_lot_status())
+            for lot_id in registry.parking_lot_ids
+        ]
+        FourWheelerParkingLotCommand.reset()
+        playback_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shards = shard_tagged_command_log(corpus, tmp_dir)
+        sharding = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = replay_shards(shards, max_workers=args.workers)
+        parallel_time = time.perf_counter() - start
+        if playback_status != [result.status for result in parallel]:
+            raise Exception("Parallel replay differs from shell playback")
+
+    print(f"{args.commands:,} commands, {args.lots} lots, {args.workers} workers")
+    print(f"{'mode':>10}  {'seconds':>8}  {'speed-up':>8}")
+    print(f"{'playback':>10}  {playback_time:>8.2f}  {1:>7.2f}x")
+    print(f"{'sharding':>10}  {sharding:>8.2f}")
+    print(f"{'parallel':>10}  {parallel_time:>8.2f}")
+    total = sharding + parallel_time
+    print(f"{'total':>10}  {total:>8.2f}  {playback_time / total:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
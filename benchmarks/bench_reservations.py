@@ -0,0 +1,99 @@
+"""
+Reservation book with 1M reservations: booking any free parking-spot,
+'is parking-spot free over [t1, t2)' and 'any parking-spot free over
+[t1, t2)'(of all, or of those vacant now with most parking-spots
+taken) through the interval/gap indexes vs scanning parking-spots'
+reservation lists.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_reservations.py [--reservations 1000000] [--spots 20000]
+"""
+import argparse
+import random
+import resource
+import time
+
+from parking_lot.reservations import ReservationBook
+
+NS_PER_HOUR = 3600 * 10 ** 9
+
+
+def random_window(rng: random.Random, days: int):
+    start = rng.randrange(days * 24 * 4) * NS_PER_HOUR // 4
+    return start, start + rng.randint(1, 16) * NS_PER_HOUR // 4
+
+def scan_is_free(book: ReservationBook, spot_id: int, start: int, end: int) -> bool:
+    intervals = book._spot_reservations.get(spot_id)
+    if intervals is None:
+        return True
+    starts, ends, __ = intervals
+    return all(e <= start or end <= s for s, e in zip(starts, ends))
+
+def scan_find_free(book: ReservationBook, start: int, end: int, taken=()):
+    for spot_id in range(1, book.spot_count + 1):
+        if spot_id not in taken and scan_is_free(book, spot_id, start, end):
+            return spot_id
+    return None
+
+def per_query_us(queries, fn) -> float:
+    start = time.perf_counter()
+    for args in queries:
+        fn(*args)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--reservations', type=int, default=1_000_000)
+    parser.add_argument('--spots', type=int, default=20_000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--queries', type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    book = ReservationBook(args.spots)
+    booked = rejected = 0
+    start = time.perf_counter()
+    while booked < args.reservations:
+        if book.reserve("KA-01-HH-1234", *random_window(rng, args.days)) is None:
+            rejected += 1
+        else:
+            booked += 1
+    reserve_s = time.perf_counter() - start
+    print(
+        f"reservations: {len(book):,} on {args.spots:,} slots over {args.days} days "
+        f"(rejected: {rejected:,})")
+    print(f"reserve any slot: {reserve_s / booked * 1e6:.1f}us per reservation")
+    print(f"max rss: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    spot_queries = [
+        (rng.randint(1, args.spots), *random_window(rng, args.days))
+        for __ in range(args.queries)]
+    any_queries = [random_window(rng, args.days) for __ in range(args.queries)]
+    scan_queries = any_queries[:max(1, args.queries // 1000)]
+    print(f"{'query':<22}{'index us':>10}{'scan us':>12}")
+    print(
+        f"{'is slot free':<22}{per_query_us(spot_queries, book.is_spot_free):>10.2f}"
+        f"{per_query_us(spot_queries, lambda *a: scan_is_free(book, *a)):>12.2f}")
+    print(
+        f"{'any slot free':<22}{per_query_us(any_queries, book.find_free_spot):>10.2f}"
+        f"{per_query_us(scan_queries, lambda *a: scan_find_free(book, *a)):>12.2f}")
+
+    # walk-ins take 90% of parking-spots
+    taken = set(rng.sample(range(1, args.spots + 1), args.spots * 9 // 10))
+    start = time.perf_counter()
+    for spot_id in taken:
+        book.set_spot_taken(spot_id, True)
+    taken_us = (time.perf_counter() - start) / len(taken) * 1e6
+    print(
+        f"{'any vacant slot free':<22}"
+        f"{per_query_us(any_queries, lambda *a: book.find_free_spot(*a, True)):>10.2f}"
+        f"{per_query_us(scan_queries, lambda *a: scan_find_free(book, *a, taken)):>12.2f}")
+    print(f"mark slot taken: {taken_us:.1f}us per slot")
+
+    cancelled = rng.sample(range(1, booked + 1), min(booked, args.queries))
+    start = time.perf_counter()
+    for reservation_id in cancelled:
+        book.cancel(reservation_id)
+    print(f"cancel: {(time.perf_counter() - start) / len(cancelled) * 1e6:.1f}us per reservation")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Load generator for parking_lot_server.py: requests/sec and tail latency
+of pipelined park/leave traffic over many connections.
+
+Each connection keeps --depth requests in flight; a park is followed by
+leave of the slot it got, a leave by park of a new vehicle.
+Without --port/--unix an in-process server is started.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_server.py [--connections 16] [--depth 8]
+       [--seconds 5] [--host 127.0.0.1 --port 8765 | --unix PATH]
+"""
+import argparse
+import asyncio
+import collections
+import time
+
+from parking_lot.command_server import start_server
+
+
+async def read_response(reader: asyncio.StreamReader) -> str:
+    lines = []
+    while True:
+        line = await reader.readline()
+        if line in (b'\n', b''):
+            return ''.join(lines)
+        lines.append(line.decode())
+
+async def client(
+    connection_id: int, open_connection, depth: int,
+    deadline: float, latencies: list
+) -> int:
+    reader, writer = await open_connection()
+    sent_at = collections.deque()
+    vehicle_ids = iter(range(1 << 62))
+
+    def send(request: str) -> None:
+        sent_at.append(time.perf_counter())
+        writer.write(request.encode())
+
+    for __ in range(depth):
+        send(f"park C{connection_id}-{next(vehicle_ids)} White\n")
+    completed = 0
+    while sent_at:
+        response = await read_response(reader)
+        latencies.append(time.perf_counter() - sent_at.popleft())
+        completed += 1
+        if time.perf_counter() >= deadline:
+            continue
+        if response.startswith("Allocated slot number: "):
+            send(f"leave {response.split(': ')[1].strip()}\n")
+        else:
+            send(f"park C{connection_id}-{next(vehicle_ids)} White\n")
+    writer.write(b"exit\n")
+    writer.close()
+    return completed
+
+async def run(args) -> None:
+    server = None
+    host, port = args.host, args.port
+    if not (args.port or args.unix):
+        server = await start_server(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    if args.unix:
+        open_connection = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        open_connection = lambda: asyncio.open_connection(host, port)
+
+    reader, writer = await open_connection()
+    writer.write(f"create_parking_lot {args.connections * args.depth}\n".encode())
+    print((await read_response(reader)).strip())
+    writer.close()
+
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    completed = await asyncio.gather(*(
+        client(i, open_connection, args.depth, deadline, latencies)
+        for i in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    latencies.sort()
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e3
+
+    print(f"{'connections':>12}  {'depth':>6}  {'req/s':>10}  {'p50 ms':>8}  {'p99 ms':>8}  {'p99.9 ms':>9}")
+    print(
+        f"{args.connections:>12}  {args.depth:>6}  {sum(completed) / elapsed:>10,.0f}  "
+        f"{percentile(0.5):>8.3f}  {percentile(0.99):>8.3f}  {percentile(0.999):>9.3f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--depth', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--unix', metavar='PATH')
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == '__main__':
+    main()
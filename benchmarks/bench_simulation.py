@@ -0,0 +1,39 @@
+"""
+Capacity sweep with the discrete-event simulator: visits simulated
+per second, serial sweep vs sweep across a process pool.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_simulation.py [--visits 1000000] [--capacities 400 450 500 550]
+"""
+import argparse
+import os
+import time
+
+from parking_lot.simulation import SimulationConfig, sweep_capacities
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--visits', type=int, default=1_000_000)
+    parser.add_argument('--capacities', type=int, nargs='+', default=[400, 450, 500, 550])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    config = SimulationConfig(visits=args.visits, warmup_visits=1000)
+    start = time.perf_counter()
+    serial = sweep_capacities(config, args.capacities, max_workers=1)
+    serial_s = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = sweep_capacities(config, args.capacities, args.workers)
+    parallel_s = time.perf_counter() - start
+    if serial != parallel:
+        raise Exception("Parallel sweep differs from serial sweep")
+
+    visits = args.visits * len(args.capacities)
+    print(f"capacities: {args.capacities}, visits per capacity: {args.visits:,}")
+    print(f"{'serial':>10}  {serial_s:>8.2f}s  ({visits / serial_s:,.0f} visits/s)")
+    print(
+        f"{'parallel':>10}  {parallel_s:>8.2f}s  ({visits / parallel_s:,.0f} visits/s, "
+        f"{args.workers} workers)")
+
+if __name__ == '__main__':
+    main()
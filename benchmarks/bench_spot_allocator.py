@@ -0,0 +1,93 @@
+"""
+Per gate-event latency of park/leave across parking-lot sizes.
+
+Lot is filled up to given occupancy, then random parked vehicles
+leave and new vehicles park in their place. With O(log n) free-spot
+allocation the per-event latency stays flat as the lot grows,
+under every allocation policy. Cars arrive at random gates; gates
+sit evenly along the lot, floors are blocks of 500 spots.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_spot_allocator.py [--sizes 1000 ...]
+    [--policies lowest far-end nearest-gate floor-balanced] [--gates 4]
+"""
+import argparse
+import random
+import time
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.spot_allocator import (
+    FarEndFirstSpotAllocator, FloorBalancedSpotAllocator,
+    MinHeapSpotAllocator, NearestToGateSpotAllocator
+)
+from parking_lot.vehicle import Car
+
+FLOOR_SPOTS = 500
+
+# policy name -> spot allocator factory(spots, gates)
+POLICIES = {
+    'lowest': lambda spots, gates: MinHeapSpotAllocator(spots),
+    'far-end': lambda spots, gates: FarEndFirstSpotAllocator(spots),
+    'nearest-gate': lambda spots, gates: NearestToGateSpotAllocator([
+        [abs(i - gate * spots // gates) for i in range(spots)]
+        for gate in range(gates)
+    ]),
+    'floor-balanced': lambda spots, gates: FloorBalancedSpotAllocator(
+        [i // FLOOR_SPOTS for i in range(spots)]),
+}
+
+
+def build_parking_lot(max_four_wheeler_spots: int, spot_allocator=None):
+    director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+    director.build_parking_lot(max_four_wheeler_spots, spot_allocator)
+    return director.get_parking_lot()
+
+def bench(
+    max_four_wheeler_spots: int, occupancy: float, events: int, seed: int,
+    policy: str = 'lowest', gates: int = 4
+):
+    rng = random.Random(seed)
+    parking_lot = build_parking_lot(
+        max_four_wheeler_spots, POLICIES[policy](max_four_wheeler_spots, gates))
+    parked = int(max_four_wheeler_spots * occupancy)
+    for i in range(parked):
+        parking_lot.allocate_parking_spot(Car(f"KA-{i}", "White", rng.randrange(gates)))
+
+    # random parked vehicle leaves, arriving car takes whichever
+    # spot the policy picks for it
+    occupied_spots = [spot_id for spot_id, *__ in parking_lot.iter_parking_lot_status()]
+    leaving = [rng.randrange(parked) for __ in range(events)]
+    cars = [Car(f"DL-{i}", "Black", rng.randrange(gates)) for i in range(events)]
+
+    start = time.perf_counter()
+    for j, car in zip(leaving, cars):
+        parking_lot.free_up_parking_spot(occupied_spots[j])
+        parking_lot.allocate_parking_spot(car)
+        occupied_spots[j] = car.parking_spot.id_
+    elapsed = time.perf_counter() - start
+
+    # every iteration is a leave plus a park
+    return elapsed / (2 * events)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+',
+        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--occupancy', type=float, default=0.9)
+    parser.add_argument('--events', type=int, default=50_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--policies', nargs='+', choices=list(POLICIES), default=list(POLICIES))
+    parser.add_argument('--gates', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'spots':>10}" + ''.join(f"  {policy + ' us/event':>24}" for policy in args.policies))
+    for size in args.sizes:
+        latencies = [
+            bench(size, args.occupancy, args.events, args.seed, policy, args.gates)
+            for policy in args.policies
+        ]
+        print(f"{size:>10}" + ''.join(f"  {latency * 1e6:>24.2f}" for latency in latencies))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Resident memory per parking-spot of object and columnar spot storage.
+
+Every lot is built in a fresh interpreter and every spot is touched once
+(object spots are created on first touch), RSS is sampled before and
+after and the difference is divided by lot size.
+
+usage: PYTHONPATH=. python3 benchmarks/bench_spot_store_memory.py [--sizes 1000000 ...]
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+
+from parking_lot import (
+    ColumnarFourWheelerParkingLotBuilder, FourWheelerParkingLotBuilder,
+    ParkingLotDirector
+)
+
+BUILDERS = {
+    'object': FourWheelerParkingLotBuilder,
+    'columnar': ColumnarFourWheelerParkingLotBuilder,
+}
+
+
+def current_rss() -> int:
+    """
+    Return resident set size in bytes.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # peak RSS, reported in kilobytes on linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def measure(store: str, max_four_wheeler_spots: int) -> dict:
+    gc.collect()
+    before = current_rss()
+    director = ParkingLotDirector(BUILDERS[store]())
+    director.build_parking_lot(max_four_wheeler_spots)
+    parking_spots = director.get_parking_lot()._parking_spots
+    for i in range(max_four_wheeler_spots):
+        parking_spots[i]
+    gc.collect()
+    after = current_rss()
+    return {
+        'store': store,
+        'spots': max_four_wheeler_spots,
+        'rss_bytes': after - before,
+        'bytes_per_spot': (after - before) / max_four_wheeler_spots,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--measure', nargs=2, metavar=('STORE', 'SPOTS'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        store, max_four_wheeler_spots = args.measure
+        print(json.dumps(measure(store, int(max_four_wheeler_spots))))
+        return
+
+    print(f"{'store':>10}  {'spots':>10}  {'MiB':>8}  {'bytes/spot':>10}")
+    for size in args.sizes:
+        for store in BUILDERS:
+            out = subprocess.run(
+                [sys.executable, __file__, '--measure', store, str(size)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            res = json.loads(out)
+            print(
+                f"{store:>10}  {size:>10}  {res['rss_bytes'] / 2**20:>8.1f}"
+                f"  {res['bytes_per_spot']:>10.1f}"
+            )
+
+if __name__ == '__main__':
+    main()
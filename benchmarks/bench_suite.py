@@ -0,0 +1,204 @@
+"""
+Microbenchmark suite of core parking-lot operations.
+
+Every case builds a lot of given size, fills it up to given occupancy
+with vehicles of given number of colours, then times each operation
+call by call. Reported per operation: ops/sec, p50/p99 latency.
+Peak traced memory of building and filling the lot is reported per case.
+Results are saved as JSON, two result files can be compared to catch
+regressions between commits.
+
+usage:
+    PYTHONPATH=. python3 benchmarks/bench_suite.py --output HEAD.json
+    PYTHONPATH=. python3 benchmarks/bench_suite.py --output new.json --compare HEAD.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.vehicle import Car
+
+OPERATIONS = (
+    'allocate_parking_spot',
+    'free_up_parking_spot',
+    'get_vehicle_spot_number',
+    'get_registration_numbers_of_vehicle_with_color',
+    'get_parking_spot_numbers_of_vehicles_with_color',
+    'get_parking_lot_status',
+)
+
+
+def build_parking_lot(max_four_wheeler_spots: int):
+    director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+    director.build_parking_lot(max_four_wheeler_spots)
+    return director.get_parking_lot()
+
+def fill_parking_lot(parking_lot, parked: int, colors: list, rng: random.Random):
+    for i in range(parked):
+        parking_lot.allocate_parking_spot(Car(f"KA-{i:08d}", rng.choice(colors)))
+
+def percentile(sorted_samples: list, q: float) -> float:
+    return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+def summarize(samples_ns: list) -> dict:
+    samples_ns.sort()
+    total = sum(samples_ns) or 1
+    return {
+        'calls': len(samples_ns),
+        'ops_per_sec': len(samples_ns) * 1e9 / total,
+        'p50_us': percentile(samples_ns, 0.50) / 1e3,
+        'p99_us': percentile(samples_ns, 0.99) / 1e3,
+    }
+
+def time_calls(func, args_list) -> list:
+    clock = time.perf_counter_ns
+    samples = []
+    for args in args_list:
+        start = clock()
+        func(*args)
+        samples.append(clock() - start)
+    return samples
+
+def run_case(size: int, occupancy: float, color_count: int, calls: int, scans: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    colors = [f"color{i}" for i in range(color_count)]
+    parked = max(1, min(size - 1, int(size * occupancy)))
+
+    tracemalloc.start()
+    parking_lot = build_parking_lot(size)
+    fill_parking_lot(parking_lot, parked, colors, rng)
+    __, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    res = {}
+    # churn: each leave is followed by a park into the freed spot
+    leaving_spots = [rng.randint(1, parked) for __ in range(calls)]
+    cars = [Car(f"DL-{i:08d}", rng.choice(colors)) for i in range(calls)]
+    leave_samples, park_samples = [], []
+    clock = time.perf_counter_ns
+    for spot_id, car in zip(leaving_spots, cars):
+        start = clock()
+        parking_lot.free_up_parking_spot(spot_id)
+        leave_samples.append(clock() - start)
+        start = clock()
+        parking_lot.allocate_parking_spot(car)
+        park_samples.append(clock() - start)
+    res['allocate_parking_spot'] = summarize(park_samples)
+    res['free_up_parking_spot'] = summarize(leave_samples)
+
+    registration_numbers = [
+        (row[1],) for row in itertools.islice(parking_lot.iter_parking_lot_status(), calls)]
+    res['get_vehicle_spot_number'] = summarize(
+        time_calls(parking_lot.get_vehicle_spot_number, registration_numbers))
+
+    color_args = [(rng.choice(colors),) for __ in range(scans)]
+    res['get_registration_numbers_of_vehicle_with_color'] = summarize(
+        time_calls(parking_lot.get_registration_numbers_of_vehicle_with_color, color_args))
+    res['get_parking_spot_numbers_of_vehicles_with_color'] = summarize(
+        time_calls(parking_lot.get_parking_spot_numbers_of_vehicles_with_color, color_args))
+    res['get_parking_lot_status'] = summarize(
+        time_calls(parking_lot.get_parking_lot_status, [()] * scans))
+
+    return {
+        'size': size,
+        'occupancy': occupancy,
+        'colors': color_count,
+        'peak_memory_bytes': peak_memory,
+        'operations': res,
+    }
+
+def case_key(case: dict) -> tuple:
+    return (case['size'], case['occupancy'], case['colors'])
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def print_case(case: dict) -> None:
+    print(
+        f"size={case['size']} occupancy={case['occupancy']} colors={case['colors']}"
+        f" peak_memory={case['peak_memory_bytes'] / 2**20:.1f}MiB"
+    )
+    for operation in OPERATIONS:
+        stats = case['operations'][operation]
+        print(
+            f"  {operation:<50} {stats['ops_per_sec']:>12,.0f} ops/s"
+            f"  p50 {stats['p50_us']:>10.2f}us  p99 {stats['p99_us']:>10.2f}us"
+        )
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """
+    Print ops/sec ratio against baseline per case and operation.
+    Return number of regressions beyond threshold.
+    """
+    baseline_cases = {case_key(case): case for case in baseline['cases']}
+    regressions = 0
+    print(f"\ncompared to {baseline.get('revision', 'baseline')} (ratio of ops/sec)")
+    for case in results['cases']:
+        base_case = baseline_cases.get(case_key(case))
+        if base_case is None:
+            continue
+        for operation in OPERATIONS:
+            new = case['operations'][operation]['ops_per_sec']
+            old = base_case['operations'][operation]['ops_per_sec']
+            ratio = new / old
+            flag = ''
+            if ratio < 1 - threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"  {str(case_key(case)):<24} {operation:<50} {ratio:>6.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--occupancy', type=float, nargs='+', default=[0.1, 0.5, 0.9])
+    parser.add_argument('--colors', type=int, nargs='+', default=[4, 64])
+    parser.add_argument('--calls', type=int, default=10_000,
+                        help='calls per point operation')
+    parser.add_argument('--scans', type=int, default=20,
+                        help='calls per colour query and status')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write JSON results to file')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='ops/sec drop reported as regression')
+    args = parser.parse_args()
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'cases': [],
+    }
+    for size, occupancy, color_count in itertools.product(
+        args.sizes, args.occupancy, args.colors
+    ):
+        case = run_case(size, occupancy, color_count, args.calls, args.scans, args.seed)
+        print_case(case)
+        results['cases'].append(case)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,14 @@
+import argparse
 import cmd
+import sys
+from time import perf_counter_ns
 
-from parking_lot.parking_lot_command import (
-    FourWheelerParkingLotCommand, 
-    CreateFourWheelerParkingLot, ParkFourWheelerCommand, 
-    LeaveFourWheelerParkingLotCommand, FourWheelerParkingLotStatus, 
-    FourWheeelerRegNosWithColor, FourWheelerParkingSpotNosFromVehicleColor, 
-    FourWheelerParkingSpotNoFromRegNo
+from parking_lot.command_runner import (
+    BatchCommandRunner, COMMAND_TABLE, ProfilingBatchCommandRunner
 )
+from parking_lot.metrics import serve_prometheus_http
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+from parking_lot.profiling import CommandProfiler
 
 class ParkingLotPrompt(cmd.Cmd):
     prompt = 'parking-lot$ '
@@ -16,42 +18,108 @@ class ParkingLotPrompt(cmd.Cmd):
         print(command.execute())
 
     def do_create_parking_lot(self, max_four_wheeler_spots):
-        'Create parking-lot:  create_parking_lot <MAX-NUMBER-OF-FOUR-WHEELER-SPOTS>'
-        max_four_wheeler_spots = int(max_four_wheeler_spots)
-        command = CreateFourWheelerParkingLot(max_four_wheeler_spots)
+        'Create parking-lot:  create_parking_lot <MAX-NUMBER-OF-FOUR-WHEELER-SPOTS> [two_wheeler=<K>] [large=<K>] [heavy=<K>]'
+        command = COMMAND_TABLE['create_parking_lot'](max_four_wheeler_spots)
+        self.execute(command)
+
+    def do_expand_parking_lot(self, args):
+        'Add slots after the last one:  expand_parking_lot <NUMBER-OF-SPOTS>'
+        command = COMMAND_TABLE['expand_parking_lot'](args)
+        self.execute(command)
+
+    def do_shrink_parking_lot(self, args):
+        'Retire highest numbered slots, if free:  shrink_parking_lot <NUMBER-OF-SPOTS>'
+        command = COMMAND_TABLE['shrink_parking_lot'](args)
         self.execute(command)
-        # print(FourWheelerParkingLotCommand.create_parking_lot(max_four_wheeler_spots))
 
     def do_park(self, args):
-        registration_number, color = args.split(' ')
-        'Park vehicle:  park <VEHICLE-REGISTRATION-NUMBER> <VEHICLE-COLOR>'
-        command = ParkFourWheelerCommand(registration_number, color)
+        'Park vehicle:  park <VEHICLE-REGISTRATION-NUMBER> <VEHICLE-COLOR> [car|motorbike|van|truck]'
+        command = COMMAND_TABLE['park'](args)
+        self.execute(command)
+
+    def do_park_anywhere(self, args):
+        'Park vehicle in parking-lot with most free slots:  park_anywhere <VEHICLE-REGISTRATION-NUMBER> <VEHICLE-COLOR>'
+        command = COMMAND_TABLE['park_anywhere'](args)
+        self.execute(command)
+
+    def do_park_many(self, args):
+        'Park burst of vehicles:  park_many <VEHICLE-REGISTRATION-NUMBER> <VEHICLE-COLOR> [<VEHICLE-REGISTRATION-NUMBER> <VEHICLE-COLOR> ...]'
+        command = COMMAND_TABLE['park_many'](args)
         self.execute(command)
 
     def do_leave(self, parking_spot_id):
         'Unpark vehicle:  leave <PARKING-SPOT-NUMBER>'
-        parking_spot_id = int(parking_spot_id)
-        command = LeaveFourWheelerParkingLotCommand(parking_spot_id)
+        command = COMMAND_TABLE['leave'](parking_spot_id)
+        self.execute(command)
+
+    def do_leave_many(self, parking_spot_ids):
+        'Unpark burst of vehicles:  leave_many <PARKING-SPOT-NUMBER> [<PARKING-SPOT-NUMBER> ...]'
+        command = COMMAND_TABLE['leave_many'](parking_spot_ids)
         self.execute(command)
 
-    def do_status(self, *args):
-        'Status of parking-lot:  status'
-        command = FourWheelerParkingLotStatus()
+    def do_status(self, args):
+        'Status of parking-lot:  status [<OFFSET> [<LIMIT>]]'
+        command = COMMAND_TABLE['status'](args)
         self.execute(command)
 
     def do_registration_numbers_for_cars_with_colour(self, color):
         'Print registration numbers of cars with given particular color:  registration_numbers_for_cars_with_colour <VEHICLE-COLOR>'
-        command = FourWheeelerRegNosWithColor(color)
+        command = COMMAND_TABLE['registration_numbers_for_cars_with_colour'](color)
         self.execute(command)
 
     def do_slot_numbers_for_cars_with_colour(self, color):
         'Print parking-slot numbers of cars with given particular color:  slot_numbers_for_cars_with_colour <VEHICLE-COLOR>'
-        command = FourWheelerParkingSpotNosFromVehicleColor(color)
+        command = COMMAND_TABLE['slot_numbers_for_cars_with_colour'](color)
         self.execute(command)
 
     def do_slot_number_for_registration_number(self, registration_number):
         'Print slot-number for car with given registration number:  slot_number_for_registration_number <VEHICLE-REGISTRATION-NUMBER>'
-        command = FourWheelerParkingSpotNoFromRegNo(registration_number)
+        command = COMMAND_TABLE['slot_number_for_registration_number'](registration_number)
+        self.execute(command)
+
+    def do_slot_numbers_for_registration_prefix(self, prefix):
+        'Print slot-numbers of cars with registration number starting with prefix(state or series):  slot_numbers_for_registration_prefix <REGISTRATION-NUMBER-PREFIX>'
+        command = COMMAND_TABLE['slot_numbers_for_registration_prefix'](prefix)
+        self.execute(command)
+
+    def do_lot_for_registration_number(self, registration_number):
+        'Print parking-lot and slot-number for car with given registration number:  lot_for_registration_number <VEHICLE-REGISTRATION-NUMBER>'
+        command = COMMAND_TABLE['lot_for_registration_number'](registration_number)
+        self.execute(command)
+
+    def do_snapshot(self, args):
+        'Save snapshot of parking-lot(needs --state-dir):  snapshot'
+        command = COMMAND_TABLE['snapshot'](args)
+        self.execute(command)
+
+    def do_metrics(self, args):
+        'Print metrics of parking-lots in Prometheus text format(needs --metrics):  metrics'
+        command = COMMAND_TABLE['metrics'](args)
+        self.execute(command)
+
+    def do_events(self, args):
+        'Print parking-lot events from cursor on(needs --event-stream):  events <CURSOR> [<MAX-EVENTS>]'
+        command = COMMAND_TABLE['events'](args)
+        self.execute(command)
+
+    def do_analytics(self, args):
+        'Print occupancy and dwell-time report over last hours(needs numpy):  analytics [<HOURS>]'
+        command = COMMAND_TABLE['analytics'](args)
+        self.execute(command)
+
+    def do_invoice(self, args):
+        'Print number of visits and fees of visits ended on a day(needs --billing and numpy):  invoice [<YYYY-MM-DD>]'
+        command = COMMAND_TABLE['invoice'](args)
+        self.execute(command)
+
+    def do_reserve(self, args):
+        'Reserve a slot(given one or any free one) for a car over time window(ISO local times):  reserve <VEHICLE-REGISTRATION-NUMBER> <START> <END> [<PARKING-SPOT-NUMBER>]'
+        command = COMMAND_TABLE['reserve'](args)
+        self.execute(command)
+
+    def do_cancel_reservation(self, reservation_id):
+        'Cancel reservation:  cancel_reservation <RESERVATION-ID>'
+        command = COMMAND_TABLE['cancel_reservation'](reservation_id)
         self.execute(command)
 
     def do_exit(self, *args, **kwargs):
@@ -70,5 +138,148 @@ class ParkingLotPrompt(cmd.Cmd):
             self.file.close()
             self.file = None
 
+class ProfilingParkingLotPrompt(ParkingLotPrompt):
+    """
+    Shell recording time of every parking-lot command per phase
+    (cmd.Cmd dispatch, parse, execute, format, write).
+    """
+    def __init__(self, profiler: CommandProfiler, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._profiler = profiler
+
+    def onecmd(self, line):
+        t0 = perf_counter_ns()
+        name, args, line = self.parseline(line)
+        parse = COMMAND_TABLE.get(name) if line else None
+        if parse is None or not hasattr(self, 'do_' + name):
+            return super().onecmd(line)
+        self.lastcmd = line
+        t1 = perf_counter_ns()
+        command = parse(args)
+        t2 = perf_counter_ns()
+        res = command.execute()
+        t3 = perf_counter_ns()
+        res = str(res)
+        t4 = perf_counter_ns()
+        print(res)
+        t5 = perf_counter_ns()
+        self._profiler.record(
+            name, dispatch=t1 - t0, parse=t2 - t1, execute=t3 - t2,
+            format=t4 - t3, write=t5 - t4)
+
+def run_batch(path: str, profiler: CommandProfiler = None) -> None:
+    """
+    Run commands from file(or stdin for '-') without the shell,
+    writing results through a large output buffer.
+    """
+    out = open(sys.stdout.fileno(), 'w', buffering=1 << 20, closefd=False)
+    try:
+        if profiler and profiler.is_timing_phases:
+            runner = ProfilingBatchCommandRunner(out, profiler)
+        else:
+            runner = BatchCommandRunner(out)
+        if path == '-':
+            runner.run(sys.stdin)
+        else:
+            with open(path) as f:
+                runner.run(f)
+    finally:
+        out.flush()
+
+def add_metrics_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--metrics', action='store_true',
+        help='collect metrics of parking-lot operations')
+    parser.add_argument(
+        '--metrics-file', metavar='FILE',
+        help='write metrics in Prometheus text format to FILE(implies --metrics)')
+    parser.add_argument(
+        '--metrics-port', type=int, metavar='PORT',
+        help='serve metrics on http://127.0.0.1:PORT/metrics(implies --metrics)')
+
+def add_event_stream_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--event-stream', nargs='?', const=65536, type=int, metavar='CAPACITY',
+        help='keep last CAPACITY(default 65536) park/leave events of every lot '
+             'for the events command')
+
+def add_billing_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--billing', action='store_true',
+        help='charge fees of visits on leave, by default tariffs')
+
+def enable_billing(args: argparse.Namespace) -> None:
+    if args.billing:
+        FourWheelerParkingLotCommand.enable_billing()
+
+def enable_event_streams(args: argparse.Namespace) -> None:
+    if args.event_stream:
+        FourWheelerParkingLotCommand.enable_event_streams(args.event_stream)
+
+def enable_metrics(args: argparse.Namespace):
+    """
+    Enable metrics as asked on command line.
+    Return metrics HTTP server, if one got started.
+    """
+    if not (args.metrics or args.metrics_file or args.metrics_port):
+        return None
+    FourWheelerParkingLotCommand.enable_metrics(args.metrics_file)
+    if args.metrics_port:
+        return serve_prometheus_http(
+            FourWheelerParkingLotCommand.render_metrics, port=args.metrics_port)
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Parking-lot command shell.')
+    parser.add_argument(
+        '--batch', metavar='FILE',
+        help="run commands from FILE('-' for stdin) non-interactively")
+    parser.add_argument(
+        '--state-dir', metavar='DIR',
+        help='persist parking-lot in DIR and restore it on start')
+    add_metrics_arguments(parser)
+    add_event_stream_arguments(parser)
+    add_billing_arguments(parser)
+    parser.add_argument(
+        '--profile', nargs='?', const=CommandProfiler.FULL,
+        choices=(CommandProfiler.FULL, CommandProfiler.SAMPLE),
+        help='profile commands: full(phase timings, cProfile, sampled stacks, default) '
+             'or sample(sampled stacks only, low overhead)')
+    parser.add_argument(
+        '--profile-out', metavar='PREFIX', default='parking_lot_profile',
+        help='write profile to PREFIX.collapsed, PREFIX.pstats, PREFIX.phases.txt')
+    parser.add_argument(
+        '--profile-interval', metavar='SECONDS', type=float, default=0.005,
+        help='stack sampling interval')
+    args = parser.parse_args()
+
+    if args.state_dir:
+        FourWheelerParkingLotCommand.enable_persistence(args.state_dir)
+    metrics_server = enable_metrics(args)
+    enable_event_streams(args)
+    enable_billing(args)
+    profiler = None
+    if args.profile:
+        profiler = CommandProfiler(
+            args.profile, args.profile_out, args.profile_interval)
+        profiler.start()
+    try:
+        if args.batch:
+            run_batch(args.batch, profiler)
+        elif profiler and profiler.is_timing_phases:
+            ProfilingParkingLotPrompt(profiler).cmdloop()
+        else:
+            ParkingLotPrompt().cmdloop()
+    finally:
+        FourWheelerParkingLotCommand.close()
+        if metrics_server:
+            metrics_server.shutdown()
+        if profiler:
+            profiler.stop()
+            if profiler.is_timing_phases:
+                profiler.write_phase_report(sys.stderr)
+            for path in profiler.write_output():
+                print(f"Profile written to {path}", file=sys.stderr)
+
 if __name__ == '__main__':
-    ParkingLotPrompt().cmdloop()
+    main()
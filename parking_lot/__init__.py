@@ -1,4 +1,5 @@
 # parking lot builder
 from .parking_lot_builder import (
+    ColumnarFourWheelerParkingLotBuilder, ConcurrentFourWheelerParkingLotBuilder,
     FourWheelerParkingLotBuilder, ParkingLotDirector
 )
@@ -0,0 +1,288 @@
+"""
+Occupancy and dwell-time analytics over parking-lot's ticket ledger.
+
+Ledger columns are copied into NumPy arrays once, then every report
+is a few vectorized operations over all visits, so nightly reports
+over millions of visits take seconds:
+    1. occupancy over time and its peak,
+    2. dwell-time percentiles, mean dwell time by hour of entry
+       and by colour,
+    3. utilization(share of time occupied) and turnover(visits)
+       per parking-spot.
+Times are wall clock nanoseconds since epoch. Visits still in progress
+count as occupied till the moment history was taken, and are left out
+of dwell times.
+NumPy is an optional dependency, needed by this module only.
+"""
+from datetime import datetime
+import time
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from parking_lot.ticket_ledger import TicketLedger
+
+HAS_NUMPY = np is not None
+
+NS_PER_SECOND = 10 ** 9
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+DWELL_TIME_PERCENTILES = (50, 90, 99)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise Exception("Ticket analytics needs numpy: pip install numpy")
+
+
+class VisitHistory:
+    """
+    Visits of a parking-lot as NumPy columns, one row per visit.
+    Exit time of a visit in progress is given as -1.
+    """
+    def __init__(
+        self, spot_ids, color_ids, entry_ns, exit_ns,
+        colors: Sequence[str] = (), as_of_ns: int = None
+    ):
+        _require_numpy()
+        self.spot_ids = np.asarray(spot_ids, dtype=np.int64)
+        self.color_ids = np.asarray(color_ids, dtype=np.int64)
+        self.entry_ns = np.asarray(entry_ns, dtype=np.int64)
+        exit_ns = np.asarray(exit_ns, dtype=np.int64)
+        self.is_closed = exit_ns >= 0
+        if as_of_ns is None:
+            as_of_ns = time.time_ns()
+        self.as_of_ns = as_of_ns
+        # visits in progress are occupied till now
+        self.exit_ns = np.where(self.is_closed, exit_ns, as_of_ns)
+        self.colors = list(colors)
+        # sorted entry/exit times, built on first occupancy query
+        self._sorted_entry_ns = None
+        self._sorted_exit_ns = None
+
+    @classmethod
+    def from_ticket_ledger(cls, ticket_ledger: TicketLedger) -> 'VisitHistory':
+        """
+        Take history of visits recorded so far by ticket ledger.
+        """
+        _require_numpy()
+        as_of_ns = ticket_ledger.now() + ticket_ledger.wall_clock_offset_ns
+        spot_ids, color_ids, entry_ns, exit_ns = (
+            np.frombuffer(column, dtype=np.int64)
+            for column in ticket_ledger.copy_columns(
+                'spot_id', 'color_id', 'entry_time_ns', 'exit_time_ns')
+        )
+        offset_ns = ticket_ledger.wall_clock_offset_ns
+        return cls(
+            spot_ids, color_ids, entry_ns + offset_ns,
+            np.where(exit_ns == TicketLedger.OPEN, -1, exit_ns + offset_ns),
+            ticket_ledger.colors, as_of_ns
+        )
+
+    def __len__(self) -> int:
+        return len(self.entry_ns)
+
+    @property
+    def in_progress(self) -> int:
+        return len(self.is_closed) - int(np.count_nonzero(self.is_closed))
+
+    def window(self, start_ns: int = None, stop_ns: int = None) -> Tuple[int, int]:
+        """
+        Return [start, stop) time window, defaulting to
+        first entry till moment history was taken.
+        """
+        if start_ns is None:
+            start_ns = int(self.entry_ns.min()) if len(self) else self.as_of_ns
+        if stop_ns is None:
+            stop_ns = self.as_of_ns
+        return start_ns, max(start_ns, stop_ns)
+
+    def entered_in(self, start_ns: int = None, stop_ns: int = None):
+        """
+        Return mask of visits entering within time window.
+        """
+        start_ns, stop_ns = self.window(start_ns, stop_ns)
+        return (self.entry_ns >= start_ns) & (self.entry_ns < stop_ns)
+
+    def occupancy_at(self, times_ns):
+        """
+        Return number of parking-spots occupied at each of given times.
+        """
+        if self._sorted_entry_ns is None:
+            self._sorted_entry_ns = np.sort(self.entry_ns)
+            self._sorted_exit_ns = np.sort(self.exit_ns)
+        times_ns = np.asarray(times_ns, dtype=np.int64)
+        return np.searchsorted(self._sorted_entry_ns, times_ns, 'right') \
+            - np.searchsorted(self._sorted_exit_ns, times_ns, 'right')
+
+
+def occupancy_curve(
+    history: VisitHistory, step_ns: int,
+    start_ns: int = None, stop_ns: int = None
+):
+    """
+    Return (times, occupancy) sampled every step_ns over time window.
+    """
+    start_ns, stop_ns = history.window(start_ns, stop_ns)
+    times_ns = np.arange(start_ns, stop_ns, step_ns, dtype=np.int64)
+    return times_ns, history.occupancy_at(times_ns)
+
+def peak_occupancy(
+    history: VisitHistory, start_ns: int = None, stop_ns: int = None
+) -> Tuple[int, int]:
+    """
+    Return highest occupancy over time window and first time it is reached.
+    Occupancy only rises on entries, so it peaks at window start
+    or at an entry.
+    """
+    start_ns, stop_ns = history.window(start_ns, stop_ns)
+    entry_ns = history.entry_ns[history.entered_in(start_ns, stop_ns)]
+    times_ns = np.concatenate((np.array([start_ns], dtype=np.int64), np.sort(entry_ns)))
+    occupancy = history.occupancy_at(times_ns)
+    i = int(np.argmax(occupancy))
+    return int(occupancy[i]), int(times_ns[i])
+
+def _dwell_times_ns(history: VisitHistory, start_ns: int, stop_ns: int):
+    """
+    Return (dwell time, mask) of completed visits entering within window.
+    """
+    mask = history.is_closed & history.entered_in(start_ns, stop_ns)
+    return (history.exit_ns - history.entry_ns)[mask], mask
+
+def dwell_time_percentiles(
+    history: VisitHistory,
+    percentiles: Sequence[float] = DWELL_TIME_PERCENTILES,
+    start_ns: int = None, stop_ns: int = None
+):
+    """
+    Return given percentiles of dwell time(seconds) of completed
+    visits entering within time window, NaN if there are none.
+    """
+    dwell_ns, __ = _dwell_times_ns(history, start_ns, stop_ns)
+    if not len(dwell_ns):
+        return np.full(len(percentiles), np.nan)
+    return np.percentile(dwell_ns, percentiles) / NS_PER_SECOND
+
+def mean_dwell_time_by_hour(
+    history: VisitHistory, start_ns: int = None, stop_ns: int = None,
+    utc_offset_s: int = None
+):
+    """
+    Return mean dwell time(seconds) of completed visits by hour
+    of day of entry(local time unless utc_offset_s is given),
+    as 24 values, NaN for hours without visits.
+    """
+    if utc_offset_s is None:
+        utc_offset_s = time.localtime().tm_gmtoff
+    dwell_ns, mask = _dwell_times_ns(history, start_ns, stop_ns)
+    hours = (history.entry_ns[mask] + utc_offset_s * NS_PER_SECOND) \
+        // NS_PER_HOUR % 24
+    counts = np.bincount(hours, minlength=24)
+    totals = np.bincount(hours, weights=dwell_ns, minlength=24)
+    with np.errstate(invalid='ignore'):
+        return totals / counts / NS_PER_SECOND
+
+def mean_dwell_time_by_color(
+    history: VisitHistory, start_ns: int = None, stop_ns: int = None
+) -> Dict[str, float]:
+    """
+    Return mean dwell time(seconds) of completed visits by colour.
+    """
+    dwell_ns, mask = _dwell_times_ns(history, start_ns, stop_ns)
+    color_ids = history.color_ids[mask]
+    counts = np.bincount(color_ids, minlength=len(history.colors))
+    totals = np.bincount(color_ids, weights=dwell_ns, minlength=len(history.colors))
+    return {
+        history.colors[color_id]: totals[color_id] / counts[color_id] / NS_PER_SECOND
+        for color_id in np.flatnonzero(counts)
+    }
+
+def spot_utilization(
+    history: VisitHistory, spot_count: int,
+    start_ns: int = None, stop_ns: int = None
+):
+    """
+    Return share of time window each parking-spot was occupied,
+    indexed by parking-spot id - 1.
+    """
+    start_ns, stop_ns = history.window(start_ns, stop_ns)
+    if stop_ns == start_ns:
+        return np.zeros(spot_count)
+    occupied_ns = np.clip(history.exit_ns, start_ns, stop_ns) \
+        - np.clip(history.entry_ns, start_ns, stop_ns)
+    return np.bincount(
+        history.spot_ids - 1, weights=occupied_ns, minlength=spot_count
+    )[:spot_count] / (stop_ns - start_ns)
+
+def spot_turnover(
+    history: VisitHistory, spot_count: int,
+    start_ns: int = None, stop_ns: int = None
+):
+    """
+    Return number of visits entering each parking-spot within
+    time window, indexed by parking-spot id - 1.
+    """
+    spot_ids = history.spot_ids[history.entered_in(start_ns, stop_ns)]
+    return np.bincount(spot_ids - 1, minlength=spot_count)[:spot_count]
+
+
+def _format_time(time_ns: int) -> str:
+    return datetime.fromtimestamp(time_ns / NS_PER_SECOND).strftime('%Y-%m-%d %H:%M:%S')
+
+def _format_seconds(seconds: float) -> str:
+    return f"{seconds:.1f}s"
+
+def render_report(
+    history: VisitHistory, spot_count: int,
+    start_ns: int = None, stop_ns: int = None
+) -> List[str]:
+    """
+    Render occupancy, dwell-time and per parking-spot report
+    over time window as lines of text.
+    """
+    start_ns, stop_ns = history.window(start_ns, stop_ns)
+    entered = history.entered_in(start_ns, stop_ns)
+    visits = int(np.count_nonzero(entered))
+    res = [
+        f"Report from {_format_time(start_ns)} to {_format_time(stop_ns)}",
+        f"Visits: {visits} (in progress: "
+        f"{visits - int(np.count_nonzero(entered & history.is_closed))})",
+    ]
+    if not len(history):
+        return res
+
+    peak, peak_ns = peak_occupancy(history, start_ns, stop_ns)
+    res.append(f"Peak occupancy: {peak} of {spot_count} at {_format_time(peak_ns)}")
+
+    percentiles = dwell_time_percentiles(
+        history, DWELL_TIME_PERCENTILES, start_ns, stop_ns)
+    if np.isnan(percentiles).any():
+        res.append("Dwell time: no completed visits")
+        return res
+    res.append(
+        "Dwell time " + '/'.join(f"p{p}" for p in DWELL_TIME_PERCENTILES)
+        + ": " + '/'.join(map(_format_seconds, percentiles)))
+
+    res.append("Mean dwell time by hour of entry:")
+    for hour, seconds in enumerate(mean_dwell_time_by_hour(history, start_ns, stop_ns)):
+        if not np.isnan(seconds):
+            res.append(f"{hour:02d}:00\t{_format_seconds(seconds)}")
+    res.append("Mean dwell time by colour:")
+    for color, seconds in sorted(
+        mean_dwell_time_by_color(history, start_ns, stop_ns).items()
+    ):
+        res.append(f"{color.capitalize()}\t{_format_seconds(seconds)}")
+
+    utilization = spot_utilization(history, spot_count, start_ns, stop_ns)
+    turnover = spot_turnover(history, spot_count, start_ns, stop_ns)
+    busiest = int(np.argmax(utilization))
+    res.append(
+        f"Slot utilization mean/max: {utilization.mean():.1%}/"
+        f"{utilization[busiest]:.1%} (slot {busiest + 1})")
+    busiest = int(np.argmax(turnover))
+    res.append(
+        f"Slot turnover mean/max: {turnover.mean():.1f}/"
+        f"{turnover[busiest]} (slot {busiest + 1})")
+    return res
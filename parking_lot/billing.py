@@ -0,0 +1,219 @@
+"""
+Parking fees of visits recorded by parking-lot's ticket ledger.
+
+Every parking-spot type is priced by its own tariff:
+    1. per-hour bands: each started hour of a day's stay is charged
+       at the rate of the band it falls in,
+    2. daily cap: fee of each 24 hours since entry is capped,
+       hour bands start over every 24 hours,
+    3. overnight fee: charged once for every night the stay spans,
+       i.e. every time local clock passes tariff's overnight hour.
+Fees are integers in smallest currency unit, and are computed
+with integer arithmetic only: a tariff turns its bands and cap
+into a table of fees of 0..24 hours once, so pricing a visit is
+O(1), on exit or in batch.
+Batch mode prices a whole day of visits with NumPy(optional
+dependency, needed by batch mode only) using the same tables and
+formula, so its fees match fees charged on exit exactly.
+Local time is wall clock time shifted by a fixed UTC offset,
+daylight saving changes within a stay are not taken into account.
+"""
+from array import array
+from bisect import bisect_right
+import time
+from typing import Dict, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from parking_lot.constants import ParkingSpotType
+from parking_lot.ticket_ledger import TicketLedger
+
+HAS_NUMPY = np is not None
+
+NS_PER_SECOND = 10 ** 9
+NS_PER_HOUR = 3600 * NS_PER_SECOND
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise Exception("Batch billing needs numpy: pip install numpy")
+
+
+class Tariff:
+    """
+    Fee schedule of one parking-spot type.
+    """
+    def __init__(
+        self, hour_bands: Sequence[Tuple[int, int]], daily_cap: int = None,
+        overnight_fee: int = 0, overnight_hour: int = 0
+    ):
+        """
+        hour_bands: (up to hour, rate per hour) in order, last rate
+        goes on till 24 hours, e.g. ((2, 40), (6, 30), (24, 20))
+        charges first 2 hours at 40, next 4 at 30, rest at 20.
+        """
+        up_to_hours = [hours for hours, __ in hour_bands]
+        if not hour_bands or up_to_hours != sorted(set(up_to_hours)) \
+            or up_to_hours[0] <= 0 \
+            or any(rate < 0 for __, rate in hour_bands) \
+            or (daily_cap is not None and daily_cap < 0) \
+            or overnight_fee < 0 or not 0 <= overnight_hour < 24:
+            raise Exception("Invalid tariff")
+        self.hour_bands = tuple(hour_bands)
+        self.daily_cap = daily_cap
+        self.overnight_fee = overnight_fee
+        self.overnight_hour = overnight_hour
+
+        # fee of a stay of 0..24 started hours
+        day_fees = [0]
+        for hour in range(1, 25):
+            band = min(bisect_right(up_to_hours, hour - 1), len(hour_bands) - 1)
+            day_fees.append(day_fees[-1] + hour_bands[band][1])
+        if daily_cap is not None:
+            day_fees = [min(fee, daily_cap) for fee in day_fees]
+        self._day_fees = day_fees
+
+    def fee(self, entry_ns: int, exit_ns: int, utc_offset_ns: int = 0) -> int:
+        """
+        Return fee of stay from entry to exit(wall clock ns).
+        """
+        # started hours of stay, split into full days and the rest
+        days, hours = divmod(-((entry_ns - exit_ns) // NS_PER_HOUR), 24)
+        overnight_ns = self.overnight_hour * NS_PER_HOUR - utc_offset_ns
+        nights = (exit_ns - overnight_ns) // NS_PER_DAY \
+            - (entry_ns - overnight_ns) // NS_PER_DAY
+        return days * self._day_fees[24] + self._day_fees[hours] \
+            + nights * self.overnight_fee
+
+    def fees(self, entry_ns, exit_ns, utc_offset_ns: int = 0):
+        """
+        Return NumPy array of fees of stays, same as fee of every stay.
+        """
+        _require_numpy()
+        entry_ns = np.asarray(entry_ns, dtype=np.int64)
+        exit_ns = np.asarray(exit_ns, dtype=np.int64)
+        days, hours = np.divmod(-((entry_ns - exit_ns) // NS_PER_HOUR), 24)
+        overnight_ns = self.overnight_hour * NS_PER_HOUR - utc_offset_ns
+        nights = (exit_ns - overnight_ns) // NS_PER_DAY \
+            - (entry_ns - overnight_ns) // NS_PER_DAY
+        day_fees = np.array(self._day_fees, dtype=np.int64)
+        return days * day_fees[24] + day_fees[hours] + nights * self.overnight_fee
+
+
+# parking-spot type -> its tariff
+DEFAULT_TARIFFS: Dict[ParkingSpotType, Tariff] = {
+    ParkingSpotType.FOUR_WHEELER: Tariff(
+        ((2, 40), (6, 30), (24, 20)), daily_cap=400, overnight_fee=100),
+    ParkingSpotType.TWO_WHEELER: Tariff(
+        ((2, 20), (6, 15), (24, 10)), daily_cap=200, overnight_fee=50),
+    ParkingSpotType.LARGE: Tariff(
+        ((2, 60), (6, 45), (24, 30)), daily_cap=600, overnight_fee=150),
+    ParkingSpotType.HEAVY: Tariff(
+        ((2, 100), (6, 80), (24, 60)), daily_cap=1200, overnight_fee=300),
+}
+
+
+class Billing:
+    """
+    Fees of a parking-lot's visits.
+    Fee of a visit is charged on exit, and kept in a column
+    indexed by visit's row in ticket ledger(-1 till charged).
+    Parking-spot type of a visit is looked up from its parking-spot id,
+    parking-spot types taking contiguous blocks of parking-spot ids.
+    """
+    UNBILLED = -1
+
+    def __init__(
+        self, spot_blocks: Sequence[Tuple[int, ParkingSpotType]],
+        tariffs: Dict[ParkingSpotType, Tariff] = None,
+        utc_offset_s: int = None
+    ):
+        """
+        spot_blocks: (first parking-spot id, parking-spot type) of
+        every block of parking-spots, in order.
+        Overnight fees go by local time unless utc_offset_s is given.
+        """
+        self._tariffs = dict(tariffs if tariffs is not None else DEFAULT_TARIFFS)
+        self._block_first_ids = [first_id for first_id, __ in spot_blocks]
+        self._block_spot_types = [spot_type for __, spot_type in spot_blocks]
+        if any(spot_type not in self._tariffs for spot_type in self._block_spot_types):
+            raise Exception("Missing tariff of parking-spot type")
+        if utc_offset_s is None:
+            utc_offset_s = time.localtime().tm_gmtoff
+        self._utc_offset_ns = utc_offset_s * NS_PER_SECOND
+        self._fees = array('q')
+
+    @property
+    def tariffs(self) -> Dict[ParkingSpotType, Tariff]:
+        return self._tariffs
+
+    def get_spot_type(self, spot_id: int) -> ParkingSpotType:
+        return self._block_spot_types[bisect_right(self._block_first_ids, spot_id) - 1]
+
+    def charge(
+        self, row: int, parking_spot_type: ParkingSpotType,
+        entry_ns: int, exit_ns: int
+    ) -> int:
+        """
+        Charge visit at ticket ledger's row for its stay(wall clock ns).
+        Return fee.
+        """
+        fee = self._tariffs[parking_spot_type].fee(entry_ns, exit_ns, self._utc_offset_ns)
+        fees = self._fees
+        if row >= len(fees):
+            fees.extend(array('q', [Billing.UNBILLED]) * (row + 1 - len(fees)))
+        fees[row] = fee
+        return fee
+
+    def get_fee(self, row: int) -> int:
+        """
+        Return fee charged for visit at ticket ledger's row, -1 if none.
+        """
+        return self._fees[row] if row < len(self._fees) else Billing.UNBILLED
+
+    def price_visits(self, spot_ids, entry_ns, exit_ns):
+        """
+        Return NumPy array of fees of visits(wall clock ns),
+        priced in batch.
+        """
+        _require_numpy()
+        spot_ids = np.asarray(spot_ids, dtype=np.int64)
+        entry_ns = np.asarray(entry_ns, dtype=np.int64)
+        exit_ns = np.asarray(exit_ns, dtype=np.int64)
+        blocks = np.searchsorted(
+            np.array(self._block_first_ids, dtype=np.int64), spot_ids, 'right') - 1
+        fees = np.zeros(len(spot_ids), dtype=np.int64)
+        for block, spot_type in enumerate(self._block_spot_types):
+            mask = blocks == block
+            if mask.any():
+                fees[mask] = self._tariffs[spot_type].fees(
+                    entry_ns[mask], exit_ns[mask], self._utc_offset_ns)
+        return fees
+
+    def price_ticket_ledger(
+        self, ticket_ledger: TicketLedger,
+        start_ns: int = None, stop_ns: int = None
+    ):
+        """
+        Price completed visits of ticket ledger exiting within
+        [start, stop)(wall clock ns, all visits by default) in batch.
+        Return NumPy arrays (ticket ids, fees).
+        """
+        _require_numpy()
+        ticket_ids, spot_ids, entry_ns, exit_ns = (
+            np.frombuffer(column, dtype=np.int64)
+            for column in ticket_ledger.copy_columns(
+                'ticket_id', 'spot_id', 'entry_time_ns', 'exit_time_ns')
+        )
+        offset_ns = ticket_ledger.wall_clock_offset_ns
+        mask = exit_ns != TicketLedger.OPEN
+        if start_ns is not None:
+            mask &= exit_ns + offset_ns >= start_ns
+        if stop_ns is not None:
+            mask &= exit_ns + offset_ns < stop_ns
+        return ticket_ids[mask], self.price_visits(
+            spot_ids[mask], entry_ns[mask] + offset_ns, exit_ns[mask] + offset_ns)
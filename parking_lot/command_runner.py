@@ -0,0 +1,287 @@
+from collections import deque
+from datetime import date, datetime
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterable, Optional, TextIO, Tuple
+
+from parking_lot.constants import ParkingSpotType, VehicleType
+from parking_lot.parking_lot_command import (
+    FourWheelerParkingLotCommand,
+    CreateFourWheelerParkingLot, ParkFourWheelerCommand,
+    LeaveFourWheelerParkingLotCommand, FourWheelerParkingLotStatus,
+    ParkManyFourWheelersCommand, LeaveManyFourWheelersParkingLotCommand,
+    FourWheeelerRegNosWithColor, FourWheelerParkingSpotNosFromVehicleColor,
+    FourWheelerParkingSpotNoFromRegNo, FourWheelerParkingSpotNosFromRegNoPrefix,
+    SnapshotFourWheelerParkingLot,
+    ParkAnywhereFourWheelerCommand, FourWheelerParkingLotFromRegNo,
+    FourWheelerParkingLotMetrics, FourWheelerParkingLotEvents,
+    FourWheelerParkingLotAnalytics, ReserveFourWheelerParkingSpot,
+    CancelFourWheelerReservation, ExpandFourWheelerParkingLot,
+    ShrinkFourWheelerParkingLot, FourWheelerParkingLotInvoice,
+    InvalidFourWheelerParkingLotArguments
+)
+from parking_lot.profiling import CommandProfiler
+
+
+def split_lot_id(args: str) -> Tuple[str, Optional[int]]:
+    """
+    Split trailing '@<lot-id>' token off command arguments.
+    Return remaining arguments and lot id, None for default parking-lot.
+    """
+    rest, sep, lot_id = args.rpartition('@')
+    if not sep or ' ' in lot_id:
+        return args, None
+    return rest.strip(), int(lot_id)
+
+def parse_create_parking_lot(args: str) -> FourWheelerParkingLotCommand:
+    """
+    '<N> [two_wheeler=<K>] [large=<K>] [heavy=<K>]', N four-wheeler
+    parking-spots plus K parking-spots of each other type given.
+    """
+    max_four_wheeler_spots, *args = args.split()
+    spot_counts = {}
+    for arg in args:
+        spot_type, __, count = arg.partition('=')
+        if spot_type.upper() not in ParkingSpotType.__members__:
+            raise Exception(f"Invalid parking spot type: {spot_type}")
+        spot_counts[ParkingSpotType[spot_type.upper()]] = int(count)
+    return CreateFourWheelerParkingLot(int(max_four_wheeler_spots), spot_counts)
+
+def parse_expand_parking_lot(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    return ExpandFourWheelerParkingLot(int(args), lot_id)
+
+def parse_shrink_parking_lot(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    return ShrinkFourWheelerParkingLot(int(args), lot_id)
+
+def parse_park(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    registration_number, color, *vehicle_type = args.split(' ')
+    if not vehicle_type:
+        return ParkFourWheelerCommand(registration_number, color, lot_id)
+    vehicle_type, = vehicle_type
+    if vehicle_type.upper() not in VehicleType.__members__:
+        raise Exception(f"Invalid vehicle type: {vehicle_type}")
+    return ParkFourWheelerCommand(
+        registration_number, color, lot_id, VehicleType[vehicle_type.upper()])
+
+def parse_park_anywhere(args: str) -> FourWheelerParkingLotCommand:
+    registration_number, color = args.split(' ')
+    return ParkAnywhereFourWheelerCommand(registration_number, color)
+
+def parse_park_many(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    args = args.split(' ')
+    return ParkManyFourWheelersCommand(list(zip(args[::2], args[1::2])), lot_id)
+
+def parse_leave(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    return LeaveFourWheelerParkingLotCommand(int(args), lot_id)
+
+def parse_leave_many(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    return LeaveManyFourWheelersParkingLotCommand(
+        list(map(int, args.split(' '))), lot_id)
+
+def parse_status(args: str) -> FourWheelerParkingLotCommand:
+    """
+    '[<offset> [<limit>]]', arguments after them are ignored.
+    """
+    try:
+        values, lot_id = split_lot_id(args)
+        values = list(map(int, values.split()[:2]))
+    except ValueError:
+        return InvalidFourWheelerParkingLotArguments(f"status {args}")
+    offset = values[0] if values else 0
+    limit = values[1] if len(values) > 1 else None
+    return FourWheelerParkingLotStatus(offset, limit, lot_id)
+
+def parse_registration_numbers_for_cars_with_colour(
+    args: str
+) -> FourWheelerParkingLotCommand:
+    return FourWheeelerRegNosWithColor(*split_lot_id(args))
+
+def parse_slot_numbers_for_cars_with_colour(
+    args: str
+) -> FourWheelerParkingLotCommand:
+    return FourWheelerParkingSpotNosFromVehicleColor(*split_lot_id(args))
+
+def parse_slot_number_for_registration_number(
+    args: str
+) -> FourWheelerParkingLotCommand:
+    return FourWheelerParkingSpotNoFromRegNo(*split_lot_id(args))
+
+def parse_slot_numbers_for_registration_prefix(
+    args: str
+) -> FourWheelerParkingLotCommand:
+    return FourWheelerParkingSpotNosFromRegNoPrefix(*split_lot_id(args))
+
+def parse_lot_for_registration_number(
+    args: str
+) -> FourWheelerParkingLotCommand:
+    return FourWheelerParkingLotFromRegNo(args)
+
+def parse_snapshot(args: str) -> FourWheelerParkingLotCommand:
+    return SnapshotFourWheelerParkingLot()
+
+def parse_metrics(args: str) -> FourWheelerParkingLotCommand:
+    return FourWheelerParkingLotMetrics()
+
+def parse_events(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    args = list(map(int, args.split(' ')))
+    return FourWheelerParkingLotEvents(*args, lot_id=lot_id)
+
+def parse_analytics(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    return FourWheelerParkingLotAnalytics(int(args) if args else None, lot_id)
+
+def parse_invoice(args: str) -> FourWheelerParkingLotCommand:
+    """
+    '[<YYYY-MM-DD>]', day visits ended on, today by default.
+    """
+    args, lot_id = split_lot_id(args)
+    return FourWheelerParkingLotInvoice(
+        date.fromisoformat(args) if args else None, lot_id)
+
+def parse_reserve(args: str) -> FourWheelerParkingLotCommand:
+    """
+    '<reg-no> <start> <end> [<slot>]', times in ISO format(local time).
+    """
+    args, lot_id = split_lot_id(args)
+    registration_number, start, end, *parking_spot_id = args.split(' ')
+    return ReserveFourWheelerParkingSpot(
+        registration_number, datetime.fromisoformat(start),
+        datetime.fromisoformat(end),
+        int(parking_spot_id[0]) if parking_spot_id else None, lot_id)
+
+def parse_cancel_reservation(args: str) -> FourWheelerParkingLotCommand:
+    args, lot_id = split_lot_id(args)
+    return CancelFourWheelerReservation(int(args), lot_id)
+
+
+# command name -> parser building command object from its arguments
+COMMAND_TABLE: Dict[str, Callable[[str], FourWheelerParkingLotCommand]] = {
+    'create_parking_lot': parse_create_parking_lot,
+    'expand_parking_lot': parse_expand_parking_lot,
+    'shrink_parking_lot': parse_shrink_parking_lot,
+    'park': parse_park,
+    'park_anywhere': parse_park_anywhere,
+    'park_many': parse_park_many,
+    'leave': parse_leave,
+    'leave_many': parse_leave_many,
+    'status': parse_status,
+    'registration_numbers_for_cars_with_colour':
+        parse_registration_numbers_for_cars_with_colour,
+    'slot_numbers_for_cars_with_colour':
+        parse_slot_numbers_for_cars_with_colour,
+    'slot_number_for_registration_number':
+        parse_slot_number_for_registration_number,
+    'slot_numbers_for_registration_prefix':
+        parse_slot_numbers_for_registration_prefix,
+    'lot_for_registration_number': parse_lot_for_registration_number,
+    'snapshot': parse_snapshot,
+    'metrics': parse_metrics,
+    'events': parse_events,
+    'analytics': parse_analytics,
+    'invoice': parse_invoice,
+    'reserve': parse_reserve,
+    'cancel_reservation': parse_cancel_reservation,
+}
+
+
+class BatchCommandRunner:
+    """
+    Non-interactive runner of parking-lot commands.
+    Lines are consumed lazily, dispatched through COMMAND_TABLE
+    and results written to a (buffered) file object.
+    Output matches playback in the interactive shell,
+    including repeating last command on blank lines and
+    reporting unknown commands.
+    """
+    def __init__(self, out: TextIO):
+        self._out = out
+        self._last_line = ''
+        self._pending = deque()
+
+    def run(self, lines: Iterable[str]) -> None:
+        """
+        Execute commands till input is exhausted or exit is read.
+        """
+        self._pending.append(iter(lines))
+        while self._pending:
+            for line in self._pending[0]:
+                if not self.run_line(line):
+                    self._pending.clear()
+                    return
+            self._pending.popleft()
+
+    def run_line(self, line: str) -> bool:
+        """
+        Execute one command line.
+        Return False once exit is requested.
+        """
+        line = line.strip()
+        if not line:
+            # shell repeats last command on blank line
+            if not self._last_line:
+                return True
+            line = self._last_line
+        self._last_line = line
+
+        name, __, args = line.partition(' ')
+        args = args.strip()
+        parse = COMMAND_TABLE.get(name)
+        if parse is not None:
+            self._run_command(name, parse, args)
+        elif name == 'exit':
+            return False
+        elif name == 'playback':
+            self._pending.append(self._read_lines(args))
+        else:
+            self._out.write(f"*** Unknown syntax: {line}\n")
+        return True
+
+    def _run_command(
+        self, name: str, parse: Callable[[str], FourWheelerParkingLotCommand],
+        args: str
+    ) -> None:
+        self._execute(parse(args))
+
+    def _execute(self, command: FourWheelerParkingLotCommand) -> None:
+        if isinstance(command, FourWheelerParkingLotStatus):
+            command.write_to(self._out)
+        else:
+            self._out.write(str(command.execute()))
+        self._out.write('\n')
+
+    @staticmethod
+    def _read_lines(path: str) -> Iterable[str]:
+        with open(path) as f:
+            yield from f
+
+
+class ProfilingBatchCommandRunner(BatchCommandRunner):
+    """
+    Batch runner recording time of every command per phase
+    (parse, execute, format, write) into a CommandProfiler.
+    """
+    def __init__(self, out: TextIO, profiler: CommandProfiler):
+        super().__init__(out)
+        self._profiler = profiler
+
+    def _run_command(
+        self, name: str, parse: Callable[[str], FourWheelerParkingLotCommand],
+        args: str
+    ) -> None:
+        t0 = perf_counter_ns()
+        command = parse(args)
+        t1 = perf_counter_ns()
+        res = command.execute()
+        t2 = perf_counter_ns()
+        res = str(res) + '\n'
+        t3 = perf_counter_ns()
+        self._out.write(res)
+        t4 = perf_counter_ns()
+        self._profiler.record(
+            name, parse=t1 - t0, execute=t2 - t1, format=t3 - t2, write=t4 - t3)
@@ -0,0 +1,112 @@
+"""
+asyncio network server speaking parking-lot shell's command protocol.
+
+Requests are the shell's command lines, one per line. Every response is
+the shell's output for the command followed by an empty line, so clients
+may pipeline requests and match responses in order. 'exit' closes the
+connection.
+
+All connections share the parking-lots of parking_lot_command's command
+classes. Commands run on the event loop thread, one at a time.
+"""
+import asyncio
+from typing import List, Optional
+
+from parking_lot.command_runner import COMMAND_TABLE
+
+# longest request line accepted, connection is closed beyond it
+MAX_LINE_LENGTH = 64 * 1024
+
+
+def execute_command_line(line: str) -> Optional[str]:
+    """
+    Execute one command line.
+    Return framed response, None once exit is requested.
+    """
+    name, __, args = line.partition(' ')
+    args = args.strip()
+    parse = COMMAND_TABLE.get(name)
+    if parse is None:
+        if name == 'exit':
+            return None
+        return f"*** Unknown syntax: {line}\n\n"
+    # a failing command gets an error response, it must not
+    # take down the connection and responses of lines before it
+    try:
+        command = parse(args)
+    except Exception:
+        return f"*** Invalid arguments: {line}\n\n"
+    try:
+        res = str(command.execute()).rstrip('\n')
+    except Exception:
+        return f"*** Command failed: {line}\n\n"
+    if not res:
+        return '\n'
+    return res + '\n\n'
+
+
+class ParkingLotProtocol(asyncio.Protocol):
+    """
+    One client connection.
+    Every complete request line in a received chunk is executed and
+    their responses are written back with a single write. Reading pauses
+    while client does not keep up with responses.
+    """
+    def __init__(self):
+        self._transport: asyncio.Transport = None
+        self._buffer = b''
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self._transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        *lines, self._buffer = (self._buffer + data).split(b'\n')
+        responses: List[str] = []
+        is_closing = False
+        try:
+            for line in lines:
+                line = line.decode(errors='replace').strip()
+                if not line:
+                    continue
+                response = execute_command_line(line)
+                if response is None:
+                    is_closing = True
+                    break
+                responses.append(response)
+        finally:
+            # responses of lines already executed are never dropped
+            if responses:
+                self._transport.write(''.join(responses).encode())
+        if len(self._buffer) > MAX_LINE_LENGTH:
+            self._transport.write(b"*** Request line too long\n\n")
+            is_closing = True
+        if is_closing:
+            self._transport.close()
+
+    def pause_writing(self) -> None:
+        self._transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        self._transport.resume_reading()
+
+
+async def start_server(
+    host: str = '127.0.0.1', port: int = 8765, unix_path: str = None
+) -> asyncio.AbstractServer:
+    """
+    Start listening on TCP host:port, or on unix socket if unix_path given.
+    """
+    loop = asyncio.get_running_loop()
+    if unix_path:
+        return await loop.create_unix_server(ParkingLotProtocol, unix_path)
+    return await loop.create_server(ParkingLotProtocol, host, port)
+
+async def serve(
+    host: str = '127.0.0.1', port: int = 8765, unix_path: str = None
+) -> None:
+    """
+    Serve parking-lot commands till cancelled.
+    """
+    server = await start_server(host, port, unix_path)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,309 @@
+import threading
+import time
+from typing import Callable, Iterator, List
+
+from parking_lot.constants import (
+    ParkingLotEvent, ParkingSpotType, ParkOutcome, VehicleType
+)
+from parking_lot.interning import COLORS
+from parking_lot.parking_lot import FourWheelerParkingLot
+from parking_lot.parking_spot import ParkingSpot
+from parking_lot.vehicle import Vehicle
+
+
+class ConcurrentFourWheelerParkingLot(FourWheelerParkingLot):
+    """
+    Four-wheeler parking-lot shared by gate controllers running
+    as threads.
+    Locking is fine grained, so parks/exits of different vehicles
+    only meet on short critical sections:
+        1. plate locks(striped by registration number), held for whole
+           park/exit of a vehicle, so a vehicle is parked at most once,
+        2. spot lock, guarding spot pools(allocators and counters),
+        3. occupied lock, guarding ordered index of occupied spots,
+        4. color locks(striped by colour id), guarding color index,
+        5. ledger lock, guarding ticket issue, ticket ledger and billing,
+        6. listeners lock, so listeners need not be thread-safe,
+        7. registration index lock, guarding sorted registration numbers.
+    Plate lock is always taken first, locks 2-7 are never nested.
+    No step relies on the GIL, lot works on free-threaded builds too.
+    """
+    def __init__(self, lock_stripes: int = 64):
+        super().__init__()
+        self._lock_stripes = lock_stripes
+        self._plate_locks = [threading.Lock() for __ in range(lock_stripes)]
+        self._color_locks = [threading.Lock() for __ in range(lock_stripes)]
+        self._spot_lock = threading.Lock()
+        self._occupied_lock = threading.Lock()
+        self._ledger_lock = threading.Lock()
+        self._listeners_lock = threading.Lock()
+        self._registration_index_lock = threading.Lock()
+
+    def enable_reservations(
+        self, lead_time_ns: int = 0, clock: Callable[[], int] = time.time_ns
+    ):
+        raise Exception("Reservations are not supported by concurrent parking-lot")
+
+    def is_resizable(
+        self, parking_spot_type: ParkingSpotType = ParkingSpotType.FOUR_WHEELER
+    ) -> bool:
+        # resizing would have to stop every gate
+        return False
+
+    def _plate_lock(self, registration_number: str) -> threading.Lock:
+        return self._plate_locks[hash(registration_number) % self._lock_stripes]
+
+    def _color_lock(self, color_id: int) -> threading.Lock:
+        return self._color_locks[color_id % self._lock_stripes]
+
+    def allocate_parking_spot(self, vehicle: Vehicle) -> bool:
+        """
+        Allocate parking spot to incoming vehicle.
+        """
+        return self._allocate_parking_spot(vehicle) is ParkOutcome.PARKED
+
+    def free_up_parking_spot(self, parking_spot_id: int) -> bool:
+        """
+        Change state of vehicle, parking-spot
+        and parking-lot on vehicle's EXIT.
+        """
+        return self._free_up_parking_spot(parking_spot_id) >= 0
+
+    def check_out(self, parking_spot_id: int) -> int:
+        """
+        Free up parking-spot as free_up_parking_spot does.
+        Return ticket ledger row of the visit closed, -1 if
+        parking-spot is not freed.
+        """
+        return self._free_up_parking_spot(parking_spot_id)
+
+    def _allocate_parking_spot(self, vehicle: Vehicle) -> ParkOutcome:
+        # raise on vehicle types parking-lot has no rules for
+        self._get_spot_types(vehicle.type_)
+        with self._plate_lock(vehicle.registration_number):
+            if self._is_vehicle_parked_in_parking_lot(vehicle):
+                return ParkOutcome.DUPLICATE
+            parking_spot = self._claim_spot_for_vehicle(vehicle)
+            if parking_spot is None:
+                return ParkOutcome.FULL
+            self._occupy_parking_spot(vehicle, parking_spot)
+            self._issue_new_parking_ticket(vehicle)
+            self._add_vehicle_details(vehicle)
+            if self._event_listeners:
+                self._notify_event_listeners(ParkingLotEvent.PARK, vehicle)
+        return ParkOutcome.PARKED
+
+    def _free_up_parking_spot(self, parking_spot_id: int) -> int:
+        if not 1 <= parking_spot_id <= len(self._parking_spots):
+            return -1
+        parking_spot: ParkingSpot = self._parking_spots[parking_spot_id - 1]
+        vehicle: Vehicle = parking_spot.vehicle
+        if vehicle is None:
+            return -1
+        with self._plate_lock(vehicle.registration_number):
+            # spot could be freed(and re-taken) before lock was held
+            if parking_spot.vehicle is not vehicle \
+                or self._parked_vehicles.get(vehicle.registration_number) is not vehicle:
+                return -1
+            if self._event_listeners:
+                self._notify_event_listeners(ParkingLotEvent.UNPARK, vehicle)
+            self._remove_vehicle_details(vehicle)
+            return self._unpark_vehicle(vehicle)
+
+    def park_many(self, vehicles: List[Vehicle]) -> List[ParkOutcome]:
+        """
+        Allocate parking spots to a burst of incoming vehicles,
+        one by one in given order, locking per vehicle so other
+        gates are not held up by the burst.
+        """
+        return [self._allocate_parking_spot(vehicle) for vehicle in vehicles]
+
+    def leave_many(self, parking_spot_ids: List[int]) -> List[bool]:
+        """
+        Free up parking-spots of a burst of exiting vehicles,
+        in given order, locking per parking-spot.
+        """
+        return [
+            self._free_up_parking_spot(parking_spot_id) >= 0
+            for parking_spot_id in parking_spot_ids
+        ]
+
+    def restore_parked_vehicle(
+        self, vehicle: Vehicle, parking_spot_id: int,
+        ticket_id: int, entry_time_ns: int
+    ) -> bool:
+        """
+        Put back vehicle parked before restart into its
+        parking-spot, re-issuing its original ticket.
+        """
+        with self._plate_lock(vehicle.registration_number):
+            spot_pool = self._get_restored_spot_pool(vehicle, parking_spot_id)
+            if spot_pool is None:
+                return False
+            parking_spot: ParkingSpot = self._parking_spots[parking_spot_id - 1]
+            with self._spot_lock:
+                if not parking_spot.is_free() \
+                    or not spot_pool.claim(parking_spot_id - 1):
+                    return False
+                spot_pool.taken_spots += 1
+            self._occupy_parking_spot(vehicle, parking_spot)
+            with self._ledger_lock:
+                self._reissue_parking_ticket(vehicle, ticket_id, entry_time_ns)
+            self._add_vehicle_details(vehicle)
+        return True
+
+    def _claim_spot_for_vehicle(self, vehicle: Vehicle) -> ParkingSpot:
+        """
+        Take next free parking-spot for vehicle, from first spot pool
+        of its rules with room, and count it in.
+        Return parking-spot, None if parking-lot is full.
+        """
+        with self._spot_lock:
+            spot_pool = self._get_spot_pool(vehicle.type_)
+            if spot_pool is None:
+                return None
+            index = spot_pool.acquire(vehicle.gate)
+            spot_pool.taken_spots += 1
+        return self._parking_spots[index]
+
+    def _occupy_parking_spot(
+        self, vehicle: Vehicle, parking_spot: ParkingSpot
+    ) -> None:
+        """
+        Place vehicle in given parking-spot.
+        """
+        parking_spot.occupy_spot(vehicle)
+        vehicle.parking_spot = parking_spot
+        with self._occupied_lock:
+            self._occupied_spots.add(parking_spot.id_ - 1)
+
+    def _issue_new_parking_ticket(self, vehicle: Vehicle) -> None:
+        with self._ledger_lock:
+            super()._issue_new_parking_ticket(vehicle)
+
+    def _add_vehicle_details(self, vehicle: Vehicle) -> None:
+        self._parked_vehicles[vehicle.registration_number] = vehicle
+        with self._registration_index_lock:
+            self._registration_numbers.add(vehicle.registration_number)
+        with self._color_lock(vehicle.color_id):
+            self._color_spots_map[vehicle.color_id].add(vehicle.parking_spot.id_ - 1)
+
+    def _remove_vehicle_details(self, vehicle: Vehicle) -> None:
+        self._parked_vehicles.pop(vehicle.registration_number, None)
+        with self._registration_index_lock:
+            self._registration_numbers.discard(vehicle.registration_number)
+        with self._color_lock(vehicle.color_id):
+            color_spots = self._color_spots_map.get(vehicle.color_id)
+            if color_spots is not None:
+                color_spots.discard(vehicle.parking_spot.id_ - 1)
+                if not color_spots:
+                    del self._color_spots_map[vehicle.color_id]
+
+    def _unpark_vehicle(self, vehicle: Vehicle) -> int:
+        """
+        Unpark vehicle from parking lot, handing its
+        parking-spot back to allocator last.
+        Return ticket ledger row of vehicle's visit.
+        """
+        parking_spot = vehicle.parking_spot
+        index = parking_spot.id_ - 1
+        parking_spot.free_up_spot()
+        spot_pool = self._spot_pools[parking_spot.parking_spot_type]
+        with self._occupied_lock:
+            self._occupied_spots.discard(index)
+        with self._ledger_lock:
+            row = self._close_visit(vehicle, parking_spot.parking_spot_type)
+        vehicle._deallocate_parking_spot()
+        with self._spot_lock:
+            spot_pool.release(index)
+            spot_pool.taken_spots = max(0, spot_pool.taken_spots - 1)
+        return row
+
+    def _notify_event_listeners(
+        self, event: ParkingLotEvent, vehicle: Vehicle
+    ) -> None:
+        with self._listeners_lock:
+            super()._notify_event_listeners(event, vehicle)
+
+    def get_registration_numbers_of_vehicle_with_color(
+        self, color: str, vehicle_type: VehicleType = None
+    ) -> List[str]:
+        color_id = COLORS.find(color)
+        if color_id is None:
+            return []
+        with self._color_lock(color_id):
+            color_spots = list(self._color_spots_map.get(color_id, ()))
+        res = []
+        for i in color_spots:
+            vehicle: Vehicle = self._parking_spots[i].vehicle
+            # skip vehicles gone since index was read
+            if vehicle is not None and vehicle.color_id == color_id \
+                and (not vehicle_type or vehicle.type_predicate(vehicle_type)):
+                res.append(vehicle.registration_number)
+        return res
+
+    def get_parking_spot_numbers_of_vehicles_with_color(
+        self, color: str, vehicle_type: VehicleType = None
+    ) -> List[int]:
+        color_id = COLORS.find(color)
+        if color_id is None:
+            return []
+        with self._color_lock(color_id):
+            color_spots = list(self._color_spots_map.get(color_id, ()))
+        if not vehicle_type:
+            return [i + 1 for i in color_spots]
+        res = []
+        for i in color_spots:
+            vehicle: Vehicle = self._parking_spots[i].vehicle
+            if vehicle is not None and vehicle.type_predicate(vehicle_type):
+                res.append(i + 1)
+        return res
+
+    def get_parking_spot_numbers_of_registration_prefix(
+        self, prefix: str
+    ) -> List[int]:
+        with self._registration_index_lock:
+            registration_numbers = list(
+                self._iter_registration_numbers_with_prefix(prefix.upper()))
+        res = []
+        for registration_number in registration_numbers:
+            vehicle: Vehicle = self._parked_vehicles.get(registration_number)
+            parking_spot: ParkingSpot = vehicle and vehicle.parking_spot
+            # skip vehicles gone since index was read
+            if parking_spot:
+                res.append(parking_spot.id_)
+        res.sort()
+        return res
+
+    def get_vehicle_spot_number(
+        self, vehicle_registration_number: str
+    ) -> int:
+        if not(
+            isinstance(vehicle_registration_number, str)
+            and vehicle_registration_number.isupper()
+        ):
+            return
+        vehicle: Vehicle = self._parked_vehicles.get(vehicle_registration_number)
+        parking_spot: ParkingSpot = vehicle and vehicle.parking_spot
+        if not parking_spot:
+            return
+        return parking_spot.id_
+
+    def iter_parking_lot_status(
+        self, offset: int = 0, limit: int = None
+    ) -> Iterator[tuple]:
+        """
+        Stream status rows of occupied parking-spots in spot order,
+        as of the moment streaming starts.
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            return
+        stop = None if limit is None else offset + limit
+        with self._occupied_lock:
+            occupied_spots = list(self._occupied_spots.islice(offset, stop))
+        for i in occupied_spots:
+            parking_spot: ParkingSpot = self._parking_spots[i]
+            vehicle = parking_spot.vehicle
+            if vehicle is None:
+                continue
+            yield (parking_spot.id_, vehicle.registration_number.upper(), COLORS.label(vehicle.color_id))
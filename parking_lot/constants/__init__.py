@@ -1,3 +1,3 @@
-from .parking_lot import ParkingLotEvent
-from .parking_spot import ParkingSpotType
+from .parking_lot import ParkingLotEvent, ParkOutcome
+from .parking_spot import DEFAULT_SPOT_TYPE_RULES, ParkingSpotType
 from .vehicle import VehicleType
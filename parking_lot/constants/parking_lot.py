@@ -4,3 +4,9 @@ from enum import Enum
 class ParkingLotEvent(Enum):
     PARK = 1
     UNPARK = 2
+
+class ParkOutcome(Enum):
+    PARKED = 1
+    # vehicle, or one with its registration number, is parked already
+    DUPLICATE = 2
+    FULL = 3
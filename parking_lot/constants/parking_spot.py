@@ -1,5 +1,20 @@
 from enum import Enum
 
+from .vehicle import VehicleType
+
 
 class ParkingSpotType(Enum):
     FOUR_WHEELER = 1
+    TWO_WHEELER = 2
+    LARGE = 3
+    HEAVY = 4
+
+
+# vehicle type -> parking-spot types it may take, in order of preference:
+# a motorbike takes a four-wheeler spot only once two-wheeler spots are full
+DEFAULT_SPOT_TYPE_RULES = {
+    VehicleType.CAR: (ParkingSpotType.FOUR_WHEELER,),
+    VehicleType.MOTORBIKE: (ParkingSpotType.TWO_WHEELER, ParkingSpotType.FOUR_WHEELER),
+    VehicleType.VAN: (ParkingSpotType.LARGE,),
+    VehicleType.TRUCK: (ParkingSpotType.HEAVY,),
+}
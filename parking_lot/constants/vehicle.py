@@ -3,3 +3,6 @@ from enum import Enum
 
 class VehicleType(Enum):
     CAR = 1
+    MOTORBIKE = 2
+    VAN = 3
+    TRUCK = 4
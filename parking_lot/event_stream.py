@@ -0,0 +1,162 @@
+"""
+Stream of parking-lot PARK/UNPARK events for downstream consumers
+(display boards, billing), so they need not poll parking-lot status.
+
+Events are published by parking-lot, as its event listener, into a
+bounded ring buffer of preallocated columns: publishing is O(1) and
+allocates nothing but the column slots' values.
+Every event gets a sequence number; consumers read batches of events
+from a cursor(next sequence number to read).
+
+Overflow policy: publisher never waits for consumers. Once ring buffer
+is full, oldest events are overwritten. A consumer whose cursor falls
+behind the oldest retained event skips to it, and the number of events
+it missed is reported with the batch, so it can resync from status.
+"""
+from array import array
+from collections import namedtuple
+import time
+from typing import List
+
+from parking_lot.constants import ParkingLotEvent
+from parking_lot.vehicle import Vehicle
+
+StreamEvent = namedtuple(
+    'StreamEvent',
+    ['seq', 'event', 'spot_id', 'registration_number', 'color', 'ticket_id', 'time_ns']
+)
+# events read, cursor to read from next, events skipped by overflow
+EventBatch = namedtuple('EventBatch', ['events', 'cursor', 'missed'])
+
+
+class ParkingLotEventStream:
+    """
+    Bounded ring buffer of parking-lot events, with a single publisher.
+    """
+    def __init__(self, capacity: int = 65536):
+        if capacity <= 0:
+            raise Exception("Invalid event stream capacity")
+        self._capacity = capacity
+        self._events = array('B', bytes(capacity))
+        self._spot_ids = array('q', bytes(8 * capacity))
+        self._ticket_ids = array('q', bytes(8 * capacity))
+        self._times = array('q', bytes(8 * capacity))
+        self._registration_numbers: List[str] = [None] * capacity
+        self._colors: List[str] = [None] * capacity
+        # sequence number of next event published
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self._capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def first_seq(self) -> int:
+        """
+        Sequence number of oldest event retained.
+        """
+        return max(0, self._next_seq - self._capacity)
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    def __call__(self, event: ParkingLotEvent, vehicle: Vehicle) -> None:
+        self.publish(
+            event, vehicle.parking_spot.id_, vehicle.registration_number,
+            vehicle.color, vehicle.ticket.id_,
+            vehicle.ticket.entry_time_ns if event is ParkingLotEvent.PARK
+            else time.time_ns()
+        )
+
+    def publish(
+        self, event: ParkingLotEvent, spot_id: int, registration_number: str,
+        color: str, ticket_id: int, time_ns: int
+    ) -> int:
+        """
+        Add event, overwriting oldest one when full.
+        Return its sequence number.
+        """
+        seq = self._next_seq
+        i = seq % self._capacity
+        self._events[i] = event.value
+        self._spot_ids[i] = spot_id
+        self._registration_numbers[i] = registration_number
+        self._colors[i] = color
+        self._ticket_ids[i] = ticket_id
+        self._times[i] = time_ns
+        # event becomes visible to readers once fully written
+        self._next_seq = seq + 1
+        return seq
+
+    def read(self, cursor: int, max_events: int = 1024) -> EventBatch:
+        """
+        Read up to max_events events from cursor onwards.
+        Cursor beyond next event to be published reads nothing
+        and is returned as is, so it never moves backwards.
+        """
+        first_seq = self.first_seq
+        missed = 0
+        if cursor < first_seq:
+            missed = first_seq - cursor
+            cursor = first_seq
+        stop = max(cursor, min(self._next_seq, cursor + max_events))
+
+        capacity = self._capacity
+        events = []
+        for seq in range(cursor, stop):
+            i = seq % capacity
+            events.append(StreamEvent(
+                seq, ParkingLotEvent(self._events[i]), self._spot_ids[i],
+                self._registration_numbers[i], self._colors[i],
+                self._ticket_ids[i], self._times[i]
+            ))
+
+        # drop events overwritten while they were read
+        first_seq = self.first_seq
+        if events and events[0].seq < first_seq:
+            overwritten = min(len(events), first_seq - events[0].seq)
+            missed += overwritten
+            events = events[overwritten:]
+        return EventBatch(events, stop, missed)
+
+    def subscribe(self, from_start: bool = False) -> 'EventStreamSubscription':
+        """
+        Return subscription reading events published from now on,
+        or from oldest event retained if from_start.
+        """
+        return EventStreamSubscription(
+            self, self.first_seq if from_start else self._next_seq)
+
+
+class EventStreamSubscription:
+    """
+    Consumer's cursor into an event stream.
+    """
+    def __init__(self, event_stream: ParkingLotEventStream, cursor: int):
+        self._event_stream = event_stream
+        self._cursor = cursor
+        self._missed = 0
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    @property
+    def missed(self) -> int:
+        """
+        Total events skipped by overflow.
+        """
+        return self._missed
+
+    def read(self, max_events: int = 1024) -> List[StreamEvent]:
+        """
+        Read next batch of events, at most max_events.
+        """
+        batch = self._event_stream.read(self._cursor, max_events)
+        self._cursor = batch.cursor
+        self._missed += batch.missed
+        return batch.events
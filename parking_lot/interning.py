@@ -0,0 +1,98 @@
+"""
+Dictionary encoding of strings into small integer ids.
+
+A StringTable gives every distinct string an id once and decodes ids
+back by indexing a list, so indexes can key on ints and hold one copy
+of every string. Spellings seen are remembered along with their id, up
+to a bound, so a string is normalized(e.g. case folded) only the first
+time, and strings sent by clients can not grow the table without limit.
+"""
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class _StringIds(dict):
+    """
+    String -> id, strings missing are added to table on lookup.
+    """
+    def __init__(self, table: 'StringTable'):
+        super().__init__()
+        self._table = table
+
+    def __missing__(self, string: str) -> int:
+        return self._table._add(string)
+
+
+class StringTable:
+    """
+    Two-way mapping of strings <-> ids, ids are 0, 1, 2, ... in order
+    strings are first seen. Ids are never released, so a table holds
+    every normalized string it was given(colours, ticket ledger's
+    plates), and up to max_spellings other spellings of them.
+    encode(string) returns id of string, giving it a new id if not
+    seen before. Encoding a spelling remembered is a single dict
+    lookup, any other one is normalized again; new strings are added
+    under a lock, so encoding is thread-safe.
+    Every id also gets a label(label of normalized string, e.g.
+    capitalized colour) for display.
+    """
+    def __init__(
+        self, normalize: Callable[[str], str] = None,
+        label: Callable[[str], str] = None, max_spellings: int = 4096
+    ):
+        self._normalize = normalize
+        self._label = label
+        # id -> normalized string, and its label
+        self._strings: List[str] = []
+        self._labels: List[str] = []
+        # normalized string and its spellings remembered -> id
+        self._ids: Dict[str, int] = _StringIds(self)
+        self._max_spellings = max_spellings
+        self._spellings = 0
+        self._lock = threading.Lock()
+        # spellings seen are encoded by dict lookup alone, no Python call
+        self.encode = self._ids.__getitem__
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    @property
+    def strings(self) -> List[str]:
+        """
+        Normalized strings, indexed by id.
+        """
+        return self._strings
+
+    def _add(self, string: str) -> int:
+        normalized = self._normalize(string) if self._normalize else string
+        with self._lock:
+            id_ = self._ids.get(normalized)
+            if id_ is None:
+                id_ = len(self._strings)
+                self._strings.append(normalized)
+                self._labels.append(
+                    self._label(normalized) if self._label else normalized)
+                self._ids[normalized] = id_
+            if string not in self._ids and self._spellings < self._max_spellings:
+                self._ids[string] = id_
+                self._spellings += 1
+        return id_
+
+    def find(self, string: str) -> Optional[int]:
+        """
+        Return id of string, None if it was never encoded.
+        """
+        id_ = self._ids.get(string)
+        if id_ is None and self._normalize:
+            id_ = self._ids.get(self._normalize(string))
+        return id_
+
+    def decode(self, id_: int) -> str:
+        return self._strings[id_]
+
+    def label(self, id_: int) -> str:
+        return self._labels[id_]
+
+
+# colour <-> colour id, shared by all vehicles and parking-lots
+COLORS = StringTable(str.lower, str.capitalize)
@@ -0,0 +1,404 @@
+"""
+Instrumentation of parking-lot operations.
+
+Metrics are enabled per parking-lot by switching it to an instrumented
+subclass of its class, so a parking-lot without metrics runs its plain
+methods and pays nothing. Kept per parking-lot:
+    1. counters of parks, leaves and rejected parks(lot full,
+       vehicle already parked),
+    2. latency histogram with fixed buckets per operation,
+    3. occupancy gauges, read only on export.
+Every thread updates its own shard of counters and histograms without
+locks, shards are summed on read, so counts are not lost when gates
+of a concurrent parking-lot run in parallel.
+Metrics are exported in Prometheus text format, to a file or
+through a local HTTP endpoint.
+"""
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from parking_lot.constants import ParkOutcome
+
+# upper bounds(seconds) of latency buckets, +Inf is implied
+LATENCY_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4,
+    2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2, 1e-1, 1.0,
+)
+
+# parking-lot method -> operation label
+TIMED_OPERATIONS = {
+    'allocate_parking_spot': 'park',
+    'free_up_parking_spot': 'leave',
+    'check_out': 'leave',
+    'park_many': 'park_many',
+    'leave_many': 'leave_many',
+    'get_registration_numbers_of_vehicle_with_color': 'registration_numbers_for_colour',
+    'get_parking_spot_numbers_of_vehicles_with_color': 'slot_numbers_for_colour',
+    'get_vehicle_spot_number': 'slot_number_for_registration_number',
+    'get_parking_spot_numbers_of_registration_prefix': 'slot_numbers_for_registration_prefix',
+}
+# streamed operations, timed from first to last item
+TIMED_STREAMS = {
+    'iter_parking_lot_status': 'status',
+}
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets.
+    Values are kept in integer nanoseconds, exported in seconds.
+    """
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._buckets_ns = tuple(round(bucket * 1e9) for bucket in self._buckets)
+        # bucket_counts[i] counts values in (buckets[i-1], buckets[i]],
+        # last one counts values above all buckets
+        self._bucket_counts = [0] * (len(self._buckets) + 1)
+        self._sum_ns = 0
+        self._count = 0
+
+    def observe_ns(self, value_ns: int) -> None:
+        self._bucket_counts[bisect_left(self._buckets_ns, value_ns)] += 1
+        self._sum_ns += value_ns
+        self._count += 1
+
+    def observe(self, value: float) -> None:
+        self.observe_ns(round(value * 1e9))
+
+    def add(self, other: 'Histogram') -> None:
+        """
+        Add values observed by other histogram of same buckets.
+        """
+        for i, count in enumerate(other._bucket_counts):
+            self._bucket_counts[i] += count
+        self._sum_ns += other._sum_ns
+        self._count += other._count
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum_ns / 1e9
+
+    def cumulative_counts(self) -> List[tuple]:
+        """
+        Return (upper bound, count of values <= upper bound) pairs,
+        ending with +Inf bucket.
+        """
+        res = []
+        total = 0
+        for upper_bound, count in zip(self._buckets + (float('inf'),), self._bucket_counts):
+            total += count
+            res.append((upper_bound, total))
+        return res
+
+
+def _latency_histograms() -> Dict[str, Histogram]:
+    """
+    Return empty latency histogram of every timed operation.
+    """
+    return {
+        operation: Histogram() for operation in
+        list(TIMED_OPERATIONS.values()) + list(TIMED_STREAMS.values())
+    }
+
+
+class _MetricsShard:
+    """
+    Counters and latency histograms updated by one thread.
+    """
+    def __init__(self):
+        self.parks = 0
+        self.leaves = 0
+        self.rejected_full = 0
+        self.rejected_duplicate = 0
+        self.latencies = _latency_histograms()
+
+
+class ParkingLotMetrics:
+    """
+    Counters and latency histograms of one parking-lot,
+    kept in one shard per thread updating them.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_MetricsShard] = []
+        self._shards_lock = threading.Lock()
+
+    def shard(self) -> _MetricsShard:
+        """
+        Return calling thread's shard, added on thread's first update.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _MetricsShard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _sum(self, counter: str) -> int:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return sum(getattr(shard, counter) for shard in shards)
+
+    @property
+    def parks(self) -> int:
+        return self._sum('parks')
+
+    @property
+    def leaves(self) -> int:
+        return self._sum('leaves')
+
+    @property
+    def rejected_full(self) -> int:
+        return self._sum('rejected_full')
+
+    @property
+    def rejected_duplicate(self) -> int:
+        return self._sum('rejected_duplicate')
+
+    @property
+    def latencies(self) -> Dict[str, Histogram]:
+        """
+        Latency histograms per operation, summed over all threads.
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        res = _latency_histograms()
+        for shard in shards:
+            for operation, histogram in shard.latencies.items():
+                res[operation].add(histogram)
+        return res
+
+    def count_park(self, parking_lot, vehicle, is_parked: bool) -> None:
+        """
+        Count single park, telling rejections apart after the fact.
+        """
+        if is_parked:
+            outcome = ParkOutcome.PARKED
+        elif parking_lot.parked_vehicles.get(vehicle.registration_number) is not None \
+            or vehicle.is_vehicle_parked():
+            outcome = ParkOutcome.DUPLICATE
+        else:
+            outcome = ParkOutcome.FULL
+        self.count_park_outcome(outcome)
+
+    def count_park_outcome(self, outcome: ParkOutcome) -> None:
+        shard = self.shard()
+        if outcome is ParkOutcome.PARKED:
+            shard.parks += 1
+        elif outcome is ParkOutcome.DUPLICATE:
+            shard.rejected_duplicate += 1
+        else:
+            shard.rejected_full += 1
+
+    def count_leave(self, is_freed: bool) -> None:
+        if is_freed:
+            self.shard().leaves += 1
+
+
+def _timed_method(
+    method: Callable, operation: str,
+    count: Callable[..., None] = None
+) -> Callable:
+    """
+    Wrap method, timing it and passing its
+    (parking-lot, metrics, argument, result) to count, if given.
+    """
+    perf_counter_ns = time.perf_counter_ns
+    if count is None:
+        @wraps(method)
+        def timed_method(self, *args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._metrics.shard().latencies[operation].observe_ns(
+                    perf_counter_ns() - start)
+        return timed_method
+
+    @wraps(method)
+    def counted_method(self, arg):
+        start = perf_counter_ns()
+        res = method(self, arg)
+        metrics = self._metrics
+        metrics.shard().latencies[operation].observe_ns(perf_counter_ns() - start)
+        count(self, metrics, arg, res)
+        return res
+    return counted_method
+
+def _timed_stream(method: Callable, operation: str) -> Callable:
+    @wraps(method)
+    def timed_stream(self, *args, **kwargs) -> Iterator:
+        start = time.perf_counter_ns()
+        try:
+            yield from method(self, *args, **kwargs)
+        finally:
+            self._metrics.shard().latencies[operation].observe_ns(
+                time.perf_counter_ns() - start)
+    return timed_stream
+
+def _count_park(parking_lot, metrics, vehicle, is_parked) -> None:
+    metrics.count_park(parking_lot, vehicle, is_parked)
+
+def _count_leave(parking_lot, metrics, parking_spot_id, is_freed) -> None:
+    metrics.count_leave(is_freed)
+
+def _count_check_out(parking_lot, metrics, parking_spot_id, row) -> None:
+    metrics.count_leave(row >= 0)
+
+def _count_park_many(parking_lot, metrics, vehicles, res) -> None:
+    for outcome in res:
+        metrics.count_park_outcome(outcome)
+
+def _count_leave_many(parking_lot, metrics, parking_spot_ids, res) -> None:
+    for is_freed in res:
+        metrics.count_leave(is_freed)
+
+# counted operation -> counter update
+COUNTED_OPERATIONS = {
+    'allocate_parking_spot': _count_park,
+    'free_up_parking_spot': _count_leave,
+    'check_out': _count_check_out,
+    'park_many': _count_park_many,
+    'leave_many': _count_leave_many,
+}
+
+# parking-lot class -> its instrumented subclass
+_instrumented_classes: Dict[type, type] = {}
+
+def _instrumented_class(cls: type) -> type:
+    """
+    Return subclass of parking-lot class, timing and counting
+    operations into instance's _metrics.
+    """
+    if cls in _instrumented_classes:
+        return _instrumented_classes[cls]
+
+    namespace = {'_is_instrumented': True}
+    for method_name, operation in TIMED_OPERATIONS.items():
+        namespace[method_name] = _timed_method(
+            getattr(cls, method_name), operation,
+            COUNTED_OPERATIONS.get(method_name))
+    for method_name, operation in TIMED_STREAMS.items():
+        namespace[method_name] = _timed_stream(getattr(cls, method_name), operation)
+    instrumented_cls = type(f"Instrumented{cls.__name__}", (cls,), namespace)
+    _instrumented_classes[cls] = instrumented_cls
+    return instrumented_cls
+
+def instrument_parking_lot(parking_lot) -> None:
+    """
+    Switch parking-lot to its instrumented class, updating
+    parking-lot's _metrics on every operation.
+    Instance itself is left untouched, so attribute access
+    stays as fast as before.
+    """
+    if not getattr(parking_lot, '_is_instrumented', False):
+        parking_lot.__class__ = _instrumented_class(type(parking_lot))
+
+def uninstrument_parking_lot(parking_lot) -> None:
+    """
+    Switch parking-lot back to its plain class.
+    """
+    if getattr(parking_lot, '_is_instrumented', False):
+        parking_lot.__class__ = parking_lot.__class__.__bases__[0]
+
+
+def render_prometheus(parking_lots: Iterable) -> str:
+    """
+    Render metrics of given parking-lots(those with metrics
+    enabled) in Prometheus text format.
+    """
+    parking_lots = [
+        parking_lot for parking_lot in parking_lots
+        if parking_lot.metrics is not None
+    ]
+    lines = []
+
+    def family(name: str, type_: str, help_: str, samples: Iterable[tuple]):
+        lines.append(f"# HELP {name} {help_}")
+        lines.append(f"# TYPE {name} {type_}")
+        for suffix, labels, value in samples:
+            label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{name}{suffix}{{{label_text}}} {value}")
+
+    def lot(parking_lot) -> tuple:
+        return ('lot', parking_lot.id_)
+
+    family(
+        'parking_lot_parks_total', 'counter', 'Vehicles parked.',
+        (('', (lot(p),), p.metrics.parks) for p in parking_lots))
+    family(
+        'parking_lot_leaves_total', 'counter', 'Vehicles left.',
+        (('', (lot(p),), p.metrics.leaves) for p in parking_lots))
+    family(
+        'parking_lot_park_rejections_total', 'counter', 'Parks rejected.',
+        (sample for p in parking_lots for sample in (
+            ('', (lot(p), ('reason', 'full')), p.metrics.rejected_full),
+            ('', (lot(p), ('reason', 'duplicate')), p.metrics.rejected_duplicate),
+        )))
+    family(
+        'parking_lot_spots', 'gauge', 'Parking-spots of parking-lot.',
+        (('', (lot(p),), p.max_spots()) for p in parking_lots))
+    family(
+        'parking_lot_occupied_spots', 'gauge', 'Parking-spots taken.',
+        (('', (lot(p),), p.max_spots() - p.available_spots())
+         for p in parking_lots))
+
+    def latency_samples():
+        for p in parking_lots:
+            for operation, histogram in p.metrics.latencies.items():
+                labels = (lot(p), ('operation', operation))
+                for upper_bound, count in histogram.cumulative_counts():
+                    le = '+Inf' if upper_bound == float('inf') else repr(upper_bound)
+                    yield ('_bucket', labels + (('le', le),), count)
+                yield ('_sum', labels, repr(histogram.sum))
+                yield ('_count', labels, histogram.count)
+    family(
+        'parking_lot_operation_seconds', 'histogram',
+        'Latency of parking-lot operations.', latency_samples())
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus_file(path: str, text: str) -> None:
+    """
+    Replace metrics file atomically, e.g. for node exporter's
+    textfile collector.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def serve_prometheus_http(
+    render: Callable[[], str], host: str = '127.0.0.1', port: int = 9108
+) -> ThreadingHTTPServer:
+    """
+    Serve rendered metrics on http://host:port/metrics from a daemon thread.
+    Return server, shut it down with shutdown().
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
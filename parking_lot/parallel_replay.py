@@ -0,0 +1,201 @@
+"""
+Parallel replay of parking-lot command logs.
+
+Logs are split into shards, one per parking-lot: every command log
+given is a shard, or a multi-lot log written for the shell is split
+by lot. In such a log every create_parking_lot adds the next lot id,
+the first one being the default lot, and other commands go to the lot
+of their trailing '@<lot-id>', untagged ones to the default lot.
+Commands spanning lots(park_anywhere, lot_for_registration_number)
+can not be sharded. Nor can shards see a vehicle parked in another
+lot, which the shell would turn away, so a log parking one vehicle
+in more than one lot is not sharded but replayed serially, as the
+shell runs it, and its output split by lot.
+Shards are replayed across a process pool, each one on parking-lots
+of its own, and per-lot outputs and final states are merged in shard
+order, so the report does not depend on scheduling. Every shard is
+replayed as if its lot was the only one, so its create_parking_lot
+reports no lot id.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import io
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from parking_lot.command_runner import BatchCommandRunner, split_lot_id
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+
+# lot of commands without lot tag, the first one created
+DEFAULT_LOT_ID = 1
+# commands reading or changing more than one parking-lot
+UNSHARDABLE_COMMANDS = ('park_anywhere', 'lot_for_registration_number')
+
+# name: lot id or log path, path: commands of the shard
+ReplayShard = namedtuple('ReplayShard', ['name', 'path'])
+# output: shell output of shard's commands,
+# status: final (slot, registration number, colour) rows
+ReplayResult = namedtuple('ReplayResult', ['name', 'output', 'status'])
+
+
+def shard_command_logs(paths: Iterable[str]) -> List[ReplayShard]:
+    """
+    Make every command log its own shard.
+    """
+    return [ReplayShard(path, path) for path in paths]
+
+def shard_tagged_command_log(
+    path: str, shard_dir: str
+) -> Optional[List[ReplayShard]]:
+    """
+    Split multi-lot command log into one file per lot in shard_dir,
+    lot tags removed.
+    Return shards ordered by lot id, None if log parks a vehicle in
+    more than one lot, replay_tagged_command_log replays it then.
+    """
+    shard_files = {}
+    # registration number -> lot it is parked in by the log
+    vehicle_lots: Dict[str, int] = {}
+    try:
+        for lot_id, line, __ in _iter_lot_command_lines(path):
+            name, __, args = line.partition(' ')
+            if name in UNSHARDABLE_COMMANDS:
+                raise Exception(f"Command spanning parking-lots can not be sharded: {line}")
+            for registration_number in _parked_registration_numbers(name, args):
+                if vehicle_lots.setdefault(registration_number, lot_id) != lot_id:
+                    return None
+            shard_file = shard_files.get(lot_id)
+            if shard_file is None:
+                shard_file = shard_files[lot_id] = \
+                    open(os.path.join(shard_dir, f"lot-{lot_id}.txt"), 'w')
+            shard_file.write(line + '\n')
+    finally:
+        for shard_file in shard_files.values():
+            shard_file.close()
+
+    return [
+        ReplayShard(lot_id, shard_files[lot_id].name)
+        for lot_id in sorted(shard_files)
+    ]
+
+def _parked_registration_numbers(name: str, args: str) -> List[str]:
+    """
+    Return registration numbers of vehicles command parks.
+    """
+    if name == 'park':
+        return args.split()[:1]
+    if name == 'park_many':
+        return args.split()[::2]
+    return []
+
+def _iter_lot_command_lines(path: str) -> Iterator[Tuple[int, str, str]]:
+    """
+    Yield (lot id, line without lot tag, line) of multi-lot log's
+    command lines as the shell runs them.
+    """
+    lot_count = 0
+    for line in _iter_command_lines(path):
+        untagged_line = line
+        if line.partition(' ')[0] == 'create_parking_lot':
+            # shell gives parking-lots ids in order of creation
+            lot_count += 1
+            lot_id = lot_count
+        else:
+            try:
+                untagged_line, lot_id = split_lot_id(line)
+            except ValueError:
+                lot_id = None
+            if lot_id is None:
+                lot_id = DEFAULT_LOT_ID
+        yield lot_id, untagged_line, line
+
+def _iter_command_lines(path: str) -> Iterator[str]:
+    """
+    Yield command lines of log as the shell runs them: blank lines
+    repeat last command, playback files are read in place and
+    exit ends the log.
+    """
+    pending = [open(path)]
+    last_line = ''
+    try:
+        while pending:
+            line = pending[-1].readline()
+            if not line:
+                pending.pop().close()
+                continue
+            line = line.strip() or last_line
+            if not line:
+                continue
+            last_line = line
+            name, __, args = line.partition(' ')
+            if name == 'exit':
+                return
+            if name == 'playback':
+                pending.append(open(args.strip()))
+                continue
+            yield line
+    finally:
+        for f in pending:
+            f.close()
+
+def replay_shard(shard: ReplayShard) -> ReplayResult:
+    """
+    Replay one shard on parking-lots of its own.
+    """
+    out = io.StringIO()
+    with FourWheelerParkingLotCommand.isolated_state():
+        with open(shard.path) as f:
+            BatchCommandRunner(out).run(f)
+        parking_lot = FourWheelerParkingLotCommand.get_parking_lot_()
+        status = list(parking_lot.iter_parking_lot_status()) if parking_lot else []
+    return ReplayResult(shard.name, out.getvalue(), status)
+
+def replay_shards(
+    shards: List[ReplayShard], max_workers: Optional[int] = None
+) -> List[ReplayResult]:
+    """
+    Replay shards across a process pool, max_workers=1 replays
+    serially in this process. Parking-lots of this process
+    are left alone.
+    Return results in shard order.
+    """
+    if max_workers == 1:
+        return [replay_shard(shard) for shard in shards]
+    with ProcessPoolExecutor(max_workers) as executor:
+        return list(executor.map(replay_shard, shards))
+
+def replay_tagged_command_log(path: str) -> List[ReplayResult]:
+    """
+    Replay multi-lot command log serially, as the shell runs it, on
+    parking-lots of its own; output of every command goes to its lot.
+    Return results ordered by lot id.
+    """
+    outputs: Dict[int, List[str]] = {}
+    out = io.StringIO()
+    runner = BatchCommandRunner(out)
+    with FourWheelerParkingLotCommand.isolated_state():
+        for lot_id, __, line in _iter_lot_command_lines(path):
+            runner.run_line(line)
+            outputs.setdefault(lot_id, []).append(out.getvalue())
+            out.seek(0)
+            out.truncate()
+        registry = FourWheelerParkingLotCommand.get_registry()
+        results = []
+        for lot_id in sorted(outputs):
+            parking_lot = registry.get_parking_lot(lot_id)
+            status = list(parking_lot.iter_parking_lot_status()) if parking_lot else []
+            results.append(ReplayResult(lot_id, ''.join(outputs[lot_id]), status))
+    return results
+
+def write_replay_report(results: List[ReplayResult], out: TextIO) -> None:
+    """
+    Write per-lot outputs followed by per-lot final states.
+    """
+    for result in results:
+        out.write(f"=== lot {result.name} output ===\n")
+        out.write(result.output)
+    for result in results:
+        out.write(f"=== lot {result.name} final state ===\n")
+        out.write(f"Parked vehicles: {len(result.status)}\n")
+        for row in result.status:
+            out.write('\t\t'.join(map(lambda x: str(x), row)) + '\n')
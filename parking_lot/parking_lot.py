@@ -1,11 +1,24 @@
 from abc import ABC, abstractmethod
 from collections import defaultdict
 import itertools
-from typing import List, Set
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from parking_lot.constants import VehicleType, ParkingLotEvent
+from parking_lot.billing import Billing, Tariff
+from parking_lot.constants import (
+    ParkingLotEvent, ParkingSpotType, ParkOutcome, VehicleType
+)
+from parking_lot.event_stream import ParkingLotEventStream
+from parking_lot.interning import COLORS
+from parking_lot.metrics import (
+    ParkingLotMetrics, instrument_parking_lot, uninstrument_parking_lot
+)
 from parking_lot.parking_spot import ParkingSpot
-from parking_lot.parking_ticket import FourWheelerParkingTicket
+from parking_lot.parking_ticket import PARKING_TICKETS
+from parking_lot.reservations import Reservation, ReservationBook
+from parking_lot.sorted_list import SortedList
+from parking_lot.spot_allocator import SpotPool
+from parking_lot.ticket_ledger import TicketLedger
 from parking_lot.vehicle import Vehicle
 
 
@@ -17,6 +30,15 @@ class ParkingLot(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_parking_lot_status(
+        self, offset: int = 0, limit: int = None
+    ) -> Iterator[tuple]:
+        """
+        Stream parking-lot state of occupied parking-spots.
+        """
+        pass
+
     @abstractmethod
     def get_vehicle_spot_number(self, vehicle_registration_number: str) -> int:
         """
@@ -33,6 +55,16 @@ class ParkingLot(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_parking_spot_numbers_of_registration_prefix(
+        self, prefix: str
+    ) -> List[int]:
+        """
+        Return parking-spot numbers of parked-vehicles whose registration
+        number starts with given prefix.
+        """
+        pass
+
     @abstractmethod
     def allocate_parking_spot(self, vehicle: Vehicle) -> None:
         """
@@ -47,6 +79,27 @@ class ParkingLot(ABC):
         """
         pass
 
+    @abstractmethod
+    def check_out(self, parking_spot_id: int) -> int:
+        """
+        Free up parking-spot, returning ticket ledger row of the visit.
+        """
+        pass
+
+    @abstractmethod
+    def park_many(self, vehicles: List[Vehicle]) -> List[ParkOutcome]:
+        """
+        Allocate parking-spots for a burst of vehicles.
+        """
+        pass
+
+    @abstractmethod
+    def leave_many(self, parking_spot_ids: List[int]) -> List[bool]:
+        """
+        Free up parking-spots for a burst of exiting vehicles.
+        """
+        pass
+
     @abstractmethod
     def get_registration_numbers_of_vehicle_with_color(
         self, color: str, vehicle_type: VehicleType = None
@@ -61,7 +114,11 @@ class FourWheelerParkingLot(ParkingLot):
     Parking-lot, a composition of multiple components like,
     parking-spots, parking-tickets, vehicles.
     
-    Parking lot to park FourWheeler vehicles.
+    Parking lot to park FourWheeler vehicles, and other vehicle
+    types(motorbikes, vans, trucks) if built with their parking-spots.
+    Every parking-spot type has its own free pool and counters,
+    vehicle type's rules name parking-spot types it may take,
+    in order of preference.
     Supported operations:
     1. park vehicles:
         1.1. allocate parking-spot to incoming vehicle,
@@ -89,27 +146,204 @@ class FourWheelerParkingLot(ParkingLot):
     def __init__(self):
         self._id = next(FourWheelerParkingLot.parking_lot_counter)
 
-        # four wheeler parking spots
-        self._max_four_wheeler_spots = None
-        self._four_wheeler_spots = None
-        self._curr_four_wheelers_parked = None
-        self._next_four_wheeler_spot = None
+        # parking spots of all types, each type in a contiguous block,
+        # four wheeler spots first
+        self._parking_spots = None
+        # parking-spot type -> its free pool and counters
+        self._spot_pools: Dict[ParkingSpotType, SpotPool] = None
+        # vehicle type -> parking-spot types it may take, in order of preference
+        self._spot_type_rules: Dict[VehicleType, Tuple[ParkingSpotType, ...]] = None
+        # ordered indexes of occupied parking spots
+        self._occupied_spots: SortedList = None
 
         # data store
-        self._color_vehicles_map = None
+        # colour id -> ordered indexes of parking-spots taken
+        self._color_spots_map: Dict[int, SortedList] = None
         self._parked_vehicles = None
+        # sorted registration numbers of parked vehicles, for prefix queries
+        self._registration_numbers: SortedList = None
+        self._ticket_ledger: TicketLedger = None
+
+        # called with (event, vehicle) on every PARK/UNPARK
+        self._event_listeners: List[Callable[[ParkingLotEvent, Vehicle], None]] = []
+
+        # operation metrics, None while disabled
+        self._metrics: ParkingLotMetrics = None
+
+        # ring buffer of PARK/UNPARK events, created on first use
+        self._event_stream: ParkingLotEventStream = None
+
+        # fees charged on exit, None while disabled
+        self._billing: Billing = None
+
+        # reservations of four-wheeler parking-spots, None while disabled
+        self._reservations: ReservationBook = None
+        self._reservation_lead_ns = 0
+        self._reservation_clock: Callable[[], int] = time.time_ns
+        # parking-spot index -> reservation holding it back from walk-ins,
+        # from lead time before reservation's start till its end
+        self._held_spots: Dict[int, int] = {}
+        # registration number -> parking-spot index held for it
+        self._held_spot_by_plate: Dict[str, int] = {}
 
     @property
     def id_(self):
         return self._id
 
     @property
-    def color_vehicles_map(self):
-        return self._color_vehicles_map
+    def max_four_wheeler_spots(self) -> int:
+        return self.max_spots(ParkingSpotType.FOUR_WHEELER)
 
-    def initialize_color_vehicles_map(self):
-        if self._color_vehicles_map is None:
-            self._color_vehicles_map = defaultdict(set)
+    @property
+    def available_four_wheeler_spots(self) -> int:
+        return self.available_spots(ParkingSpotType.FOUR_WHEELER)
+
+    def max_spots(self, parking_spot_type: ParkingSpotType = None) -> int:
+        """
+        Return number of parking-spots of given type, of all types if not given.
+        """
+        if parking_spot_type is None:
+            return len(self._parking_spots)
+        spot_pool = self._spot_pools.get(parking_spot_type)
+        return spot_pool.max_spots if spot_pool else 0
+
+    def available_spots(self, parking_spot_type: ParkingSpotType = None) -> int:
+        """
+        Return number of free parking-spots of given type, of all types if not given.
+        """
+        if parking_spot_type is None:
+            return sum(
+                spot_pool.max_spots - spot_pool.taken_spots
+                for spot_pool in self._spot_pools.values())
+        spot_pool = self._spot_pools.get(parking_spot_type)
+        return spot_pool.max_spots - spot_pool.taken_spots if spot_pool else 0
+
+    def is_resizable(
+        self, parking_spot_type: ParkingSpotType = ParkingSpotType.FOUR_WHEELER
+    ) -> bool:
+        """
+        Check if parking-spots of given type can be added or retired:
+        they must take the last block of parking-lot, so no other
+        parking-spot's number moves, and their allocator's free
+        pool must be resizable.
+        """
+        spot_pool = self._spot_pools.get(parking_spot_type)
+        return spot_pool is not None \
+            and spot_pool.first_index + spot_pool.max_spots == len(self._parking_spots) \
+            and spot_pool.spot_allocator.resizable
+
+    def expand_parking_lot(
+        self, spot_count: int,
+        parking_spot_type: ParkingSpotType = ParkingSpotType.FOUR_WHEELER
+    ) -> None:
+        """
+        Add spot_count parking-spots of given type, numbered
+        after the last parking-spot.
+        """
+        if spot_count < 0 or not self.is_resizable(parking_spot_type):
+            raise Exception("Parking-lot can not be resized")
+        spot_pool = self._spot_pools[parking_spot_type]
+        self._resize_spot_pool(spot_pool, spot_pool.max_spots + spot_count)
+
+    def shrink_parking_lot(
+        self, spot_count: int,
+        parking_spot_type: ParkingSpotType = ParkingSpotType.FOUR_WHEELER
+    ) -> bool:
+        """
+        Retire spot_count highest numbered parking-spots of given type.
+        Return bool, False if any of them is taken, held or reserved.
+        """
+        spot_pool = self._spot_pools.get(parking_spot_type)
+        if not self.is_resizable(parking_spot_type) \
+            or not 0 <= spot_count <= spot_pool.max_spots:
+            raise Exception("Parking-lot can not be resized")
+        max_spots = len(self._parking_spots) - spot_count
+        if next(self._occupied_spots.irange(max_spots), None) is not None \
+            or any(index >= max_spots for index in self._held_spots):
+            return False
+        if parking_spot_type is ParkingSpotType.FOUR_WHEELER \
+            and self._reservations is not None \
+            and not self._reservations.resize(spot_pool.max_spots - spot_count):
+            return False
+        self._resize_spot_pool(spot_pool, spot_pool.max_spots - spot_count)
+        return True
+
+    def _resize_spot_pool(self, spot_pool: SpotPool, max_spots: int) -> None:
+        """
+        Grow or cut back last block of parking-spots, with its free pool.
+        """
+        spot_pool.resize(max_spots)
+        self._parking_spots.resize(spot_pool.first_index + max_spots)
+        if spot_pool.parking_spot_type is ParkingSpotType.FOUR_WHEELER \
+            and self._reservations is not None:
+            self._reservations.resize(max_spots)
+
+    @property
+    def spot_type_rules(self) -> Dict[VehicleType, Tuple[ParkingSpotType, ...]]:
+        return self._spot_type_rules
+
+    def add_event_listener(
+        self, listener: Callable[[ParkingLotEvent, Vehicle], None]
+    ) -> None:
+        """
+        Subscribe listener to PARK/UNPARK events.
+        PARK is published once vehicle holds its parking-spot and ticket,
+        UNPARK before vehicle gives them up.
+        """
+        self._event_listeners.append(listener)
+
+    def remove_event_listener(
+        self, listener: Callable[[ParkingLotEvent, Vehicle], None]
+    ) -> None:
+        if listener in self._event_listeners:
+            self._event_listeners.remove(listener)
+
+    def _notify_event_listeners(
+        self, event: ParkingLotEvent, vehicle: Vehicle
+    ) -> None:
+        for listener in self._event_listeners:
+            listener(event, vehicle)
+
+    @property
+    def event_stream(self) -> ParkingLotEventStream:
+        return self._event_stream
+
+    def get_event_stream(self, capacity: int = 65536) -> ParkingLotEventStream:
+        """
+        Return stream of parking-lot's PARK/UNPARK events,
+        publishing into it from now on.
+        """
+        if self._event_stream is None:
+            self._event_stream = ParkingLotEventStream(capacity)
+            self.add_event_listener(self._event_stream)
+        return self._event_stream
+
+    @property
+    def metrics(self) -> ParkingLotMetrics:
+        return self._metrics
+
+    def enable_metrics(self) -> ParkingLotMetrics:
+        """
+        Start counting and timing parking-lot operations.
+        Return parking-lot's metrics.
+        """
+        if self._metrics is None:
+            self._metrics = ParkingLotMetrics()
+            instrument_parking_lot(self)
+        return self._metrics
+
+    def disable_metrics(self) -> None:
+        if self._metrics is not None:
+            uninstrument_parking_lot(self)
+            self._metrics = None
+
+    @property
+    def color_spots_map(self):
+        return self._color_spots_map
+
+    def initialize_color_spots_map(self):
+        if self._color_spots_map is None:
+            self._color_spots_map = defaultdict(SortedList)
 
     @property
     def parked_vehicles(self):
@@ -119,6 +353,186 @@ class FourWheelerParkingLot(ParkingLot):
         if self._parked_vehicles is None:
             self._parked_vehicles = {}
 
+    def initialize_registration_numbers(self):
+        if self._registration_numbers is None:
+            self._registration_numbers = SortedList()
+
+    @property
+    def ticket_ledger(self) -> TicketLedger:
+        return self._ticket_ledger
+
+    def initialize_ticket_ledger(self):
+        if self._ticket_ledger is None:
+            self._ticket_ledger = TicketLedger()
+
+    @property
+    def billing(self) -> Billing:
+        return self._billing
+
+    def enable_billing(
+        self, tariffs: Dict[ParkingSpotType, Tariff] = None,
+        utc_offset_s: int = None
+    ) -> Billing:
+        """
+        Start charging visits on exit, by tariff of their
+        parking-spot's type(default tariffs if not given).
+        Overnight fees go by local time unless utc_offset_s is given.
+        """
+        if self._billing is None:
+            spot_pools = sorted(
+                self._spot_pools.values(), key=lambda spot_pool: spot_pool.first_index)
+            self._billing = Billing(
+                [
+                    (spot_pool.first_index + 1, spot_pool.parking_spot_type)
+                    for spot_pool in spot_pools
+                ],
+                tariffs, utc_offset_s)
+        return self._billing
+
+    @property
+    def reservations(self) -> ReservationBook:
+        return self._reservations
+
+    def enable_reservations(
+        self, lead_time_ns: int = 0, clock: Callable[[], int] = time.time_ns
+    ) -> ReservationBook:
+        """
+        Start taking reservations of four-wheeler parking-spots.
+        A reserved parking-spot is held back from walk-ins from
+        lead_time_ns before reservation's start till its end.
+        clock gives wall clock time in nanoseconds.
+        """
+        if self._reservations is None:
+            max_spots = self.max_four_wheeler_spots
+            self._reservations = ReservationBook(max_spots)
+            self._reservation_lead_ns = lead_time_ns
+            self._reservation_clock = clock
+            for index in self._occupied_spots:
+                if index >= max_spots:
+                    break
+                self._reservations.set_spot_taken(index + 1, True)
+        return self._reservations
+
+    def is_spot_free_between(
+        self, parking_spot_id: int, start_ns: int, end_ns: int
+    ) -> bool:
+        """
+        Check if four-wheeler parking-spot can be reserved over [start, end).
+        """
+        if self._reservations is None:
+            return 1 <= parking_spot_id <= self.max_four_wheeler_spots \
+                and start_ns < end_ns
+        return self._reservations.is_spot_free(parking_spot_id, start_ns, end_ns)
+
+    def find_spot_free_between(self, start_ns: int, end_ns: int) -> Optional[int]:
+        """
+        Return id of a four-wheeler parking-spot that can be reserved
+        over [start, end), None if all are booked.
+        """
+        if self._reservations is None:
+            if self.max_four_wheeler_spots and start_ns < end_ns:
+                return 1
+            return None
+        return self._reservations.find_free_spot(start_ns, end_ns)
+
+    def reserve_parking_spot(
+        self, registration_number: str, start_ns: int, end_ns: int,
+        parking_spot_id: int = None
+    ) -> Optional[Reservation]:
+        """
+        Reserve given four-wheeler parking-spot, or any one free over
+        [start, end), for vehicle arriving in that window.
+        Any parking-spot picked is one not taken now if possible, and
+        must be one not taken now if it is held from now on.
+        Reservations must start after now.
+        Return reservation, None if no parking-spot is free.
+        """
+        reservations = self.enable_reservations()
+        now_ns = self._reservation_clock()
+        if not now_ns < start_ns < end_ns:
+            raise Exception("Invalid reservation window")
+        if parking_spot_id is None:
+            parking_spot_id = reservations.find_free_spot(
+                start_ns, end_ns, vacant_only=True)
+            if parking_spot_id is None and start_ns > now_ns + self._reservation_lead_ns:
+                # walk-in may be gone once parking-spot is held
+                parking_spot_id = reservations.find_free_spot(start_ns, end_ns)
+            if parking_spot_id is None:
+                return None
+        reservation = reservations.reserve(
+            registration_number, start_ns, end_ns, parking_spot_id)
+        self._apply_reservations(now_ns)
+        return reservation
+
+    def cancel_reservation(self, reservation_id: int) -> Optional[Reservation]:
+        """
+        Cancel reservation, giving its parking-spot back
+        to walk-ins if held for it.
+        Return reservation, None if unknown or over.
+        """
+        if self._reservations is None:
+            return None
+        reservation = self._reservations.cancel(reservation_id)
+        if reservation is not None:
+            self._release_held_spot(reservation)
+        return reservation
+
+    def _apply_reservations(self, now_ns: int) -> None:
+        """
+        Hold back parking-spots of reservations due within lead time,
+        and give back parking-spots of reservations over.
+        A held parking-spot still taken by a walk-in is held once it
+        leaves.
+        """
+        reservations = self._reservations
+        for reservation in reservations.pop_starting(now_ns + self._reservation_lead_ns):
+            index = reservation.spot_id - 1
+            self._held_spots[index] = reservation.id_
+            self._held_spot_by_plate[reservation.registration_number] = index
+            if self._parking_spots[index].is_free():
+                spot_pool = self._spot_pools[ParkingSpotType.FOUR_WHEELER]
+                spot_pool.claim(index)
+                self._increment_spot_count(ParkingSpotType.FOUR_WHEELER)
+        for reservation in reservations.pop_ended(now_ns):
+            self._release_held_spot(reservation)
+
+    def _release_held_spot(self, reservation: Reservation) -> None:
+        index = reservation.spot_id - 1
+        if self._held_spots.get(index) != reservation.id_:
+            return
+        del self._held_spots[index]
+        if self._held_spot_by_plate.get(reservation.registration_number) == index:
+            del self._held_spot_by_plate[reservation.registration_number]
+        if self._parking_spots[index].is_free():
+            self._spot_pools[ParkingSpotType.FOUR_WHEELER].release(index)
+            self._decrement_spot_count(ParkingSpotType.FOUR_WHEELER)
+
+    def _park_reserved_vehicle(self, vehicle: Vehicle) -> bool:
+        """
+        Park vehicle in parking-spot held for its reservation.
+        Return bool, False if vehicle holds no reservation due, or its
+        parking-spot is still taken, vehicle is then a walk-in.
+        """
+        self._apply_reservations(self._reservation_clock())
+        index = self._held_spot_by_plate.get(vehicle.registration_number)
+        if index is None or self._is_vehicle_parked_in_parking_lot(vehicle) \
+            or ParkingSpotType.FOUR_WHEELER not in self._get_spot_types(vehicle.type_):
+            return False
+        # reservation is used up on arrival
+        del self._held_spot_by_plate[vehicle.registration_number]
+        del self._held_spots[index]
+        parking_spot: ParkingSpot = self._parking_spots[index]
+        if not parking_spot.is_free():
+            return False
+
+        # parking-spot is claimed and counted in already
+        self._occupy_parking_spot(vehicle, parking_spot)
+        self._issue_new_parking_ticket(vehicle)
+        self._add_vehicle_details(vehicle)
+        if self._event_listeners:
+            self._notify_event_listeners(ParkingLotEvent.PARK, vehicle)
+        return True
+
     def _is_vehicle_parked_in_parking_lot(self, vehicle: Vehicle) -> bool:
         """
         Check if vehicle is parked in parking-lot.
@@ -128,15 +542,16 @@ class FourWheelerParkingLot(ParkingLot):
             return True
         if vehicle.registration_number in self._parked_vehicles:
             return True
-        if vehicle.registration_number in self._color_vehicles_map.get(vehicle.color, {}):
-            return True
 
         return False
 
     def allocate_parking_spot(self, vehicle: Vehicle) -> bool:
         """
-        Allocate parking spot to incoming vehicle.
+        Allocate parking spot to incoming vehicle, the one held
+        for it if it has a reservation due.
         """
+        if self._reservations is not None and self._park_reserved_vehicle(vehicle):
+            return True
         if not self._is_vehicle_parked_in_parking_lot(vehicle) \
             and self._is_parking_spot_available(vehicle.type_):
             parking_event = ParkingLotEvent.PARK
@@ -149,17 +564,171 @@ class FourWheelerParkingLot(ParkingLot):
         Change state of vehicle, parking-spot 
         and parking-lot on vehicle's EXIT.
         """
-        if not 1 <= parking_spot_id <= self._max_four_wheeler_spots:
-            return
+        return self._free_up_parking_spot(parking_spot_id) >= 0
+
+    def check_out(self, parking_spot_id: int) -> int:
+        """
+        Free up parking-spot as free_up_parking_spot does.
+        Return ticket ledger row of the visit closed(its fee is
+        billing.get_fee(row)), -1 if parking-spot is not freed.
+        """
+        return self._free_up_parking_spot(parking_spot_id)
 
-        parking_spot: ParkingSpot = self._four_wheeler_spots[parking_spot_id - 1]
+    def _free_up_parking_spot(self, parking_spot_id: int) -> int:
+        if not 1 <= parking_spot_id <= len(self._parking_spots):
+            return -1
+
+        parking_spot: ParkingSpot = self._parking_spots[parking_spot_id - 1]
         if parking_spot and not parking_spot.is_free():
             vehicle: Vehicle = parking_spot.vehicle
             if self._is_vehicle_parked_in_parking_lot(vehicle):
                 unparking_event = ParkingLotEvent.UNPARK
-                self._update_parking_lot(unparking_event, vehicle)
-                return True
-        return False
+                return self._update_parking_lot(unparking_event, vehicle)
+        return -1
+
+    def park_many(self, vehicles: List[Vehicle]) -> List[ParkOutcome]:
+        """
+        Allocate parking spots to a burst of incoming vehicles,
+        in given order.
+        Whole burst is settled first: duplicates and held reservations
+        are sorted out and spot pools are picked and counted in, going
+        by pools' counters only. Every run of vehicles bound for the same
+        spot pool and gate then takes its parking-spots in one
+        acquire_many, so vehicles end up where single parks would put them.
+        Tickets, indexes and events are still done vehicle by vehicle.
+        Return per vehicle ParkOutcome.
+        """
+        if self._reservations is not None:
+            self._apply_reservations(self._reservation_clock())
+        held_spot_by_plate = self._held_spot_by_plate
+        parked_vehicles = self._parked_vehicles
+        res = []
+        # (vehicle, its held parking-spot's index or its spot pool)
+        placements = []
+        plates = set()
+        for vehicle in vehicles:
+            plate = vehicle.registration_number
+            if vehicle.is_vehicle_parked() or plate in parked_vehicles or plate in plates:
+                res.append(ParkOutcome.DUPLICATE)
+                continue
+            index = held_spot_by_plate.get(plate)
+            if index is not None \
+                and ParkingSpotType.FOUR_WHEELER in self._get_spot_types(vehicle.type_):
+                # reservation is used up on arrival
+                del held_spot_by_plate[plate]
+                del self._held_spots[index]
+                if self._parking_spots[index].is_free():
+                    placements.append((vehicle, index))
+                    plates.add(plate)
+                    res.append(ParkOutcome.PARKED)
+                    continue
+            spot_pool = self._get_spot_pool(vehicle.type_)
+            if spot_pool is None:
+                res.append(ParkOutcome.FULL)
+                continue
+            spot_pool.taken_spots += 1
+            placements.append((vehicle, spot_pool))
+            plates.add(plate)
+            res.append(ParkOutcome.PARKED)
+
+        parking_spots = self._parking_spots
+        start = 0
+        while start < len(placements):
+            vehicle, target = placements[start]
+            end = start + 1
+            if isinstance(target, int):
+                indexes = [target]
+            else:
+                while end < len(placements) and placements[end][1] is target \
+                    and placements[end][0].gate == vehicle.gate:
+                    end += 1
+                indexes = target.acquire_many(end - start, vehicle.gate)
+            for (vehicle, __), index in zip(placements[start:end], indexes):
+                self._occupy_parking_spot(vehicle, parking_spots[index])
+                self._issue_new_parking_ticket(vehicle)
+                self._add_vehicle_details(vehicle)
+                if self._event_listeners:
+                    self._notify_event_listeners(ParkingLotEvent.PARK, vehicle)
+            start = end
+        return res
+
+    def leave_many(self, parking_spot_ids: List[int]) -> List[bool]:
+        """
+        Free up parking-spots of a burst of exiting vehicles,
+        in given order.
+        Return per parking-spot bool, if parking-spot got freed.
+        """
+        res = []
+        parking_spots = self._parking_spots
+        max_spots = len(parking_spots)
+        for parking_spot_id in parking_spot_ids:
+            if not 1 <= parking_spot_id <= max_spots:
+                res.append(False)
+                continue
+            parking_spot: ParkingSpot = parking_spots[parking_spot_id - 1]
+            if parking_spot.is_free():
+                res.append(False)
+                continue
+            vehicle: Vehicle = parking_spot.vehicle
+            if self._event_listeners:
+                self._notify_event_listeners(ParkingLotEvent.UNPARK, vehicle)
+            self._remove_vehicle_details(vehicle)
+            self._unpark_vehicle(vehicle)
+            res.append(True)
+        return res
+
+    def restore_parked_vehicle(
+        self, vehicle: Vehicle, parking_spot_id: int,
+        ticket_id: int, entry_time_ns: int
+    ) -> bool:
+        """
+        Put back vehicle parked before restart into its 
+        parking-spot, re-issuing its original ticket.
+        No PARK event is published.
+        Return bool, if vehicle got restored.
+        """
+        spot_pool = self._get_restored_spot_pool(vehicle, parking_spot_id)
+        if spot_pool is None:
+            return False
+        parking_spot: ParkingSpot = self._parking_spots[parking_spot_id - 1]
+        if not parking_spot.is_free() \
+            or not spot_pool.claim(parking_spot_id - 1):
+            return False
+
+        self._occupy_parking_spot(vehicle, parking_spot)
+        self._reissue_parking_ticket(vehicle, ticket_id, entry_time_ns)
+        self._increment_spot_count(spot_pool.parking_spot_type)
+        self._add_vehicle_details(vehicle)
+        return True
+
+    def _get_restored_spot_pool(
+        self, vehicle: Vehicle, parking_spot_id: int
+    ) -> SpotPool:
+        """
+        Return spot pool of parking-spot restored vehicle goes back to,
+        None if vehicle is parked already or may not take that parking-spot.
+        """
+        spot_types = self._get_spot_types(vehicle.type_)
+        if not 1 <= parking_spot_id <= len(self._parking_spots) \
+            or self._is_vehicle_parked_in_parking_lot(vehicle):
+            return None
+        spot_type = self._parking_spots[parking_spot_id - 1].parking_spot_type
+        if spot_type not in spot_types:
+            return None
+        return self._spot_pools[spot_type]
+
+    def _reissue_parking_ticket(
+        self, vehicle: Vehicle, ticket_id: int, entry_time_ns: int
+    ) -> None:
+        """
+        Give restored vehicle back its original ticket.
+        """
+        parking_ticket = PARKING_TICKETS[vehicle.parking_spot.parking_spot_type]
+        vehicle.ticket = parking_ticket(ticket_id, entry_time_ns)
+        parking_ticket.skip_ticket_ids(ticket_id)
+        # ticket keeps wall clock entry time, ledger runs on monotonic clock
+        self._record_parking_ticket(
+            vehicle, entry_time_ns - self._ticket_ledger.wall_clock_offset_ns)
 
     def _add_vehicle_details(
         self, vehicle: Vehicle
@@ -168,56 +737,76 @@ class FourWheelerParkingLot(ParkingLot):
         Add vehicle details to parking-lot data store on parking vehicle.
         """
         self._parked_vehicles[vehicle.registration_number] = vehicle
-        self._color_vehicles_map[vehicle.color].add(vehicle.registration_number)
+        self._registration_numbers.add(vehicle.registration_number)
+        self._color_spots_map[vehicle.color_id].add(vehicle.parking_spot.id_ - 1)
 
     def _remove_vehicle_details(
         self, vehicle: Vehicle
     ) -> None:
         """
-        Remove vehicle details from parking-lot data store on vehicle exit.
+        Remove vehicle details from parking-lot data store on vehicle exit,
+        before vehicle gives up its parking-spot.
         """
         if vehicle.registration_number in self._parked_vehicles:
             del self._parked_vehicles[vehicle.registration_number]
-        if (
-            vehicle.color in self._color_vehicles_map 
-            and vehicle.registration_number in self._color_vehicles_map.get(vehicle.color, set())
-        ):
-            self._color_vehicles_map[vehicle.color].remove(vehicle.registration_number)
+        self._registration_numbers.discard(vehicle.registration_number)
+        color_spots = self._color_spots_map.get(vehicle.color_id)
+        if color_spots is not None:
+            color_spots.discard(vehicle.parking_spot.id_ - 1)
+            if not color_spots:
+                del self._color_spots_map[vehicle.color_id]
 
     def _update_parking_lot(
         self, event: ParkingLotEvent, vehicle: Vehicle
-    ) -> None:
+    ) -> int:
         """
         Update parking-lot on ENTRY/EXIT of vehicles
+        Return ticket ledger row of visit closed on EXIT, else -1.
         """
         if event is ParkingLotEvent.PARK:
             self._park_vehicle(vehicle)
-            self._increment_spot_count(vehicle.type_)
+            self._increment_spot_count(vehicle.parking_spot.parking_spot_type)
             self._add_vehicle_details(vehicle)
+            if self._event_listeners:
+                self._notify_event_listeners(event, vehicle)
         elif event is ParkingLotEvent.UNPARK:
-            self._unpark_vehicle(vehicle)
-            self._decrement_spot_count(vehicle.type_)        
+            if self._event_listeners:
+                self._notify_event_listeners(event, vehicle)
             self._remove_vehicle_details(vehicle)
+            return self._unpark_vehicle(vehicle)
+        return -1
 
-    def _is_parking_spot_available(self, vehicle_type: VehicleType) -> bool:
+    def _get_spot_types(
+        self, vehicle_type: VehicleType
+    ) -> Tuple[ParkingSpotType, ...]:
         """
-        Check availability of spot for incoming vehicle.
-        Return bool value.
+        Return parking-spot types vehicle type may take, in order of preference.
         """
-        if vehicle_type is VehicleType.CAR:
-            # check if there is any parking available
-            return self._is_four_wheeler_spot_available()
-        else:
+        spot_types = self._spot_type_rules.get(vehicle_type)
+        if spot_types is None:
             raise Exception("Invalid vehicle type request")
+        return spot_types
 
-    def _is_four_wheeler_spot_available(self):
+    def _get_spot_pool(self, vehicle_type: VehicleType) -> SpotPool:
         """
-        Check if any four-wheeler parking-spot available.
+        Pick spot pool for incoming vehicle: first parking-spot type
+        of its rules with a free parking-spot, going by pools'
+        counters only, so fallbacks never scan a pool.
+        Return spot pool, None if none has a free parking-spot.
         """
-        any_four_wheeler_spot = self._curr_four_wheelers_parked \
-                < self._max_four_wheeler_spots
-        is_next_spot_counter_valid = self._next_four_wheeler_spot >= 0
-        return any_four_wheeler_spot and is_next_spot_counter_valid
+        for spot_type in self._get_spot_types(vehicle_type):
+            spot_pool = self._spot_pools.get(spot_type)
+            if spot_pool is not None \
+                and spot_pool.taken_spots < spot_pool.max_spots:
+                return spot_pool
+        return None
+
+    def _is_parking_spot_available(self, vehicle_type: VehicleType) -> bool:
+        """
+        Check availability of spot for incoming vehicle.
+        Return bool value.
+        """
+        return self._get_spot_pool(vehicle_type) is not None
 
     def _park_vehicle(self, vehicle: Vehicle) -> None:
         """
@@ -233,97 +822,120 @@ class FourWheelerParkingLot(ParkingLot):
         Allocate ticket to incoming vehicle.
         """
         vehicle_type = vehicle.type_
-        parking_spot = self._select_next_available_parking_spot(vehicle_type)
+        parking_spot = self._select_next_available_parking_spot(
+            vehicle_type, vehicle.gate)
+        self._occupy_parking_spot(vehicle, parking_spot)
+
+    def _occupy_parking_spot(
+        self, vehicle: Vehicle, parking_spot: ParkingSpot
+    ) -> None:
+        """
+        Place vehicle in given parking-spot.
+        """
         parking_spot.occupy_spot(vehicle)
         vehicle.parking_spot = parking_spot
+        self._occupied_spots.add(parking_spot.id_ - 1)
+        if self._reservations is not None:
+            self._reservations.set_spot_taken(parking_spot.id_, True)
 
     def _select_next_available_parking_spot(
-        self, vehicle_type: VehicleType
+        self, vehicle_type: VehicleType, gate: int = None
     ) -> ParkingSpot:
         """
-        Select and return next available parking-spot based on vehicle type. 
+        Select and return next available parking-spot based on vehicle type,
+        as parking-lot's allocation policy picks it for given gate.
         Return parking-spot.
         """
-        if vehicle_type is VehicleType.CAR:
-            parking_spot = self._four_wheeler_spots[
-                self._next_four_wheeler_spot]
-        return parking_spot
+        spot_pool = self._get_spot_pool(vehicle_type)
+        return self._parking_spots[spot_pool.acquire(gate)]
 
     def _issue_new_parking_ticket(self, vehicle: Vehicle) -> None:
         """
         Assign ticket to vehicle(owner) based on 
-        vehicle type.
+        type of parking-spot it took.
         """
-        if vehicle.type_ is VehicleType.CAR:
-            vehicle.ticket = FourWheelerParkingTicket()
+        vehicle.ticket = PARKING_TICKETS[vehicle.parking_spot.parking_spot_type]()
+        self._record_parking_ticket(vehicle)
 
-    def _prefetch_next_available_parking_spot(
-        self, parking_spots: List[ParkingSpot]
-    ) -> int:
+    def _record_parking_ticket(
+        self, vehicle: Vehicle, entry_time_ns: int = None
+    ) -> None:
         """
-        Pick the next available parking-spot from a given list of 
-        parking-spots.
-        Return free parking-spot's index(zero based) 
-        in given list of parking-spots. 
-        If no parking-spots available return -1.
+        Open visit of vehicle in ticket ledger, entered now unless
+        entry_time_ns(ledger's clock) is given.
         """
-        for i, parking_spot in enumerate(parking_spots):
-            if parking_spot.is_free():
-                return i
-        return -1
+        self._ticket_ledger.open(
+            vehicle.ticket.id_, vehicle.parking_spot.id_,
+            vehicle.registration_number, vehicle.color_id, entry_time_ns
+        )
 
-    def _increment_spot_count(self, vehicle_type: VehicleType) -> None:
+    def _increment_spot_count(self, parking_spot_type: ParkingSpotType) -> None:
         """
         Update parking-lot state on new vehicle's entry.
         """
-        if vehicle_type is VehicleType.CAR:
-            curr_count = self._curr_four_wheelers_parked
-            self._curr_four_wheelers_parked = \
-                min(self._max_four_wheeler_spots, curr_count + 1)
-            self._next_four_wheeler_spot = \
-                self._prefetch_next_available_parking_spot(
-                    self._four_wheeler_spots
-                )
-        else:
-            raise Exception("Invalid vehicle type request")
+        spot_pool = self._spot_pools[parking_spot_type]
+        spot_pool.taken_spots = min(spot_pool.max_spots, spot_pool.taken_spots + 1)
 
-    def _unpark_vehicle(self, vehicle: Vehicle) -> None:
+    def _unpark_vehicle(self, vehicle: Vehicle) -> int:
         """
-        Unpark vehicle from parking lot.
+        Unpark vehicle from parking lot, handing its
+        parking-spot back to its spot pool.
+        Return ticket ledger row of vehicle's visit.
         """
         parking_spot = vehicle.parking_spot
         parking_spot.free_up_spot()
+        index = parking_spot.id_ - 1
+        self._occupied_spots.discard(index)
+        if self._reservations is not None:
+            self._reservations.set_spot_taken(parking_spot.id_, False)
+        # parking-spot held for a reservation stays out of the pool
+        if index not in self._held_spots:
+            spot_type = parking_spot.parking_spot_type
+            self._spot_pools[spot_type].release(index)
+            self._decrement_spot_count(spot_type)
 
-        # this will remove ref to allocated ticket
-        # and be gc'ed
+        # visit stays in ticket ledger, ticket object
+        # itself is gc'ed once vehicle drops its ref
+        row = self._close_visit(vehicle, parking_spot.parking_spot_type)
         vehicle._deallocate_parking_spot()
+        return row
+
+    def _close_visit(
+        self, vehicle: Vehicle, parking_spot_type: ParkingSpotType
+    ) -> int:
+        """
+        Close vehicle's visit in ticket ledger, charging
+        its fee if billing is enabled.
+        Return ticket ledger row of the visit.
+        """
+        row = self._ticket_ledger.close(vehicle.ticket.id_)
+        if self._billing is not None and row >= 0:
+            entry = self._ticket_ledger.get_entry(row)
+            offset_ns = self._ticket_ledger.wall_clock_offset_ns
+            self._billing.charge(
+                row, parking_spot_type,
+                entry.entry_time_ns + offset_ns, entry.exit_time_ns + offset_ns)
+        return row
 
-    def _decrement_spot_count(self, vehicle_type: VehicleType) -> None:
+    def _decrement_spot_count(self, parking_spot_type: ParkingSpotType) -> None:
         """
         Update parking-lot state on vehicle's exit.
         """
-        if vehicle_type is VehicleType.CAR:
-            curr_count = self._curr_four_wheelers_parked
-            self._curr_four_wheelers_parked = max(0, curr_count - 1)
-            self._next_four_wheeler_spot = \
-                self._prefetch_next_available_parking_spot(
-                    self._four_wheeler_spots
-                )
-        else:
-            raise Exception("Invalid vehicle type request")
+        spot_pool = self._spot_pools[parking_spot_type]
+        spot_pool.taken_spots = max(0, spot_pool.taken_spots - 1)
 
     def get_registration_numbers_of_vehicle_with_color(
         self, color: str, vehicle_type: VehicleType = None
     ) -> List[str]:
         """
         Scan list of vehicles(of particular type if provided) 
-        with particular color.
+        with particular color, in parking-spot order.
         Return list of vehicles' registration numbers.
         """
         res = []
-        vehicles_reg_no_set: Set[Vehicle] = self._color_vehicles_map.get(color.lower(), set())
-        for reg_no in vehicles_reg_no_set:
-            vehicle = self._parked_vehicles[reg_no]
+        parking_spots = self._parking_spots
+        for i in self._color_spots_map.get(COLORS.find(color), ()):
+            vehicle: Vehicle = parking_spots[i].vehicle
             if not vehicle_type or vehicle.type_predicate(vehicle_type):
                 res.append(vehicle.registration_number)
         return res
@@ -332,16 +944,46 @@ class FourWheelerParkingLot(ParkingLot):
         self, color: str, vehicle_type: VehicleType = None
     ) -> List[int]:
         """
-        Return all parking-spot numbers(id).
+        Return all parking-spot numbers(id) in ascending order.
         """
+        color_spots = self._color_spots_map.get(COLORS.find(color), ())
+        if not vehicle_type:
+            return [i + 1 for i in color_spots]
+
         res = []
-        vehicles_reg_no_set: Set[str] = self._color_vehicles_map.get(color.lower(), set())
-        for reg_no in vehicles_reg_no_set:
-            vehicle: Vehicle = self._parked_vehicles[reg_no]
-            if not vehicle_type or vehicle.type_predicate(vehicle_type):
-                res.append(vehicle.parking_spot.id_)
+        parking_spots = self._parking_spots
+        for i in color_spots:
+            vehicle: Vehicle = parking_spots[i].vehicle
+            if vehicle.type_predicate(vehicle_type):
+                res.append(i + 1)
         return res
 
+    def _iter_registration_numbers_with_prefix(self, prefix: str) -> Iterator[str]:
+        """
+        Iterate registration numbers of parked vehicles starting with
+        prefix, in sorted order: they are adjacent in sorted order, so
+        cost is a bisect plus O(1) per match.
+        """
+        for registration_number in self._registration_numbers.irange(prefix):
+            if not registration_number.startswith(prefix):
+                return
+            yield registration_number
+
+    def get_parking_spot_numbers_of_registration_prefix(
+        self, prefix: str
+    ) -> List[int]:
+        """
+        Return parking-spot numbers(ascending) of vehicles whose
+        registration number starts with prefix, e.g. state 'KA'
+        or series 'KA-01-HH'.
+        """
+        parked_vehicles = self._parked_vehicles
+        return sorted(
+            parked_vehicles[registration_number].parking_spot.id_
+            for registration_number
+            in self._iter_registration_numbers_with_prefix(prefix.upper())
+        )
+
     def get_vehicle_spot_number(
         self, vehicle_registration_number: str
     ) -> int:
@@ -365,11 +1007,23 @@ class FourWheelerParkingLot(ParkingLot):
         Return status of parking-lot.
         """
         res = [('Slot No.', 'Registration No', 'Colour')]
-        for i in range(self._max_four_wheeler_spots):
-            parking_spot: ParkingSpot = self._four_wheeler_spots[i]
-            if parking_spot.is_free():
-                continue
-            vehicle = parking_spot.vehicle
-            row = (parking_spot.id_, vehicle.registration_number.upper(), vehicle.color.capitalize())
-            res.append(row)
+        res.extend(self.iter_parking_lot_status())
         return res
+
+    def iter_parking_lot_status(
+        self, offset: int = 0, limit: int = None
+    ) -> Iterator[tuple]:
+        """
+        Stream status rows of occupied parking-spots in spot order,
+        starting from offset-th occupied spot, at most limit rows.
+        Cost depends on occupied parking-spots streamed, not 
+        on parking-lot's capacity.
+        Negative offset or limit gives an empty page.
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            return
+        stop = None if limit is None else offset + limit
+        for i in self._occupied_spots.islice(offset, stop):
+            parking_spot: ParkingSpot = self._parking_spots[i]
+            vehicle = parking_spot.vehicle
+            yield (parking_spot.id_, vehicle.registration_number.upper(), COLORS.label(vehicle.color_id))
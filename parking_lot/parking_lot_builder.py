@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
 
+from parking_lot.concurrent_parking_lot import ConcurrentFourWheelerParkingLot
+from parking_lot.constants import (
+    DEFAULT_SPOT_TYPE_RULES, ParkingSpotType, VehicleType
+)
 from parking_lot.parking_lot import FourWheelerParkingLot, ParkingLot
-from parking_lot.parking_spot import FourWheelerSpot
+from parking_lot.sorted_list import SortedList
+from parking_lot.spot_allocator import MinHeapSpotAllocator, SpotAllocator, SpotPool
+from parking_lot.spot_store import ColumnarSpotStore, LazySpotStore
 
 
 class ParkingLotBuilder(ABC):
@@ -9,6 +16,14 @@ class ParkingLotBuilder(ABC):
     def add_four_wheeler_parking_spots(self):
         pass
 
+    @abstractmethod
+    def add_parking_spots(self):
+        pass
+
+    @abstractmethod
+    def set_spot_type_rules(self):
+        pass
+
     @abstractmethod
     def init_parking_lot_data_store(self):
         pass
@@ -22,41 +37,143 @@ class FourWheelerParkingLotBuilder(ParkingLotBuilder):
         self._parking_lot = FourWheelerParkingLot()
 
     def add_four_wheeler_parking_spots(
-        self, max_four_wheeler_spots: int
+        self, max_four_wheeler_spots: int,
+        spot_allocator: SpotAllocator = None
     ) -> None:
         """
-        Add four wheeler spots to parking_lot.
+        Add four wheeler spots to parking_lot, allocated by
+        given spot allocator(lowest numbered spot first by default).
         """
-        four_wheeler_spots = [None] * max_four_wheeler_spots
-        for i, __ in enumerate(range(max_four_wheeler_spots), 0):
-            four_wheeler_spots[i] = FourWheelerSpot()
+        self.add_parking_spots(
+            {ParkingSpotType.FOUR_WHEELER: max_four_wheeler_spots},
+            {ParkingSpotType.FOUR_WHEELER: spot_allocator}
+        )
 
-        # initialize four wheeler parking-spots config
-        self._parking_lot._four_wheeler_spots = four_wheeler_spots
-        self._parking_lot._max_four_wheeler_spots = max_four_wheeler_spots
-        self._parking_lot._curr_four_wheelers_parked = 0
-        self._parking_lot._next_four_wheeler_spot = 0
+    def add_parking_spots(
+        self, spot_counts: Dict[ParkingSpotType, int],
+        spot_allocators: Dict[ParkingSpotType, SpotAllocator] = None
+    ) -> None:
+        """
+        Add parking-spots of given types to parking_lot, each type
+        in its own block and spot pool, four wheeler spots first.
+        Spot pool's allocator is taken from spot_allocators,
+        lowest numbered spot first by default.
+        """
+        spot_allocators = spot_allocators or {}
+        spot_blocks: List[Tuple[ParkingSpotType, int]] = []
+        spot_pools: Dict[ParkingSpotType, SpotPool] = {}
+        first_index = 0
+        for spot_type in ParkingSpotType:
+            max_spots = spot_counts.get(spot_type, 0)
+            if spot_type is not ParkingSpotType.FOUR_WHEELER and not max_spots:
+                continue
+            spot_allocator = spot_allocators.get(spot_type)
+            if spot_allocator is None:
+                spot_allocator = MinHeapSpotAllocator(max_spots)
+            elif len(spot_allocator) != max_spots:
+                raise Exception("Invalid spot allocator size")
+            spot_blocks.append((spot_type, max_spots))
+            spot_pools[spot_type] = SpotPool(spot_type, first_index, spot_allocator)
+            first_index += max_spots
+
+        # initialize parking-spots config
+        self._parking_lot._parking_spots = self._create_parking_spots(spot_blocks)
+        self._parking_lot._spot_pools = spot_pools
+        self._parking_lot._occupied_spots = SortedList()
+        if self._parking_lot._spot_type_rules is None:
+            self.set_spot_type_rules(DEFAULT_SPOT_TYPE_RULES)
+
+    def set_spot_type_rules(
+        self, spot_type_rules: Dict[VehicleType, Tuple[ParkingSpotType, ...]]
+    ) -> None:
+        """
+        Set parking-spot types each vehicle type may take,
+        in order of preference.
+        """
+        self._parking_lot._spot_type_rules = {
+            vehicle_type: tuple(spot_types)
+            for vehicle_type, spot_types in spot_type_rules.items()
+        }
+
+    def _create_parking_spots(
+        self, spot_blocks: List[Tuple[ParkingSpotType, int]]
+    ):
+        """
+        Create store of parking-spots, one parking-spot object
+        per parking-spot, made on first touch.
+        """
+        return LazySpotStore(spot_blocks)
 
     def init_parking_lot_data_store(self) -> None:
         """
         Initialize local data store.
         """
-        self._parking_lot.initialize_color_vehicles_map()
+        self._parking_lot.initialize_color_spots_map()
         self._parking_lot.initialize_parked_vehicles()
+        self._parking_lot.initialize_registration_numbers()
+        self._parking_lot.initialize_ticket_ledger()
 
     def get_parking_lot(self):
         return self._parking_lot
 
+class ColumnarFourWheelerParkingLotBuilder(FourWheelerParkingLotBuilder):
+    """
+    Build four-wheeler parking-lot keeping its parking-spots
+    in compact parallel arrays, suited for very large lots.
+    """
+    def _create_parking_spots(
+        self, spot_blocks: List[Tuple[ParkingSpotType, int]]
+    ):
+        """
+        Create array backed store of parking-spots.
+        """
+        parking_spots = ColumnarSpotStore(
+            sum(max_spots for __, max_spots in spot_blocks),
+            ParkingSpotType.FOUR_WHEELER)
+        first_index = 0
+        for spot_type, max_spots in spot_blocks:
+            if spot_type is not ParkingSpotType.FOUR_WHEELER:
+                parking_spots.set_spot_type(
+                    first_index, first_index + max_spots, spot_type)
+            first_index += max_spots
+        return parking_spots
+
+class ConcurrentFourWheelerParkingLotBuilder(FourWheelerParkingLotBuilder):
+    """
+    Build four-wheeler parking-lot safe to share between
+    gate controllers running as threads.
+    """
+    def __init__(self, lock_stripes: int = 64):
+        self._parking_lot = ConcurrentFourWheelerParkingLot(lock_stripes)
+
 class ParkingLotDirector:
     def __init__(self, parking_lot_builder: ParkingLotBuilder):
         self.parking_lot_builder = parking_lot_builder
         self.parking_lot = None
 
-    def build_parking_lot(self, max_four_wheeler_spots: int) -> ParkingLot:
+    def build_parking_lot(
+        self, max_four_wheeler_spots: int,
+        spot_allocator: SpotAllocator = None,
+        spot_counts: Dict[ParkingSpotType, int] = None,
+        spot_type_rules: Dict[VehicleType, Tuple[ParkingSpotType, ...]] = None
+    ) -> ParkingLot:
         """
-        Build parking-lot.
+        Build parking-lot, with allocation policy of given
+        spot allocator(lowest numbered spot first by default).
+        spot_counts adds parking-spots of other types,
+        spot_type_rules replace default parking-spot types
+        each vehicle type may take.
         """
-        self.parking_lot_builder.add_four_wheeler_parking_spots(max_four_wheeler_spots)
+        if spot_type_rules is not None:
+            self.parking_lot_builder.set_spot_type_rules(spot_type_rules)
+        if spot_counts:
+            self.parking_lot_builder.add_parking_spots(
+                {**spot_counts, ParkingSpotType.FOUR_WHEELER: max_four_wheeler_spots},
+                {ParkingSpotType.FOUR_WHEELER: spot_allocator}
+            )
+        else:
+            self.parking_lot_builder.add_four_wheeler_parking_spots(
+                max_four_wheeler_spots, spot_allocator)
         self.parking_lot_builder.init_parking_lot_data_store()
         self.parking_lot = self.parking_lot_builder.get_parking_lot()
 
@@ -1,125 +1,731 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import date, datetime
+import itertools
+import os
+import time
+from typing import Dict, Iterator, List, Tuple
 
 from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot import analytics, billing
+from parking_lot.constants import ParkingSpotType, ParkOutcome, VehicleType
+from parking_lot.interning import COLORS
+from parking_lot.metrics import render_prometheus, write_prometheus_file
 from parking_lot.parking_lot import FourWheelerParkingLot
-from parking_lot.vehicle import Car
+from parking_lot.parking_lot_registry import ParkingLotRegistry
+from parking_lot.parking_ticket import ParkingTicket
+from parking_lot.persistence import (
+    ParkingLotJournal, read_snapshot_journal_offset, restore_parking_lot,
+    write_snapshot
+)
+from parking_lot.vehicle import VEHICLES, Car
+
+PARKING_LOT_NOT_FOUND = "Sorry, parking lot not found"
 
 
 class FourWheelerParkingLotCommand(ABC):
+    # default parking-lot, the first one created
     _parking_lot = None
+    _registry: ParkingLotRegistry = None
+
+    # persistence of default parking-lot, enabled by enable_persistence
+    _state_dir = None
+    _journal: ParkingLotJournal = None
+
+    # metrics of all parking-lots, enabled by enable_metrics
+    _metrics_enabled = False
+    _metrics_file = None
+
+    # capacity of parking-lots' event streams, None while disabled
+    _event_stream_capacity = None
+
+    # billing of all parking-lots, enabled by enable_billing
+    _billing_enabled = False
+
+    # parking-lot targeted by command, None for default parking-lot
+    _lot_id = None
+
+    # class state put aside by isolated_state, as reset leaves it
+    _STATE_DEFAULTS = {
+        '_parking_lot': None,
+        '_registry': None,
+        '_state_dir': None,
+        '_journal': None,
+        '_metrics_enabled': False,
+        '_metrics_file': None,
+        '_event_stream_capacity': None,
+        '_billing_enabled': False,
+    }
 
     def __init__(self):
         self._parking_lot: FourWheelerParkingLot = None
     
     @classmethod
-    def get_parking_lot_(cls):
-        return cls._parking_lot
+    def get_parking_lot_(cls, lot_id: int = None):
+        if lot_id is None:
+            return FourWheelerParkingLotCommand._parking_lot
+        if FourWheelerParkingLotCommand._registry is None:
+            return None
+        return FourWheelerParkingLotCommand._registry.get_parking_lot(lot_id)
 
     @classmethod
-    def create_parking_lot(cls, max_four_wheeler_spots: int):
+    def get_registry(cls) -> ParkingLotRegistry:
+        if FourWheelerParkingLotCommand._registry is None:
+            FourWheelerParkingLotCommand._registry = ParkingLotRegistry()
+        return FourWheelerParkingLotCommand._registry
+
+    @classmethod
+    def create_parking_lot(
+        cls, max_four_wheeler_spots: int,
+        spot_counts: Dict[ParkingSpotType, int] = None
+    ) -> int:
+        """
+        Build and register new parking-lot, with parking-spots
+        of other types per spot_counts, first one becomes
+        default parking-lot.
+        Return new parking-lot's id.
+        """
+        parking_lot_builder = FourWheelerParkingLotBuilder()
+        parking_lot_director = ParkingLotDirector(parking_lot_builder)
+        parking_lot_director.build_parking_lot(
+            max_four_wheeler_spots, spot_counts=spot_counts)
+        parking_lot = parking_lot_director.get_parking_lot()
+        cls._register_parking_lot(parking_lot)
         if not cls._parking_lot:
-            parking_lot_builder = FourWheelerParkingLotBuilder()
-            parking_lot_director = ParkingLotDirector(parking_lot_builder)
-            parking_lot_director.build_parking_lot(max_four_wheeler_spots)
-            cls._parking_lot = parking_lot_director.get_parking_lot()
+            FourWheelerParkingLotCommand._parking_lot = parking_lot
+            if cls._state_dir:
+                # new lot starts with an empty snapshot and journal
+                cls._attach_journal(truncate=True)
+                cls.snapshot_parking_lot()
+        return parking_lot.id_
+
+    @classmethod
+    def _register_parking_lot(cls, parking_lot: FourWheelerParkingLot) -> None:
+        cls.get_registry().register(parking_lot)
+        if cls._metrics_enabled:
+            parking_lot.enable_metrics()
+        if cls._event_stream_capacity:
+            parking_lot.get_event_stream(cls._event_stream_capacity)
+        if cls._billing_enabled:
+            parking_lot.enable_billing()
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Drop all parking-lots, persistence and metrics settings.
+        """
+        cls.close()
+        for name, value in cls._STATE_DEFAULTS.items():
+            setattr(FourWheelerParkingLotCommand, name, value)
+
+    @classmethod
+    @contextmanager
+    def isolated_state(cls) -> Iterator[None]:
+        """
+        Run block on parking-lots and settings of its own, lot and
+        ticket ids counted from 1. Block's parking-lots are closed on
+        the way out and caller's are put back untouched.
+        """
+        saved_state = {
+            name: getattr(FourWheelerParkingLotCommand, name)
+            for name in cls._STATE_DEFAULTS
+        }
+        saved_counters = (
+            FourWheelerParkingLot.parking_lot_counter, ParkingTicket.ticket_counter)
+        for name, value in cls._STATE_DEFAULTS.items():
+            setattr(FourWheelerParkingLotCommand, name, value)
+        FourWheelerParkingLot.parking_lot_counter = itertools.count(start=1)
+        ParkingTicket.ticket_counter = itertools.count(start=1)
+        try:
+            yield
+        finally:
+            try:
+                cls.close()
+            finally:
+                for name, value in saved_state.items():
+                    setattr(FourWheelerParkingLotCommand, name, value)
+                FourWheelerParkingLot.parking_lot_counter, \
+                    ParkingTicket.ticket_counter = saved_counters
+
+    @classmethod
+    def enable_event_streams(cls, capacity: int = 65536) -> None:
+        """
+        Publish PARK/UNPARK events of existing and future
+        parking-lots into event streams of given capacity.
+        """
+        FourWheelerParkingLotCommand._event_stream_capacity = capacity
+        for parking_lot in cls.get_registry():
+            parking_lot.get_event_stream(capacity)
+
+    @classmethod
+    def enable_billing(cls) -> None:
+        """
+        Charge visits of existing and future parking-lots
+        on exit, by default tariffs.
+        """
+        FourWheelerParkingLotCommand._billing_enabled = True
+        for parking_lot in cls.get_registry():
+            parking_lot.enable_billing()
+
+    @classmethod
+    def enable_metrics(cls, metrics_file: str = None) -> None:
+        """
+        Collect metrics of existing and future parking-lots.
+        If metrics_file is given, it is rewritten on every metrics
+        command and on close.
+        """
+        FourWheelerParkingLotCommand._metrics_enabled = True
+        FourWheelerParkingLotCommand._metrics_file = metrics_file
+        for parking_lot in cls.get_registry():
+            parking_lot.enable_metrics()
+
+    @classmethod
+    def render_metrics(cls) -> str:
+        """
+        Return metrics of all parking-lots in Prometheus text format.
+        """
+        text = render_prometheus(cls.get_registry())
+        if cls._metrics_file:
+            write_prometheus_file(cls._metrics_file, text)
+        return text
+
+    @classmethod
+    def _snapshot_path(cls) -> str:
+        return os.path.join(cls._state_dir, 'parking_lot.snapshot')
+
+    @classmethod
+    def _journal_path(cls) -> str:
+        return os.path.join(cls._state_dir, 'parking_lot.journal')
+
+    @classmethod
+    def _attach_journal(cls, truncate: bool = False, offset: int = 0) -> None:
+        FourWheelerParkingLotCommand._journal = ParkingLotJournal(
+            cls._journal_path(), truncate=truncate, offset=offset)
+        cls._parking_lot.add_event_listener(cls._journal)
+
+    @classmethod
+    def enable_persistence(cls, state_dir: str) -> None:
+        """
+        Keep default parking-lot state in state_dir as snapshot and journal.
+        Parking-lot saved in state_dir is restored, if any.
+        """
+        os.makedirs(state_dir, exist_ok=True)
+        FourWheelerParkingLotCommand._state_dir = state_dir
+        if not cls._parking_lot and os.path.exists(cls._snapshot_path()):
+            FourWheelerParkingLotCommand._parking_lot = restore_parking_lot(
+                cls._snapshot_path(), cls._journal_path())
+            cls._register_parking_lot(cls._parking_lot)
+            # journal before snapshot's offset was complete when taken
+            cls._attach_journal(
+                offset=read_snapshot_journal_offset(cls._snapshot_path()))
+
+    @classmethod
+    def snapshot_parking_lot(cls) -> bool:
+        """
+        Write snapshot of default parking-lot, so restart replays
+        only journal written after it.
+        """
+        if not (cls._state_dir and cls._parking_lot):
+            return False
+        write_snapshot(cls._parking_lot, cls._snapshot_path(), cls._journal)
+        return True
+
+    @classmethod
+    def parking_lot_resized(cls, parking_lot: FourWheelerParkingLot) -> None:
+        """
+        Bring registry and snapshot in line with parking-lot's
+        parking-spots added or retired.
+        """
+        cls.get_registry().update_capacity(parking_lot.id_)
+        if parking_lot is cls._parking_lot:
+            # journal is replayed onto parking-lot of the snapshot
+            cls.snapshot_parking_lot()
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Commit journaled events still pending
+        and write out metrics file.
+        """
+        if cls._journal:
+            cls._journal.close()
+        if cls._metrics_enabled and cls._metrics_file:
+            cls.render_metrics()
+
+    def _target_parking_lot(self) -> FourWheelerParkingLot:
+        """
+        Return parking-lot command runs against.
+        """
+        return FourWheelerParkingLotCommand.get_parking_lot_(self._lot_id)
 
     @abstractmethod
     def execute(self):
         pass
 
 class CreateFourWheelerParkingLot(FourWheelerParkingLotCommand):
-    def __init__(self, max_four_wheeler_spots: int):
+    def __init__(
+        self, max_four_wheeler_spots: int,
+        spot_counts: Dict[ParkingSpotType, int] = None
+    ):
         self._max_four_wheeler_spots = max_four_wheeler_spots
+        self._spot_counts = spot_counts or {}
     
     def execute(self):
         """
-        Create four-wheeler parking-lot.
+        Create four-wheeler parking-lot, with parking-spots of other
+        types if requested.
         """
-        FourWheelerParkingLotCommand.create_parking_lot(self._max_four_wheeler_spots)
+        is_first_parking_lot = not FourWheelerParkingLotCommand.get_parking_lot_()
+        lot_id = FourWheelerParkingLotCommand.create_parking_lot(
+            self._max_four_wheeler_spots, self._spot_counts)
+        max_spots = self._max_four_wheeler_spots + sum(
+            count for spot_type, count in self._spot_counts.items()
+            if spot_type is not ParkingSpotType.FOUR_WHEELER
+        )
         
-        if FourWheelerParkingLotCommand.get_parking_lot_():
-            return f"Created a parking lot with {self._max_four_wheeler_spots} slots"
+        if is_first_parking_lot:
+            return f"Created a parking lot with {max_spots} slots"
+        return f"Created a parking lot with {max_spots} slots (lot id: {lot_id})"
+
+class ExpandFourWheelerParkingLot(FourWheelerParkingLotCommand):
+    def __init__(self, spot_count: int, lot_id: int = None):
+        self._spot_count = spot_count
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Add four-wheeler parking-spots after the last parking-spot.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if self._spot_count < 0 or not parking_lot.is_resizable():
+            return "Sorry, parking lot can not be resized"
+        parking_lot.expand_parking_lot(self._spot_count)
+        FourWheelerParkingLotCommand.parking_lot_resized(parking_lot)
+        return f"Parking lot now has {parking_lot.max_spots()} slots"
+
+class ShrinkFourWheelerParkingLot(FourWheelerParkingLotCommand):
+    def __init__(self, spot_count: int, lot_id: int = None):
+        self._spot_count = spot_count
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Retire highest numbered four-wheeler parking-spots.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if not 0 <= self._spot_count <= parking_lot.max_four_wheeler_spots \
+            or not parking_lot.is_resizable():
+            return "Sorry, parking lot can not be resized"
+        if not parking_lot.shrink_parking_lot(self._spot_count):
+            return "Sorry, slots to retire are not free"
+        FourWheelerParkingLotCommand.parking_lot_resized(parking_lot)
+        return f"Parking lot now has {parking_lot.max_spots()} slots"
+
+class SnapshotFourWheelerParkingLot(FourWheelerParkingLotCommand):
+    def execute(self):
+        """
+        Save snapshot of four-wheeler parking-lot.
+        """
+        if FourWheelerParkingLotCommand.snapshot_parking_lot():
+            return "Saved parking lot snapshot"
+        return "Sorry, persistence is not enabled"
+
+class FourWheelerParkingLotMetrics(FourWheelerParkingLotCommand):
+    def execute(self):
+        """
+        Return metrics of four-wheeler parking-lots.
+        """
+        if not FourWheelerParkingLotCommand._metrics_enabled:
+            return "Sorry, metrics are not enabled"
+        return FourWheelerParkingLotCommand.render_metrics().rstrip('\n')
 
 class ParkFourWheelerCommand(FourWheelerParkingLotCommand):
+    def __init__(
+        self, registration_number: str, color: str, lot_id: int = None,
+        vehicle_type: VehicleType = VehicleType.CAR
+    ):
+        self._vehicle = VEHICLES[vehicle_type](registration_number, color)
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Park vehicle, a four-wheeler unless another type is given.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if FourWheelerParkingLotCommand.get_registry().park(self._vehicle, parking_lot.id_):
+            return f"Allocated slot number: {self._vehicle.parking_spot.id_}"
+        return "Sorry, parking lot is full"
+
+class ParkAnywhereFourWheelerCommand(FourWheelerParkingLotCommand):
     def __init__(self, registration_number: str, color: str):
         self._vehicle = Car(registration_number, color)
 
     def execute(self):
         """
-        Park four-wheeler.
+        Park four-wheeler in parking-lot with most free parking-spots.
         """
-        if FourWheelerParkingLotCommand._parking_lot.allocate_parking_spot(self._vehicle):
-            return f"Allocated slot number: {self._vehicle.parking_spot.id_}"
+        lot_id = FourWheelerParkingLotCommand.get_registry().park(self._vehicle)
+        if lot_id:
+            return f"Allocated slot number: {self._vehicle.parking_spot.id_} (lot id: {lot_id})"
         return "Sorry, parking lot is full"
 
+class ParkManyFourWheelersCommand(FourWheelerParkingLotCommand):
+    def __init__(self, vehicles_config: List[Tuple[str, str]], lot_id: int = None):
+        self._vehicles = [
+            Car(registration_number, color)
+            for registration_number, color in vehicles_config
+        ]
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Park a burst of four-wheelers, one result line per vehicle.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        registry = FourWheelerParkingLotCommand.get_registry()
+        # vehicles parked in other parking-lots are turned away
+        vehicles = [
+            vehicle for vehicle in self._vehicles
+            if registry.locate_vehicle(vehicle.registration_number) is None
+        ]
+        outcomes = dict(zip(map(id, vehicles), parking_lot.park_many(vehicles)))
+        res = []
+        for vehicle in self._vehicles:
+            outcome = outcomes.get(id(vehicle), ParkOutcome.DUPLICATE)
+            if outcome is ParkOutcome.PARKED:
+                res.append(f"Allocated slot number: {vehicle.parking_spot.id_}")
+            elif outcome is ParkOutcome.DUPLICATE:
+                res.append("Sorry, vehicle is already parked")
+            else:
+                res.append("Sorry, parking lot is full")
+        return '\n'.join(res)
+
 class LeaveFourWheelerParkingLotCommand(FourWheelerParkingLotCommand):
-    def __init__(self, parking_spot_id: int):
+    def __init__(self, parking_spot_id: int, lot_id: int = None):
         self._parking_spot_id = parking_spot_id
+        self._lot_id = lot_id
     
     def execute(self):
         """
         Exit four-wheeler-parking-lot.
         """
-        if FourWheelerParkingLotCommand._parking_lot.free_up_parking_spot(self._parking_spot_id):
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        # fee is read from the visit's own row, another gate's
+        # exit may be charged in between
+        row = parking_lot.check_out(self._parking_spot_id)
+        if row >= 0:
+            if parking_lot.billing is not None:
+                return (
+                    f"Slot number {self._parking_spot_id} is free "
+                    f"(fee: {parking_lot.billing.get_fee(row)})"
+                )
             return f"Slot number {self._parking_spot_id} is free"
         return "Sorry, parking spot is not freed"
 
+class LeaveManyFourWheelersParkingLotCommand(FourWheelerParkingLotCommand):
+    def __init__(self, parking_spot_ids: List[int], lot_id: int = None):
+        self._parking_spot_ids = parking_spot_ids
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Exit a burst of four-wheelers, one result line per parking-spot.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        freed = parking_lot.leave_many(self._parking_spot_ids)
+        res = []
+        for parking_spot_id, is_freed in zip(self._parking_spot_ids, freed):
+            if is_freed:
+                res.append(f"Slot number {parking_spot_id} is free")
+            else:
+                res.append("Sorry, parking spot is not freed")
+        return '\n'.join(res)
+
+class InvalidFourWheelerParkingLotArguments(FourWheelerParkingLotCommand):
+    """
+    Stands in for a command given arguments it can not take,
+    replying the way the command server does.
+    """
+    def __init__(self, line: str):
+        self._line = line
+
+    def execute(self):
+        return f"*** Invalid arguments: {self._line}"
+
 class FourWheelerParkingLotStatus(FourWheelerParkingLotCommand):
+    header = 'Slot No.\tRegistration No\t\tColour\n'
+
+    def __init__(self, offset: int = 0, limit: int = None, lot_id: int = None):
+        self._offset = offset
+        self._limit = limit
+        self._lot_id = lot_id
+
+    def _iter_lines(self):
+        """
+        Stream formatted status lines of four-wheeler-parking-lot.
+        """
+        rows = self._target_parking_lot().iter_parking_lot_status(
+            self._offset, self._limit)
+        for r in rows:
+            yield '\t\t'.join(map(lambda x: str(x), r)) + '\n'
+
     def execute(self):
         """
         Return state of four-wheeler-parking-lot
         """
-        status = FourWheelerParkingLotCommand._parking_lot.get_parking_lot_status()
-        if len(status) < 2:  # excluding header
+        if not self._target_parking_lot():
+            return PARKING_LOT_NOT_FOUND
+        res = ''.join(self._iter_lines())
+        if not res:
             return ""
-        
-        res = 'Slot No.\tRegistration No\t\tColour\n'
-        for r in status[1:]:
-            res += '\t\t'.join(map(lambda x: str(x), r)) + '\n'
+        return FourWheelerParkingLotStatus.header + res
 
-        return res
+    def write_to(self, file) -> int:
+        """
+        Write state of four-wheeler-parking-lot to file object
+        line by line, without building whole output in memory.
+        Return number of status rows written.
+        """
+        if not self._target_parking_lot():
+            file.write(PARKING_LOT_NOT_FOUND)
+            return 0
+        rows_written = 0
+        for line in self._iter_lines():
+            if not rows_written:
+                file.write(FourWheelerParkingLotStatus.header)
+            file.write(line)
+            rows_written += 1
+        return rows_written
 
 class FourWheeelerRegNosWithColor(FourWheelerParkingLotCommand):
-    def __init__(self, color: str):
+    def __init__(self, color: str, lot_id: int = None):
         self._color = color
+        self._lot_id = lot_id
 
     def execute(self):
         """
         Return list of four-wheelers' reg-nos with given color.
         """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
         reg_nos_list = \
-            FourWheelerParkingLotCommand._parking_lot.get_registration_numbers_of_vehicle_with_color(self._color)
+            parking_lot.get_registration_numbers_of_vehicle_with_color(self._color)
         
         if not reg_nos_list:
             return "Not Found"
         return ', '.join(reg_nos_list)
 
 class FourWheelerParkingSpotNosFromVehicleColor(FourWheelerParkingLotCommand):
-    def __init__(self, color: str):
+    def __init__(self, color: str, lot_id: int = None):
         self._color = color
+        self._lot_id = lot_id
 
     def execute(self):
         """
         Return list of four-wheelers' parking-spot-ids with given color.
         """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
         parking_spots_nos = \
-            FourWheelerParkingLotCommand._parking_lot.get_parking_spot_numbers_of_vehicles_with_color(self._color)
+            parking_lot.get_parking_spot_numbers_of_vehicles_with_color(self._color)
         
         if not parking_spots_nos:
             return "Not Found"
-        return ', '.join(map(lambda x: str(x), sorted(parking_spots_nos)))
+        return ', '.join(map(lambda x: str(x), parking_spots_nos))
 
 class FourWheelerParkingSpotNoFromRegNo(FourWheelerParkingLotCommand):
-    def __init__(self, registration_number: str):
+    def __init__(self, registration_number: str, lot_id: int = None):
         self._registration_number = registration_number
+        self._lot_id = lot_id
     
     def execute(self):
         """
         Return parking-spot number of vehicle.
         """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
         parking_spot_id = \
-            FourWheelerParkingLotCommand._parking_lot.get_vehicle_spot_number(self._registration_number)
+            parking_lot.get_vehicle_spot_number(self._registration_number)
         
         if parking_spot_id is None:
             return "Not found"
         return parking_spot_id
+
+class FourWheelerParkingSpotNosFromRegNoPrefix(FourWheelerParkingLotCommand):
+    def __init__(self, prefix: str, lot_id: int = None):
+        self._prefix = prefix
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Return list of parking-spot-ids of vehicles with registration
+        number starting with given prefix.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        parking_spots_nos = \
+            parking_lot.get_parking_spot_numbers_of_registration_prefix(self._prefix)
+
+        if not parking_spots_nos:
+            return "Not Found"
+        return ', '.join(map(str, parking_spots_nos))
+
+class FourWheelerParkingLotEvents(FourWheelerParkingLotCommand):
+    header = 'Seq\tEvent\tSlot No.\tRegistration No\tColour\tTicket\tTime'
+
+    def __init__(self, cursor: int, max_events: int = 1024, lot_id: int = None):
+        self._cursor = cursor
+        self._max_events = max_events
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Return batch of four-wheeler-parking-lot events from cursor on,
+        followed by cursor to read next batch from.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if not parking_lot.event_stream:
+            return "Sorry, event stream is not enabled"
+        batch = parking_lot.event_stream.read(self._cursor, self._max_events)
+        res = [FourWheelerParkingLotEvents.header]
+        for e in batch.events:
+            res.append('\t'.join(map(lambda x: str(x), (
+                e.seq, e.event.name, e.spot_id, e.registration_number,
+                COLORS.label(COLORS.find(e.color)), e.ticket_id, e.time_ns
+            ))))
+        res.append(f"Next cursor: {batch.cursor}, missed: {batch.missed}")
+        return '\n'.join(res)
+
+class FourWheelerParkingLotAnalytics(FourWheelerParkingLotCommand):
+    def __init__(self, hours: int = None, lot_id: int = None):
+        self._hours = hours
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Return occupancy, dwell-time and per parking-spot report
+        of four-wheeler-parking-lot over last hours, whole
+        visit history if hours are not given.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if not analytics.HAS_NUMPY:
+            return "Sorry, analytics needs numpy"
+        history = analytics.VisitHistory.from_ticket_ledger(parking_lot.ticket_ledger)
+        start_ns = None
+        if self._hours is not None:
+            start_ns = history.as_of_ns - self._hours * analytics.NS_PER_HOUR
+        return '\n'.join(analytics.render_report(
+            history, parking_lot.max_spots(), start_ns))
+
+class FourWheelerParkingLotInvoice(FourWheelerParkingLotCommand):
+    def __init__(self, day: date = None, lot_id: int = None):
+        self._day = day
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Return number of visits and fees of four-wheeler-parking-lot's
+        visits ending on given day(today by default), priced in batch.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if parking_lot.billing is None:
+            return "Sorry, billing is not enabled"
+        if not billing.HAS_NUMPY:
+            return "Sorry, invoice needs numpy"
+        day = self._day or date.today()
+        start = datetime(day.year, day.month, day.day)
+        start_ns = int(start.timestamp()) * billing.NS_PER_SECOND
+        stop_ns = start_ns + billing.NS_PER_DAY
+        ticket_ids, fees = parking_lot.billing.price_ticket_ledger(
+            parking_lot.ticket_ledger, start_ns, stop_ns)
+        return f"Visits: {len(ticket_ids)}, total fee: {int(fees.sum())}"
+
+class ReserveFourWheelerParkingSpot(FourWheelerParkingLotCommand):
+    def __init__(
+        self, registration_number: str, start: datetime, end: datetime,
+        parking_spot_id: int = None, lot_id: int = None
+    ):
+        self._registration_number = registration_number
+        self._start_ns = int(start.timestamp()) * 10 ** 9 + start.microsecond * 1000
+        self._end_ns = int(end.timestamp()) * 10 ** 9 + end.microsecond * 1000
+        self._parking_spot_id = parking_spot_id
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Reserve four-wheeler parking-spot(given one or any free one)
+        for vehicle over time window.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if not time.time_ns() < self._start_ns < self._end_ns:
+            return "Sorry, invalid reservation window"
+        reservation = parking_lot.reserve_parking_spot(
+            self._registration_number, self._start_ns, self._end_ns,
+            self._parking_spot_id)
+        # parking-spot may be held right away
+        FourWheelerParkingLotCommand.get_registry().update_capacity(parking_lot.id_)
+        if reservation is None:
+            if self._parking_spot_id is None:
+                return "Sorry, no slot is free for that time"
+            return f"Sorry, slot number {self._parking_spot_id} is not free for that time"
+        return (
+            f"Reserved slot number: {reservation.spot_id} "
+            f"(reservation id: {reservation.id_})"
+        )
+
+class CancelFourWheelerReservation(FourWheelerParkingLotCommand):
+    def __init__(self, reservation_id: int, lot_id: int = None):
+        self._reservation_id = reservation_id
+        self._lot_id = lot_id
+
+    def execute(self):
+        """
+        Cancel reservation of four-wheeler parking-spot.
+        """
+        parking_lot = self._target_parking_lot()
+        if not parking_lot:
+            return PARKING_LOT_NOT_FOUND
+        if parking_lot.cancel_reservation(self._reservation_id) is None:
+            return "Reservation not found"
+        FourWheelerParkingLotCommand.get_registry().update_capacity(parking_lot.id_)
+        return f"Cancelled reservation {self._reservation_id}"
+
+class FourWheelerParkingLotFromRegNo(FourWheelerParkingLotCommand):
+    def __init__(self, registration_number: str):
+        self._registration_number = registration_number
+
+    def execute(self):
+        """
+        Return parking-lot and parking-spot number of vehicle,
+        looked up across all parking-lots.
+        """
+        location = FourWheelerParkingLotCommand.get_registry().locate_vehicle(
+            self._registration_number)
+        if location is None:
+            return "Not found"
+        lot_id, parking_spot_id = location
+        return f"Lot id: {lot_id}, slot number: {parking_spot_id}"
@@ -0,0 +1,155 @@
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from parking_lot.constants import ParkingLotEvent, ParkingSpotType
+from parking_lot.parking_lot import FourWheelerParkingLot
+from parking_lot.sorted_list import SortedList
+from parking_lot.vehicle import Vehicle
+
+
+class ParkingLotRegistry:
+    """
+    Registry of parking-lots of a site.
+    Keeps
+    1. global index of parked vehicles: registration number ->
+       (parking-lot id, parking-spot id), so a vehicle is parked
+       in at most one parking-lot,
+    2. parking-lots ordered by free four-wheeler parking-spots, so park
+       anywhere routes to the emptiest parking-lot without polling every lot.
+    Both are maintained from parking-lots' PARK/UNPARK events. Free
+    parking-spots are read from the parking-lot itself, lots whose
+    vehicles came or left being re-read before routing, as parking-spots
+    held for reservations are taken and given back without any event.
+    """
+    def __init__(self):
+        self._parking_lots: Dict[int, FourWheelerParkingLot] = {}
+        self._vehicle_locations: Dict[str, Tuple[int, int]] = {}
+        self._free_spots: Dict[int, int] = {}
+        # (-free parking-spots, parking-lot id), emptiest lot first
+        self._parking_lots_by_capacity = SortedList()
+        # parking-lots whose free parking-spots changed since read
+        self._stale_lot_ids: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._parking_lots)
+
+    def __iter__(self) -> Iterator[FourWheelerParkingLot]:
+        return iter(list(self._parking_lots.values()))
+
+    def __contains__(self, parking_lot_id: int) -> bool:
+        return parking_lot_id in self._parking_lots
+
+    @property
+    def parking_lot_ids(self) -> List[int]:
+        return list(self._parking_lots)
+
+    def register(self, parking_lot: FourWheelerParkingLot) -> int:
+        """
+        Add parking-lot to registry.
+        Return parking-lot's id.
+        """
+        parking_lot_id = parking_lot.id_
+        self._parking_lots[parking_lot_id] = parking_lot
+        for reg_no, vehicle in parking_lot.parked_vehicles.items():
+            self._vehicle_locations[reg_no] = \
+                (parking_lot_id, vehicle.parking_spot.id_)
+        self._free_spots[parking_lot_id] = parking_lot.available_four_wheeler_spots
+        self._parking_lots_by_capacity.add(
+            (-self._free_spots[parking_lot_id], parking_lot_id))
+        parking_lot.add_event_listener(partial(self._on_event, parking_lot_id))
+        return parking_lot_id
+
+    def get_parking_lot(self, parking_lot_id: int) -> Optional[FourWheelerParkingLot]:
+        return self._parking_lots.get(parking_lot_id)
+
+    def _on_event(
+        self, parking_lot_id: int, event: ParkingLotEvent, vehicle: Vehicle
+    ) -> None:
+        """
+        Keep vehicle index and capacity order in sync with parking-lot.
+        """
+        if event is ParkingLotEvent.PARK:
+            self._vehicle_locations[vehicle.registration_number] = \
+                (parking_lot_id, vehicle.parking_spot.id_)
+        elif event is ParkingLotEvent.UNPARK:
+            self._vehicle_locations.pop(vehicle.registration_number, None)
+        # read once vehicle got in or out, unpark is notified before
+        if vehicle.parking_spot.parking_spot_type is ParkingSpotType.FOUR_WHEELER:
+            self._stale_lot_ids.add(parking_lot_id)
+
+    def update_capacity(self, parking_lot_id: int) -> None:
+        """
+        Re-read free four-wheeler parking-spots of parking-lot,
+        after its parking-spots got added, retired or held
+        for reservations.
+        """
+        free_spots = self._free_spots[parking_lot_id]
+        self._parking_lots_by_capacity.discard((-free_spots, parking_lot_id))
+        free_spots = self._parking_lots[parking_lot_id].available_four_wheeler_spots
+        self._free_spots[parking_lot_id] = free_spots
+        self._parking_lots_by_capacity.add((-free_spots, parking_lot_id))
+
+    def locate_vehicle(self, registration_number: str) -> Optional[Tuple[int, int]]:
+        """
+        Return (parking-lot id, parking-spot id) of parked vehicle.
+        """
+        return self._vehicle_locations.get(registration_number.upper())
+
+    def park(self, vehicle: Vehicle, parking_lot_id: int = None) -> Optional[int]:
+        """
+        Park vehicle in given parking-lot, or in parking-lot with
+        most free parking-spots if none given.
+        Return id of parking-lot vehicle got parked in.
+        """
+        if parking_lot_id is None:
+            return self._park_anywhere(vehicle)
+        location = self._vehicle_locations.get(vehicle.registration_number)
+        # vehicle parked in given parking-lot is turned away by the lot itself
+        if location is not None and location[0] != parking_lot_id:
+            return None
+        parking_lot = self._parking_lots.get(parking_lot_id)
+        if parking_lot is None or not parking_lot.allocate_parking_spot(vehicle):
+            return None
+        return parking_lot_id
+
+    def _park_anywhere(self, vehicle: Vehicle) -> Optional[int]:
+        """
+        Park vehicle in parking-lot with most free parking-spots.
+        Parking-lot turning vehicle away for parking-spots held since
+        it was last read is re-read and the next emptiest one is tried.
+        """
+        while True:
+            parking_lot_id = self.get_emptiest_parking_lot_id()
+            if parking_lot_id is None \
+                or vehicle.registration_number in self._vehicle_locations:
+                return None
+            if self._parking_lots[parking_lot_id].allocate_parking_spot(vehicle):
+                return parking_lot_id
+            free_spots = self._free_spots[parking_lot_id]
+            self.update_capacity(parking_lot_id)
+            if self._free_spots[parking_lot_id] == free_spots:
+                return None
+
+    def get_emptiest_parking_lot_id(self) -> Optional[int]:
+        """
+        Return id of parking-lot with most free four-wheeler parking-spots,
+        lowest id on ties, None if all parking-lots are full.
+        """
+        while self._stale_lot_ids:
+            self.update_capacity(self._stale_lot_ids.pop())
+        if not self._parking_lots_by_capacity:
+            return None
+        negative_free_spots, parking_lot_id = \
+            next(iter(self._parking_lots_by_capacity))
+        if negative_free_spots >= 0:
+            return None
+        return parking_lot_id
+
+    def leave(self, parking_spot_id: int, parking_lot_id: int) -> bool:
+        """
+        Free up parking-spot of given parking-lot.
+        """
+        parking_lot = self._parking_lots.get(parking_lot_id)
+        if parking_lot is None:
+            return False
+        return bool(parking_lot.free_up_parking_spot(parking_spot_id))
@@ -1,13 +1,56 @@
-from abc import ABC
+from abc import ABC, abstractmethod
 import itertools
 
 from parking_lot.constants import ParkingSpotType
 
 
-class ParkingSpot(ABC):
+class BaseParkingSpot(ABC):
+    """
+    Interface of a parking-spot, holding no state of its own.
+    """
+    __slots__ = ()
+
+    @property
+    @abstractmethod
+    def id_(self):
+        pass
+
+    @abstractmethod
+    def is_free(self):
+        pass
+
+    @property
+    @abstractmethod
+    def vehicle(self):
+        pass
+
+    @property
+    @abstractmethod
+    def parking_spot_type(self):
+        pass
+
+    @abstractmethod
+    def occupy_spot(self, vehicle) -> None:
+        """
+        Occupy parking-spot.
+        """
+        pass
+
+    @abstractmethod
+    def free_up_spot(self) -> None:
+        """
+        Free up parking-spot.
+        """
+        pass
+
+
+class ParkingSpot(BaseParkingSpot):
     spot_counter = itertools.count(start=1)
-    def __init__(self, parking_spot_type):
-        self._id = next(ParkingSpot.spot_counter)
+    __slots__ = ('_id', '_free', '_vehicle', '_parking_spot_type')
+
+    def __init__(self, parking_spot_type, spot_id: int = None):
+        self._id = spot_id if spot_id is not None \
+            else next(ParkingSpot.spot_counter)
         self._free = True
         self._vehicle = None
         self._parking_spot_type = parking_spot_type
@@ -43,5 +86,79 @@ class ParkingSpot(ABC):
 
 
 class FourWheelerSpot(ParkingSpot):
-    def __init__(self):
-        super().__init__(ParkingSpotType.FOUR_WHEELER)
+    __slots__ = ()
+
+    def __init__(self, spot_id: int = None):
+        super().__init__(ParkingSpotType.FOUR_WHEELER, spot_id)
+
+
+class TwoWheelerSpot(ParkingSpot):
+    __slots__ = ()
+
+    def __init__(self, spot_id: int = None):
+        super().__init__(ParkingSpotType.TWO_WHEELER, spot_id)
+
+
+class LargeSpot(ParkingSpot):
+    __slots__ = ()
+
+    def __init__(self, spot_id: int = None):
+        super().__init__(ParkingSpotType.LARGE, spot_id)
+
+
+class HeavySpot(ParkingSpot):
+    __slots__ = ()
+
+    def __init__(self, spot_id: int = None):
+        super().__init__(ParkingSpotType.HEAVY, spot_id)
+
+
+# parking-spot type -> parking-spot class
+PARKING_SPOTS = {
+    ParkingSpotType.FOUR_WHEELER: FourWheelerSpot,
+    ParkingSpotType.TWO_WHEELER: TwoWheelerSpot,
+    ParkingSpotType.LARGE: LargeSpot,
+    ParkingSpotType.HEAVY: HeavySpot,
+}
+
+
+class ParkingSpotView(BaseParkingSpot):
+    """
+    Lightweight parking-spot backed by a columnar spot store.
+    State is read from and written to the store's arrays,
+    view itself only remembers its position.
+    """
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def id_(self):
+        return self._index + 1
+
+    def is_free(self):
+        return not self._store._occupancy[self._index]
+
+    @property
+    def vehicle(self):
+        return self._store._vehicles[self._index]
+
+    @property
+    def parking_spot_type(self):
+        return ParkingSpotType(self._store._spot_types[self._index])
+
+    def occupy_spot(self, vehicle) -> None:
+        """
+        Occupy parking-spot.
+        """
+        self._store._vehicles[self._index] = vehicle
+        self._store._occupancy[self._index] = 1
+
+    def free_up_spot(self) -> None:
+        """
+        Free up parking-spot.
+        """
+        self._store._vehicles[self._index] = None
+        self._store._occupancy[self._index] = 0
@@ -1,6 +1,7 @@
 from abc import ABC
 import itertools
 from datetime import datetime
+import time
 
 from parking_lot.constants import ParkingSpotType
 
@@ -12,28 +13,79 @@ class ParkingTicket(ABC):
     Parking ticket instance is designed to be 
     garbage collected on instance of exit of 
     a vehicle. So no clean up functions are 
-    supported.
+    supported, visit history is kept by parking-lot's
+    ticket ledger.
     """
     ticket_counter = itertools.count(start=1)
     def __init__(
-        self, parking_spot_type: ParkingSpotType
+        self, parking_spot_type: ParkingSpotType,
+        ticket_id: int = None, entry_time_ns: int = None
     ):
-        self._id = next(ParkingTicket.ticket_counter)
+        # explicit id and entry time re-issue a restored ticket
+        self._id = ticket_id if ticket_id is not None \
+            else next(ParkingTicket.ticket_counter)
         self._parking_spot_type = parking_spot_type
-        self._entry_time = datetime.now()
+        # datetime is built only when asked for
+        self._entry_time_ns = entry_time_ns if entry_time_ns is not None \
+            else time.time_ns()
 
     @property
     def id_(self):
         return self._id
 
+    @classmethod
+    def last_issued_ticket_id(cls) -> int:
+        """
+        Return id of most recent ticket issued, 0 if none.
+        """
+        ticket_id = next(ParkingTicket.ticket_counter)
+        ParkingTicket.ticket_counter = itertools.count(start=ticket_id)
+        return ticket_id - 1
+
+    @classmethod
+    def skip_ticket_ids(cls, last_ticket_id: int) -> None:
+        """
+        Make sure newly issued tickets get ids above given one.
+        """
+        ParkingTicket.ticket_counter = itertools.count(
+            start=max(last_ticket_id + 1, next(ParkingTicket.ticket_counter)))
+
     @property
     def parking_spot_type(self):
         return self._parking_spot_type
 
     @property
-    def entry_time(self):
-        return self._entry_time
+    def entry_time_ns(self) -> int:
+        return self._entry_time_ns
+
+    @property
+    def entry_time(self) -> datetime:
+        return datetime.fromtimestamp(self._entry_time_ns / 1e9)
 
 class FourWheelerParkingTicket(ParkingTicket):
-    def __init__(self):
-        super().__init__(ParkingSpotType.FOUR_WHEELER)
+    def __init__(self, ticket_id: int = None, entry_time_ns: int = None):
+        super().__init__(
+            ParkingSpotType.FOUR_WHEELER, ticket_id, entry_time_ns)
+
+class TwoWheelerParkingTicket(ParkingTicket):
+    def __init__(self, ticket_id: int = None, entry_time_ns: int = None):
+        super().__init__(
+            ParkingSpotType.TWO_WHEELER, ticket_id, entry_time_ns)
+
+class LargeParkingTicket(ParkingTicket):
+    def __init__(self, ticket_id: int = None, entry_time_ns: int = None):
+        super().__init__(
+            ParkingSpotType.LARGE, ticket_id, entry_time_ns)
+
+class HeavyParkingTicket(ParkingTicket):
+    def __init__(self, ticket_id: int = None, entry_time_ns: int = None):
+        super().__init__(
+            ParkingSpotType.HEAVY, ticket_id, entry_time_ns)
+
+# parking-spot type -> parking-ticket class
+PARKING_TICKETS = {
+    ParkingSpotType.FOUR_WHEELER: FourWheelerParkingTicket,
+    ParkingSpotType.TWO_WHEELER: TwoWheelerParkingTicket,
+    ParkingSpotType.LARGE: LargeParkingTicket,
+    ParkingSpotType.HEAVY: HeavyParkingTicket,
+}
@@ -0,0 +1,383 @@
+"""
+Persistence of parking-lot state across restarts.
+
+Snapshot: compact binary image of parking-spots per type and parked
+vehicles(parking-spot, registration number, color, vehicle type,
+ticket), read back through mmap.
+Journal: append-only log of PARK/UNPARK events written with group
+commit, i.e. one fsync per group of events.
+
+On restart last snapshot is loaded and only journal records written
+after it are replayed.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterator, Tuple
+
+from parking_lot.constants import ParkingLotEvent, ParkingSpotType, VehicleType
+from parking_lot.parking_lot import FourWheelerParkingLot
+from parking_lot.parking_lot_builder import (
+    FourWheelerParkingLotBuilder, ParkingLotBuilder, ParkingLotDirector
+)
+from parking_lot.parking_ticket import ParkingTicket
+from parking_lot.vehicle import VEHICLES, Vehicle
+
+SNAPSHOT_MAGIC = b'PLSNAP2\n'
+# magic, parked vehicles, journal offset, last ticket id,
+# spots of every parking-spot type(in ParkingSpotType order)
+SNAPSHOT_HEADER = struct.Struct('<8sqqq' + 'q' * len(ParkingSpotType))
+# spot id, ticket id, entry time ns, plate length, color length, vehicle type
+SNAPSHOT_RECORD = struct.Struct('<qqqHBB')
+
+# four-wheeler only snapshots, still readable
+SNAPSHOT_MAGIC_V1 = b'PLSNAP1\n'
+# magic, max spots, parked vehicles, journal offset, last ticket id
+SNAPSHOT_HEADER_V1 = struct.Struct('<8sqqqq')
+# spot id, ticket id, entry time ns, plate length, color length
+SNAPSHOT_RECORD_V1 = struct.Struct('<qqqHB')
+
+JOURNAL_MAGIC = b'PLJRNL1\n'
+# event(low 4 bits) and vehicle type(high 4 bits, 0 for cars, so
+# journals of four-wheeler only lots read the same), spot id,
+# ticket id, time ns, plate length, color length
+JOURNAL_RECORD = struct.Struct('<BqqqHB')
+
+
+def _pack_event(event: ParkingLotEvent, vehicle_type: VehicleType) -> int:
+    return event.value | (vehicle_type.value - VehicleType.CAR.value) << 4
+
+def _unpack_event(value: int) -> Tuple[ParkingLotEvent, VehicleType]:
+    return ParkingLotEvent(value & 0xf), VehicleType((value >> 4) + VehicleType.CAR.value)
+
+
+class PersistenceError(Exception):
+    pass
+
+
+def write_snapshot(
+    parking_lot: FourWheelerParkingLot, path: str,
+    journal: 'ParkingLotJournal' = None
+) -> None:
+    """
+    Write snapshot of parking-lot atomically.
+    If journal is given, it is committed first and snapshot
+    remembers journal's position, so restore replays only
+    events logged after the snapshot.
+    """
+    journal_offset = 0
+    if journal is not None:
+        journal.commit()
+        journal_offset = journal.tell()
+
+    vehicles = sorted(
+        parking_lot.parked_vehicles.values(),
+        key=lambda vehicle: vehicle.parking_spot.id_
+    )
+    last_ticket_id = ParkingTicket.last_issued_ticket_id()
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, len(vehicles), journal_offset, last_ticket_id,
+            *(parking_lot.max_spots(spot_type) for spot_type in ParkingSpotType)
+        ))
+        for vehicle in vehicles:
+            registration_number = vehicle.registration_number.encode()
+            color = vehicle.color.encode()
+            f.write(SNAPSHOT_RECORD.pack(
+                vehicle.parking_spot.id_, vehicle.ticket.id_,
+                vehicle.ticket.entry_time_ns,
+                len(registration_number), len(color), vehicle.type_.value
+            ))
+            f.write(registration_number)
+            f.write(color)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def read_snapshot(
+    path: str
+) -> Tuple[Dict[ParkingSpotType, int], int, int, list]:
+    """
+    Read snapshot through mmap.
+    Return parking-spots per type, journal offset, last issued ticket
+    id and list of (spot id, ticket id, entry time ns, registration
+    number, color, vehicle type).
+    """
+    with open(path, 'rb') as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        magic = buf[:len(SNAPSHOT_MAGIC)]
+        if magic == SNAPSHOT_MAGIC:
+            __, parked, journal_offset, last_ticket_id, *max_spots = \
+                SNAPSHOT_HEADER.unpack_from(buf, 0)
+            spot_counts = dict(zip(ParkingSpotType, max_spots))
+            offset = SNAPSHOT_HEADER.size
+            record_struct = SNAPSHOT_RECORD
+        elif magic == SNAPSHOT_MAGIC_V1:
+            __, max_spots, parked, journal_offset, last_ticket_id = \
+                SNAPSHOT_HEADER_V1.unpack_from(buf, 0)
+            spot_counts = {ParkingSpotType.FOUR_WHEELER: max_spots}
+            offset = SNAPSHOT_HEADER_V1.size
+            record_struct = SNAPSHOT_RECORD_V1
+        else:
+            raise PersistenceError(f"{path} is not a parking-lot snapshot")
+
+        records = []
+        for __ in range(parked):
+            spot_id, ticket_id, entry_time_ns, plate_len, color_len, *vehicle_type = \
+                record_struct.unpack_from(buf, offset)
+            offset += record_struct.size
+            registration_number = buf[offset:offset + plate_len].decode()
+            offset += plate_len
+            color = buf[offset:offset + color_len].decode()
+            offset += color_len
+            records.append((
+                spot_id, ticket_id, entry_time_ns, registration_number, color,
+                VehicleType(vehicle_type[0]) if vehicle_type else VehicleType.CAR
+            ))
+    return spot_counts, journal_offset, last_ticket_id, records
+
+def read_snapshot_journal_offset(path: str) -> int:
+    """
+    Return journal offset snapshot was taken at, reading its header only.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(max(SNAPSHOT_HEADER.size, SNAPSHOT_HEADER_V1.size))
+    magic = header[:len(SNAPSHOT_MAGIC)]
+    if magic == SNAPSHOT_MAGIC and len(header) >= SNAPSHOT_HEADER.size:
+        return SNAPSHOT_HEADER.unpack_from(header)[2]
+    if magic == SNAPSHOT_MAGIC_V1 and len(header) >= SNAPSHOT_HEADER_V1.size:
+        return SNAPSHOT_HEADER_V1.unpack_from(header)[3]
+    raise PersistenceError(f"{path} is not a parking-lot snapshot")
+
+
+class ParkingLotJournal:
+    """
+    Append-only journal of parking-lot events, used as
+    parking-lot event listener.
+    Records are buffered and written with one fsync per group:
+    once group_size records are pending or group_interval seconds
+    passed since last commit. A background thread commits a group
+    left pending by a burst once group_interval passes, so records
+    wait at most that long while parking-lot is idle. Up to one
+    group of events can be lost on a crash.
+    Journal is checked for a torn tail from offset on, records
+    before it(e.g. up to snapshot restored) being known complete.
+    """
+    def __init__(
+        self, path: str, group_size: int = 256,
+        group_interval: float = 0.05, truncate: bool = False,
+        offset: int = 0
+    ):
+        self._path = path
+        self._group_size = group_size
+        self._group_interval = group_interval
+        self._file = open(path, 'wb' if truncate else 'ab')
+        # cut torn record left by a crash, records appended
+        # after it would never be read back
+        end = _journal_end(path, offset)
+        if end < self._file.tell():
+            self._file.truncate(end)
+            self._file.seek(end)
+        if self._file.tell() == 0:
+            self._file.write(JOURNAL_MAGIC)
+        self._pending = bytearray()
+        self._pending_records = 0
+        self._last_commit = time.monotonic()
+
+        # guards pending group and file, committer waits on new group
+        self._lock = threading.Lock()
+        self._group_started = threading.Condition(self._lock)
+        self._closed = False
+        self._committer = threading.Thread(
+            target=self._commit_aging_groups, daemon=True)
+        self._committer.start()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __call__(self, event: ParkingLotEvent, vehicle: Vehicle) -> None:
+        self.append(
+            event, vehicle.parking_spot.id_, vehicle.ticket.id_,
+            vehicle.ticket.entry_time_ns if event is ParkingLotEvent.PARK
+            else time.time_ns(),
+            vehicle.registration_number, vehicle.color, vehicle.type_
+        )
+
+    def append(
+        self, event: ParkingLotEvent, spot_id: int, ticket_id: int,
+        time_ns: int, registration_number: str, color: str,
+        vehicle_type: VehicleType = VehicleType.CAR
+    ) -> None:
+        """
+        Log event, committing pending group when due.
+        """
+        registration_number = registration_number.encode()
+        color = color.encode()
+        header = JOURNAL_RECORD.pack(
+            _pack_event(event, vehicle_type), spot_id, ticket_id, time_ns,
+            len(registration_number), len(color)
+        )
+        with self._lock:
+            self._pending += header
+            self._pending += registration_number
+            self._pending += color
+            self._pending_records += 1
+            if self._pending_records >= self._group_size \
+                or time.monotonic() - self._last_commit >= self._group_interval:
+                self._commit()
+            elif self._pending_records == 1:
+                self._group_started.notify()
+
+    def commit(self) -> None:
+        """
+        Write pending records and fsync journal.
+        """
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending = bytearray()
+            self._pending_records = 0
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_commit = time.monotonic()
+
+    def _commit_aging_groups(self) -> None:
+        """
+        Commit pending group once group_interval passed since
+        last commit, till journal is closed.
+        """
+        with self._lock:
+            while not self._closed:
+                if not self._pending:
+                    self._group_started.wait()
+                    continue
+                wait = self._last_commit + self._group_interval - time.monotonic()
+                if wait > 0:
+                    self._group_started.wait(min(wait, threading.TIMEOUT_MAX))
+                    continue
+                self._commit()
+
+    def tell(self) -> int:
+        """
+        Return journal size of committed records.
+        """
+        return self._file.tell()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._group_started.notify()
+            self._commit()
+            self._file.close()
+        self._committer.join()
+
+
+def iter_journal(path: str, offset: int = 0) -> Iterator[tuple]:
+    """
+    Iterate journal records written from offset onwards as
+    (event, spot id, ticket id, time ns, registration number, color,
+    vehicle type).
+    Torn record at journal's tail is ignored.
+    """
+    for __, record in _scan_journal(path, offset):
+        yield record
+
+def _scan_journal(path: str, offset: int = 0) -> Iterator[Tuple[int, tuple]]:
+    """
+    Iterate (offset past record, record) of complete journal records.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        if buf[:len(JOURNAL_MAGIC)] != JOURNAL_MAGIC:
+            raise PersistenceError(f"{path} is not a parking-lot journal")
+        offset = max(offset, len(JOURNAL_MAGIC))
+        while offset + JOURNAL_RECORD.size <= len(buf):
+            event, spot_id, ticket_id, time_ns, plate_len, color_len = \
+                JOURNAL_RECORD.unpack_from(buf, offset)
+            end = offset + JOURNAL_RECORD.size + plate_len + color_len
+            if end > len(buf):
+                break
+            plate_start = offset + JOURNAL_RECORD.size
+            registration_number = buf[plate_start:plate_start + plate_len].decode()
+            color = buf[plate_start + plate_len:end].decode()
+            offset = end
+            event, vehicle_type = _unpack_event(event)
+            yield end, (
+                event, spot_id, ticket_id, time_ns,
+                registration_number, color, vehicle_type
+            )
+
+def _journal_end(path: str, offset: int = 0) -> int:
+    """
+    Return offset past journal's last complete record, walking
+    record headers from offset on, 0 if journal has not even its magic.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) < len(JOURNAL_MAGIC):
+        return 0
+    with open(path, 'rb') as f, \
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        end = min(max(offset, len(JOURNAL_MAGIC)), len(buf))
+        while end + JOURNAL_RECORD.size <= len(buf):
+            *__, plate_len, color_len = JOURNAL_RECORD.unpack_from(buf, end)
+            record_end = end + JOURNAL_RECORD.size + plate_len + color_len
+            if record_end > len(buf):
+                break
+            end = record_end
+    return end
+
+def replay_journal(
+    parking_lot: FourWheelerParkingLot, path: str, offset: int = 0
+) -> int:
+    """
+    Apply journal records from offset onwards to parking-lot,
+    parking every vehicle in its journaled parking-spot.
+    Return number of records applied.
+    """
+    applied = 0
+    for event, spot_id, ticket_id, time_ns, registration_number, color, \
+            vehicle_type in iter_journal(path, offset):
+        if event is ParkingLotEvent.PARK:
+            parking_lot.restore_parked_vehicle(
+                VEHICLES[vehicle_type](registration_number, color),
+                spot_id, ticket_id, time_ns)
+        elif event is ParkingLotEvent.UNPARK:
+            parking_lot.free_up_parking_spot(spot_id)
+        applied += 1
+    return applied
+
+def restore_parking_lot(
+    snapshot_path: str, journal_path: str = None,
+    parking_lot_builder: ParkingLotBuilder = None
+) -> FourWheelerParkingLot:
+    """
+    Rebuild parking-lot from snapshot and the journal tail written after it.
+    """
+    spot_counts, journal_offset, last_ticket_id, records = \
+        read_snapshot(snapshot_path)
+    ParkingTicket.skip_ticket_ids(last_ticket_id)
+    director = ParkingLotDirector(
+        parking_lot_builder or FourWheelerParkingLotBuilder())
+    director.build_parking_lot(
+        spot_counts.get(ParkingSpotType.FOUR_WHEELER, 0), spot_counts=spot_counts)
+    parking_lot = director.get_parking_lot()
+
+    for spot_id, ticket_id, entry_time_ns, registration_number, color, \
+            vehicle_type in records:
+        parking_lot.restore_parked_vehicle(
+            VEHICLES[vehicle_type](registration_number, color),
+            spot_id, ticket_id, entry_time_ns)
+    if journal_path:
+        replay_journal(parking_lot, journal_path, journal_offset)
+    return parking_lot
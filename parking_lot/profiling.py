@@ -0,0 +1,161 @@
+"""
+Profiling of command playback.
+
+Two modes:
+    1. full: time of every command split into phases(parse, execute,
+       format, write, plus cmd.Cmd dispatch in the shell) per command
+       type, cProfile stats and sampled stacks,
+    2. sample: sampled stacks only, cheap enough for multi-million
+       line logs.
+Sampled stacks are written in collapsed format('frame;frame;frame count'),
+as read by flamegraph tools.
+"""
+from collections import defaultdict
+import cProfile
+import os
+import signal
+import sys
+import threading
+from typing import Dict, List, TextIO
+
+PHASES = ('dispatch', 'parse', 'execute', 'format', 'write')
+
+
+class StackSampler:
+    """
+    Sample stack of the main thread at fixed interval of CPU time.
+    Uses SIGPROF timer where available, as a sampling thread only
+    gets to run when main thread releases the GIL, mostly on I/O,
+    which skews samples. Falls back to a sampling thread elsewhere.
+    """
+    def __init__(self, interval: float = 0.005):
+        self._interval = interval
+        self._thread_id = threading.main_thread().ident
+        self._stacks: Dict[str, int] = defaultdict(int)
+        self._stopped = threading.Event()
+        self._sampler: threading.Thread = None
+        self._previous_handler = None
+
+    @property
+    def samples(self) -> int:
+        return sum(self._stacks.values())
+
+    def start(self) -> None:
+        if hasattr(signal, 'setitimer') \
+            and threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self._interval, self._interval)
+            return
+        self._stopped.clear()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        if self._previous_handler is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._previous_handler = None
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _on_signal(self, signum, frame) -> None:
+        self._record(frame)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def _record(self, frame) -> None:
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        self._stacks[';'.join(reversed(frames))] += 1
+
+    def write_collapsed(self, file: TextIO) -> None:
+        for stack, count in sorted(self._stacks.items()):
+            file.write(f"{stack} {count}\n")
+
+
+class CommandProfiler:
+    """
+    Profiler of a playback run.
+    Output is written to <output_prefix>.collapsed(sampled stacks),
+    <output_prefix>.pstats(cProfile, full mode) and
+    <output_prefix>.phases.txt(phase timings, full mode).
+    """
+    FULL = 'full'
+    SAMPLE = 'sample'
+
+    def __init__(
+        self, mode: str = FULL, output_prefix: str = 'parking_lot_profile',
+        interval: float = 0.005
+    ):
+        if mode not in (CommandProfiler.FULL, CommandProfiler.SAMPLE):
+            raise Exception(f"Invalid profile mode: {mode}")
+        self._mode = mode
+        self._output_prefix = output_prefix
+        self._sampler = StackSampler(interval)
+        self._profile = cProfile.Profile() if mode == CommandProfiler.FULL else None
+        # command name -> [count, ns per phase...]
+        self._timings: Dict[str, List[int]] = {}
+
+    @property
+    def is_timing_phases(self) -> bool:
+        return self._mode == CommandProfiler.FULL
+
+    def start(self) -> None:
+        self._sampler.start()
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        self._sampler.stop()
+
+    def record(self, command_name: str, **phases_ns: int) -> None:
+        """
+        Add one command's time per phase, in nanoseconds.
+        """
+        timings = self._timings.get(command_name)
+        if timings is None:
+            timings = self._timings[command_name] = [0] * (len(PHASES) + 1)
+        timings[0] += 1
+        for i, phase in enumerate(PHASES, 1):
+            timings[i] += phases_ns.get(phase, 0)
+
+    def write_phase_report(self, file: TextIO) -> None:
+        """
+        Write per command type count, total time and mean time per phase.
+        """
+        file.write(
+            f"{'command':<42}{'count':>10}{'total ms':>11}"
+            + ''.join(f"{phase + ' us':>12}" for phase in PHASES) + '\n')
+        rows = sorted(self._timings.items(), key=lambda kv: -sum(kv[1][1:]))
+        for command_name, (count, *phases_ns) in rows:
+            file.write(
+                f"{command_name:<42}{count:>10}{sum(phases_ns) / 1e6:>11.1f}"
+                + ''.join(f"{ns / count / 1e3:>12.2f}" for ns in phases_ns) + '\n')
+
+    def write_output(self) -> List[str]:
+        """
+        Write profile files.
+        Return paths written.
+        """
+        paths = [self._output_prefix + '.collapsed']
+        with open(paths[-1], 'w') as f:
+            self._sampler.write_collapsed(f)
+        if self._profile is not None:
+            paths.append(self._output_prefix + '.pstats')
+            self._profile.dump_stats(paths[-1])
+        if self.is_timing_phases:
+            paths.append(self._output_prefix + '.phases.txt')
+            with open(paths[-1], 'w') as f:
+                self.write_phase_report(f)
+        return paths
@@ -0,0 +1,558 @@
+"""
+Reservations of parking-spots for time windows, for pre-booked parking.
+
+A reservation blocks one parking-spot over [start, end) in nanoseconds
+since epoch, windows on a parking-spot never overlap. Two indexes
+answer window queries without scanning parking-spots:
+    1. per parking-spot sorted interval lists(starts and ends in
+       typed arrays): 'is parking-spot free over [t1, t2)' is one
+       bisect,
+    2. gap index: free gaps between reservations of all reserved
+       parking-spots, ordered by gap start, with max gap end per
+       chunk and a max tree over chunks: 'any parking-spot free over
+       [t1, t2)' is a gap starting by t1 and ending from t2 on,
+       found by a tree descent plus a bounded chunk scan, among
+       all gaps or gaps of parking-spots vacant now.
+Parking-spots with no reservation have no gaps and are handed out
+last, lowest first, so reservations pack into parking-spots already
+reserved and leave whole parking-spots to walk-ins.
+"""
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+from parking_lot.sorted_list import SortedList
+
+Reservation = namedtuple(
+    'Reservation',
+    ['id_', 'spot_id', 'start_ns', 'end_ns', 'registration_number']
+)
+
+# gaps before first reservation start here, after last one end here
+GAP_START = -1
+FOREVER = 2 ** 63 - 1
+# end of gaps of parking-spots taken now, in vacant parking-spots' max tree
+NO_END = -1
+
+# (time, number) packed into a single int key, ordered by time first,
+# parking-spot ids and reservation ids stay below KEY_SCALE
+KEY_SCALE = 1 << 32
+
+
+def _pack(time_ns: int, n: int) -> int:
+    return time_ns * KEY_SCALE + n
+
+def _unpack(key: int) -> Tuple[int, int]:
+    return divmod(key, KEY_SCALE)
+
+
+class GapIndex:
+    """
+    Free gaps(key, end) ordered by key, key being gap start packed
+    with parking-spot id, kept as sorted chunks like SortedList.
+    Max gap end of every chunk is kept along with a max tree over
+    chunks(one list per level), so the leftmost chunk holding a gap
+    that ends late enough is found in O(log chunks). A second set of
+    chunk maxes and max tree counts only gaps of parking-spots vacant
+    now, so the leftmost such gap is found the same way.
+    Chunks are kept small, as a chunk's max gap end is recomputed
+    whenever its max gap shrinks or leaves.
+    """
+    LOAD = 128
+
+    def __init__(self):
+        self._len = 0
+        self._keys: List[List[int]] = []
+        self._ends: List[List[int]] = []
+        # gap ends again, NO_END for gaps of parking-spots taken now
+        self._vacant_ends: List[List[int]] = []
+        # max key of every chunk
+        self._maxes: List[int] = []
+        # max trees over chunks' max gap end, of all gaps and of gaps
+        # of vacant parking-spots, chunks' max gap ends first
+        self._levels: List[List[int]] = [[]]
+        self._vacant_levels: List[List[int]] = [[]]
+
+    def __len__(self) -> int:
+        return self._len
+
+    @staticmethod
+    def _build_tree(max_ends: List[int]) -> List[List[int]]:
+        """
+        Return levels of max tree over chunks' max gap ends.
+        """
+        levels = [max_ends]
+        level = max_ends
+        while len(level) > 1:
+            level = [max(level[i:i + 2]) for i in range(0, len(level), 2)]
+            levels.append(level)
+        return levels
+
+    def _rebuild_trees(self) -> None:
+        """
+        Rebuild levels above chunks' max gap ends, after
+        chunks were added or removed.
+        """
+        self._levels = self._build_tree(self._levels[0])
+        self._vacant_levels = self._build_tree(self._vacant_levels[0])
+
+    @staticmethod
+    def _update_tree(levels: List[List[int]], pos: int, max_end: int) -> None:
+        """
+        Set max gap end of chunk and its ancestors in max tree.
+        """
+        levels[0][pos] = max_end
+        for level, parent in zip(levels, levels[1:]):
+            pos &= ~1
+            max_end = max(level[pos:pos + 2])
+            pos //= 2
+            if parent[pos] == max_end:
+                break
+            parent[pos] = max_end
+
+    @staticmethod
+    def _set_end(
+        levels: List[List[int]], ends: List[int], pos: int, idx: int, end: int
+    ) -> None:
+        """
+        Set end of gap at idx of chunk pos, keeping max tree up to date.
+        """
+        previous_end = ends[idx]
+        ends[idx] = end
+        max_end = levels[0][pos]
+        if end > max_end:
+            GapIndex._update_tree(levels, pos, end)
+        elif previous_end == max_end and end < max_end:
+            GapIndex._update_tree(levels, pos, max(ends))
+
+    def _locate(self, key: int) -> Tuple[int, int]:
+        """
+        Return (chunk, position) of key, KeyError if not present.
+        """
+        pos = bisect_left(self._maxes, key)
+        if pos < len(self._maxes):
+            keys = self._keys[pos]
+            idx = bisect_left(keys, key)
+            if keys[idx] == key:
+                return pos, idx
+        raise KeyError(key)
+
+    def add(self, key: int, end: int, vacant: bool = True) -> None:
+        """
+        Add gap, of a parking-spot vacant now unless told otherwise.
+        """
+        vacant_end = end if vacant else NO_END
+        if not self._maxes:
+            self._keys.append([key])
+            self._ends.append([end])
+            self._vacant_ends.append([vacant_end])
+            self._maxes.append(key)
+            self._levels = [[end]]
+            self._vacant_levels = [[vacant_end]]
+            self._len += 1
+            return
+
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            pos -= 1
+            idx = len(self._keys[pos])
+            self._maxes[pos] = key
+        else:
+            idx = bisect_left(self._keys[pos], key)
+        keys = self._keys[pos]
+        keys.insert(idx, key)
+        self._ends[pos].insert(idx, end)
+        self._vacant_ends[pos].insert(idx, vacant_end)
+        self._len += 1
+
+        # split chunk once it grows twice the load
+        if len(keys) > 2 * GapIndex.LOAD:
+            for chunks in (self._keys, self._ends, self._vacant_ends):
+                chunk = chunks[pos]
+                chunks.insert(pos + 1, chunk[GapIndex.LOAD:])
+                del chunk[GapIndex.LOAD:]
+            self._maxes[pos] = keys[-1]
+            self._maxes.insert(pos + 1, self._keys[pos + 1][-1])
+            for max_ends, chunks in (
+                (self._levels[0], self._ends),
+                (self._vacant_levels[0], self._vacant_ends)
+            ):
+                max_ends[pos] = max(chunks[pos])
+                max_ends.insert(pos + 1, max(chunks[pos + 1]))
+            self._rebuild_trees()
+            return
+        if end > self._levels[0][pos]:
+            self._update_tree(self._levels, pos, end)
+        if vacant_end > self._vacant_levels[0][pos]:
+            self._update_tree(self._vacant_levels, pos, vacant_end)
+
+    def discard(self, key: int) -> int:
+        """
+        Remove gap.
+        Return its end.
+        """
+        pos, idx = self._locate(key)
+        keys = self._keys[pos]
+        del keys[idx]
+        end = self._ends[pos].pop(idx)
+        vacant_end = self._vacant_ends[pos].pop(idx)
+        self._len -= 1
+        if not keys:
+            for chunks in (
+                self._keys, self._ends, self._vacant_ends, self._maxes,
+                self._levels[0], self._vacant_levels[0]
+            ):
+                del chunks[pos]
+            self._rebuild_trees()
+            return end
+        if idx == len(keys):
+            self._maxes[pos] = keys[-1]
+        if end == self._levels[0][pos]:
+            self._update_tree(self._levels, pos, max(self._ends[pos]))
+        if vacant_end == self._vacant_levels[0][pos]:
+            self._update_tree(self._vacant_levels, pos, max(self._vacant_ends[pos]))
+        return end
+
+    def set_end(self, key: int, end: int) -> None:
+        """
+        Move end of gap.
+        """
+        pos, idx = self._locate(key)
+        vacant_ends = self._vacant_ends[pos]
+        if vacant_ends[idx] != NO_END:
+            self._set_end(self._vacant_levels, vacant_ends, pos, idx, end)
+        self._set_end(self._levels, self._ends[pos], pos, idx, end)
+
+    def set_vacant(self, key: int, vacant: bool) -> None:
+        """
+        Count gap in vacant parking-spots' max tree or leave it out.
+        """
+        pos, idx = self._locate(key)
+        end = self._ends[pos][idx] if vacant else NO_END
+        self._set_end(self._vacant_levels, self._vacant_ends[pos], pos, idx, end)
+
+    def find(
+        self, key_limit: int, min_end: int, vacant_only: bool = False
+    ) -> Optional[int]:
+        """
+        Return key of a gap with key below key_limit and end
+        from min_end on, of a parking-spot vacant now if vacant_only,
+        None if there is none.
+        """
+        if vacant_only:
+            levels, chunks = self._vacant_levels, self._vacant_ends
+        else:
+            levels, chunks = self._levels, self._ends
+        if not levels[0] or levels[-1][0] < min_end:
+            return None
+        # leftmost chunk with a gap ending late enough
+        chunk = 0
+        for level in reversed(levels[:-1]):
+            chunk *= 2
+            if level[chunk] < min_end:
+                chunk += 1
+
+        # chunks before pos have keys below key_limit only
+        pos = bisect_left(self._maxes, key_limit)
+        if chunk > pos:
+            return None
+        ends = chunks[chunk]
+        if chunk < pos:
+            stop = len(ends)
+            end = levels[0][chunk]
+        else:
+            stop = bisect_left(self._keys[chunk], key_limit)
+            if not stop:
+                return None
+            end = max(ends[:stop])
+            if end < min_end:
+                return None
+        return self._keys[chunk][ends.index(end, 0, stop)]
+
+
+class SpotIdSet:
+    """
+    Set of parking-spot ids out of 1..spot_count, holding all of
+    them at first. Ids from tail on are members without being stored,
+    ids below tail are kept in a SortedList, so untouched
+    parking-spots take no memory.
+    Add and discard are O(log n), amortized over ids moving below
+    tail, lowest id is O(1).
+    """
+    def __init__(self, spot_count: int):
+        self._spot_count = spot_count
+        self._ids = SortedList()
+        self._tail = 1
+
+    def __contains__(self, spot_id: int) -> bool:
+        if spot_id < self._tail:
+            return spot_id in self._ids
+        return spot_id <= self._spot_count
+
+    def add(self, spot_id: int) -> None:
+        if spot_id < self._tail:
+            self._ids.add(spot_id)
+
+    def discard(self, spot_id: int) -> None:
+        if spot_id < self._tail:
+            self._ids.discard(spot_id)
+        elif spot_id <= self._spot_count:
+            # ids passed over stay members, stored from now on
+            for skipped_id in range(self._tail, spot_id):
+                self._ids.add(skipped_id)
+            self._tail = spot_id + 1
+
+    def first(self) -> Optional[int]:
+        """
+        Return lowest id, None if set is empty.
+        """
+        spot_id = next(iter(self._ids), None)
+        if spot_id is None and self._tail <= self._spot_count:
+            spot_id = self._tail
+        return spot_id
+
+    def resize(self, spot_count: int) -> None:
+        """
+        Hold ids out of 1..spot_count, ids added are members.
+        """
+        if spot_count < self._spot_count:
+            for spot_id in list(self._ids.irange(spot_count + 1)):
+                self._ids.discard(spot_id)
+            self._tail = min(self._tail, spot_count + 1)
+        self._spot_count = spot_count
+
+
+class ReservationBook:
+    """
+    Reservations of parking-spots 1..spot_count.
+    Reservation columns(parking-spot id, start, end) are kept in
+    typed arrays indexed by reservation id, like the ticket ledger.
+    Reservations leave the book when cancelled or once they end.
+    """
+    def __init__(self, spot_count: int):
+        self._spot_count = spot_count
+
+        # columns, by reservation id - 1, parking-spot id 0 once gone
+        self._spot_ids = array('q')
+        self._starts = array('q')
+        self._ends = array('q')
+        self._registration_numbers: List[str] = []
+        self._len = 0
+
+        # parking-spot id -> (starts, ends, reservation ids) in start order
+        self._spot_reservations: Dict[int, Tuple[array, array, array]] = {}
+        self._gaps = GapIndex()
+
+        # parking-spots taken now, parking-spots with no reservation
+        # and those of them vacant now
+        self._taken_spot_ids: Set[int] = set()
+        self._unreserved_spot_ids = SpotIdSet(spot_count)
+        self._vacant_spot_ids = SpotIdSet(spot_count)
+
+        # packed (start, reservation id) of reservations not started,
+        # packed (end, reservation id) of reservations started
+        self._pending_starts: List[int] = []
+        self._pending_ends: List[int] = []
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def spot_count(self) -> int:
+        return self._spot_count
+
+    def resize(self, spot_count: int) -> bool:
+        """
+        Take reservations for parking-spots 1..spot_count from now on.
+        Return bool, False if a parking-spot cut off has reservations.
+        """
+        if spot_count < self._spot_count:
+            if any(spot_id > spot_count for spot_id in self._spot_reservations):
+                return False
+            self._taken_spot_ids = {
+                spot_id for spot_id in self._taken_spot_ids if spot_id <= spot_count}
+        self._unreserved_spot_ids.resize(spot_count)
+        self._vacant_spot_ids.resize(spot_count)
+        self._spot_count = spot_count
+        return True
+
+    def set_spot_taken(self, spot_id: int, taken: bool) -> None:
+        """
+        Record parking-spot getting taken now or vacant again.
+        Every gap of a reserved parking-spot is updated, so it costs
+        O(log n) per reservation of the parking-spot.
+        """
+        if not 1 <= spot_id <= self._spot_count:
+            return
+        if taken:
+            self._taken_spot_ids.add(spot_id)
+        else:
+            self._taken_spot_ids.discard(spot_id)
+        intervals = self._spot_reservations.get(spot_id)
+        if intervals is None:
+            if taken:
+                self._vacant_spot_ids.discard(spot_id)
+            else:
+                self._vacant_spot_ids.add(spot_id)
+            return
+        self._gaps.set_vacant(_pack(GAP_START, spot_id), not taken)
+        for end_ns in intervals[1]:
+            self._gaps.set_vacant(_pack(end_ns, spot_id), not taken)
+
+    def get(self, reservation_id: int) -> Optional[Reservation]:
+        """
+        Return reservation, None if unknown, cancelled or ended.
+        """
+        i = reservation_id - 1
+        if not 0 <= i < len(self._spot_ids) or not self._spot_ids[i]:
+            return None
+        return Reservation(
+            reservation_id, self._spot_ids[i], self._starts[i],
+            self._ends[i], self._registration_numbers[i])
+
+    def is_spot_free(self, spot_id: int, start_ns: int, end_ns: int) -> bool:
+        """
+        Check if parking-spot has no reservation overlapping [start, end).
+        """
+        if not 1 <= spot_id <= self._spot_count or start_ns >= end_ns:
+            return False
+        intervals = self._spot_reservations.get(spot_id)
+        if intervals is None:
+            return True
+        starts, ends, __ = intervals
+        # last reservation starting before end_ns must end by start_ns
+        i = bisect_left(starts, end_ns)
+        return not i or ends[i - 1] <= start_ns
+
+    def find_free_spot(
+        self, start_ns: int, end_ns: int, vacant_only: bool = False
+    ) -> Optional[int]:
+        """
+        Return a parking-spot with no reservation overlapping
+        [start, end), one vacant now if vacant_only, None if
+        every parking-spot is booked.
+        Reserved parking-spots are tried first, then lowest one
+        with no reservation, O(log n) either way.
+        """
+        if start_ns >= end_ns:
+            return None
+        key = self._gaps.find(_pack(start_ns + 1, 0), end_ns, vacant_only)
+        if key is not None:
+            return _unpack(key)[1]
+        if vacant_only:
+            return self._vacant_spot_ids.first()
+        return self._unreserved_spot_ids.first()
+
+    def reserve(
+        self, registration_number: str, start_ns: int, end_ns: int,
+        spot_id: int = None
+    ) -> Optional[Reservation]:
+        """
+        Book given parking-spot, or any parking-spot free
+        over [start, end).
+        Return reservation, None if no parking-spot is free.
+        """
+        if spot_id is None:
+            spot_id = self.find_free_spot(start_ns, end_ns)
+            if spot_id is None:
+                return None
+        elif not self.is_spot_free(spot_id, start_ns, end_ns):
+            return None
+
+        reservation_id = len(self._spot_ids) + 1
+        self._spot_ids.append(spot_id)
+        self._starts.append(start_ns)
+        self._ends.append(end_ns)
+        self._registration_numbers.append(registration_number)
+        self._len += 1
+        heapq.heappush(self._pending_starts, _pack(start_ns, reservation_id))
+
+        intervals = self._spot_reservations.get(spot_id)
+        if intervals is None:
+            self._spot_reservations[spot_id] = (
+                array('q', [start_ns]), array('q', [end_ns]),
+                array('q', [reservation_id]))
+            self._unreserved_spot_ids.discard(spot_id)
+            self._vacant_spot_ids.discard(spot_id)
+            vacant = spot_id not in self._taken_spot_ids
+            self._gaps.add(_pack(GAP_START, spot_id), start_ns, vacant)
+            self._gaps.add(_pack(end_ns, spot_id), FOREVER, vacant)
+        else:
+            starts, ends, reservation_ids = intervals
+            i = bisect_left(starts, start_ns)
+            # gap between neighbours is split around new reservation
+            gap_start = ends[i - 1] if i else GAP_START
+            gap_end = starts[i] if i < len(starts) else FOREVER
+            self._gaps.set_end(_pack(gap_start, spot_id), start_ns)
+            self._gaps.add(
+                _pack(end_ns, spot_id), gap_end,
+                spot_id not in self._taken_spot_ids)
+            starts.insert(i, start_ns)
+            ends.insert(i, end_ns)
+            reservation_ids.insert(i, reservation_id)
+        return Reservation(
+            reservation_id, spot_id, start_ns, end_ns, registration_number)
+
+    def cancel(self, reservation_id: int) -> Optional[Reservation]:
+        """
+        Remove reservation from the book.
+        Return reservation, None if unknown, cancelled or ended.
+        """
+        reservation = self.get(reservation_id)
+        if reservation is None:
+            return None
+        spot_id = reservation.spot_id
+        self._spot_ids[reservation_id - 1] = 0
+        self._len -= 1
+
+        starts, ends, reservation_ids = self._spot_reservations[spot_id]
+        i = bisect_left(starts, reservation.start_ns)
+        gap_start = ends[i - 1] if i else GAP_START
+        del starts[i]
+        del ends[i]
+        del reservation_ids[i]
+        # gaps around reservation merge
+        gap_end = self._gaps.discard(_pack(reservation.end_ns, spot_id))
+        if starts:
+            self._gaps.set_end(_pack(gap_start, spot_id), gap_end)
+        else:
+            self._gaps.discard(_pack(GAP_START, spot_id))
+            del self._spot_reservations[spot_id]
+            self._unreserved_spot_ids.add(spot_id)
+            if spot_id not in self._taken_spot_ids:
+                self._vacant_spot_ids.add(spot_id)
+        return reservation
+
+    def pop_starting(self, until_ns: int) -> List[Reservation]:
+        """
+        Return reservations starting by until_ns, once each,
+        in start order.
+        """
+        res = []
+        pending_starts = self._pending_starts
+        until = _pack(until_ns, KEY_SCALE - 1)
+        while pending_starts and pending_starts[0] <= until:
+            __, reservation_id = _unpack(heapq.heappop(pending_starts))
+            reservation = self.get(reservation_id)
+            if reservation is not None:
+                heapq.heappush(
+                    self._pending_ends, _pack(reservation.end_ns, reservation_id))
+                res.append(reservation)
+        return res
+
+    def pop_ended(self, until_ns: int) -> List[Reservation]:
+        """
+        Remove started reservations ending by until_ns from the book.
+        Return them in end order.
+        """
+        res = []
+        pending_ends = self._pending_ends
+        until = _pack(until_ns, KEY_SCALE - 1)
+        while pending_ends and pending_ends[0] <= until:
+            __, reservation_id = _unpack(heapq.heappop(pending_ends))
+            reservation = self.cancel(reservation_id)
+            if reservation is not None:
+                res.append(reservation)
+        return res
@@ -0,0 +1,198 @@
+"""
+Discrete-event simulation of a parking-lot, for capacity planning.
+
+Visits(arrival time, dwell time) come from a trace file or are drawn
+from Poisson arrivals and log-normal dwell times, and are played
+through a real FourWheelerParkingLot by calling its API directly:
+a car arriving at a full lot is turned away, a parked car leaves after
+its dwell time. Pending departures are kept in a min-heap keyed on
+departure time, arrivals are streamed in time order and merged with
+it, so every visit costs O(log n) besides the lot's own work.
+Runs are seeded and reproducible; occupancy is tracked as time spent
+at every occupancy level, so time-weighted mean and percentiles
+are exact.
+Capacities are swept across a process pool, every capacity seeing
+the very same visits.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import math
+import random
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.vehicle import Car
+
+NS_PER_SECOND = 10 ** 9
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+
+SIMULATION_COLORS = ('White', 'Black', 'Red', 'Blue', 'Grey', 'Silver')
+
+# visits: number of visits drawn(all of trace if trace_path is given),
+# warmup_visits: first visits, while lot fills up, left out of statistics
+SimulationConfig = namedtuple(
+    'SimulationConfig',
+    ['capacity', 'visits', 'arrivals_per_hour', 'median_dwell_minutes',
+     'dwell_sigma', 'seed', 'warmup_visits', 'trace_path'],
+    defaults=(1000, 100_000, 200.0, 120.0, 0.8, 0, 0, None)
+)
+# occupancy statistics are time-weighted, over time from end of warmup
+# till last departure
+SimulationResult = namedtuple(
+    'SimulationResult',
+    ['capacity', 'arrivals', 'rejected', 'mean_occupancy', 'p95_occupancy',
+     'peak_occupancy', 'full_time_share', 'mean_dwell_minutes']
+)
+
+
+def draw_visits(config: SimulationConfig) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (arrival, dwell time) in ns of visits arriving as a Poisson
+    process, with log-normal dwell times.
+    """
+    rng = random.Random(config.seed)
+    arrivals_per_ns = config.arrivals_per_hour / NS_PER_HOUR
+    mu = math.log(config.median_dwell_minutes * NS_PER_MINUTE)
+    arrival_ns = 0.0
+    for __ in range(config.visits):
+        arrival_ns += rng.expovariate(arrivals_per_ns)
+        yield int(arrival_ns), max(1, int(rng.lognormvariate(mu, config.dwell_sigma)))
+
+def read_trace(path: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (arrival, dwell time) in ns of visits of trace file,
+    one 'arrival seconds,dwell seconds' line per visit,
+    ordered by arrival.
+    """
+    last_arrival_ns = 0
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            arrival_s, dwell_s = line.split(',')
+            arrival_ns = int(float(arrival_s) * NS_PER_SECOND)
+            if arrival_ns < last_arrival_ns:
+                raise Exception("Trace is not ordered by arrival time")
+            last_arrival_ns = arrival_ns
+            yield arrival_ns, max(1, int(float(dwell_s) * NS_PER_SECOND))
+
+def simulate(config: SimulationConfig) -> SimulationResult:
+    """
+    Play visits of config through a fresh parking-lot of config's capacity.
+    """
+    director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+    director.build_parking_lot(config.capacity)
+    parking_lot = director.get_parking_lot()
+    visits = read_trace(config.trace_path) if config.trace_path \
+        else draw_visits(config)
+
+    # (departure time, parking-spot id, registration number)
+    departures: List[Tuple[int, int, str]] = []
+    # registration numbers of cars gone, reused so plate index stays small
+    free_plates: List[str] = []
+    plates_issued = 0
+    # ns spent at every occupancy level, from end of warmup
+    occupancy_ns = [0] * (config.capacity + 1)
+    occupancy = peak_occupancy = 0
+    arrivals = rejected = dwell_ns = 0
+    now_ns = 0
+    free_up_parking_spot = parking_lot.free_up_parking_spot
+    allocate_parking_spot = parking_lot.allocate_parking_spot
+
+    def depart_until(time_ns: int) -> None:
+        nonlocal now_ns, occupancy
+        while departures and departures[0][0] <= time_ns:
+            departure_ns, spot_id, plate = heapq.heappop(departures)
+            occupancy_ns[occupancy] += departure_ns - now_ns
+            now_ns = departure_ns
+            free_up_parking_spot(spot_id)
+            free_plates.append(plate)
+            occupancy -= 1
+        occupancy_ns[occupancy] += time_ns - now_ns
+        now_ns = time_ns
+
+    for visit, (arrival_ns, visit_dwell_ns) in enumerate(visits):
+        depart_until(arrival_ns)
+        if visit == config.warmup_visits:
+            # statistics start here
+            occupancy_ns = [0] * (config.capacity + 1)
+            peak_occupancy = occupancy
+        if free_plates:
+            plate = free_plates.pop()
+        else:
+            plates_issued += 1
+            plate = f"SIM-{plates_issued:08d}"
+        car = Car(plate, SIMULATION_COLORS[visit % len(SIMULATION_COLORS)])
+        is_counted = visit >= config.warmup_visits
+        if not allocate_parking_spot(car):
+            free_plates.append(plate)
+            if is_counted:
+                arrivals += 1
+                rejected += 1
+            continue
+        heapq.heappush(
+            departures, (arrival_ns + visit_dwell_ns, car.parking_spot.id_, plate))
+        occupancy += 1
+        peak_occupancy = max(peak_occupancy, occupancy)
+        if is_counted:
+            arrivals += 1
+            dwell_ns += visit_dwell_ns
+    if departures:
+        depart_until(max(departure[0] for departure in departures))
+    return _summarize(config, occupancy_ns, arrivals, rejected, peak_occupancy, dwell_ns)
+
+def _summarize(
+    config: SimulationConfig, occupancy_ns: List[int],
+    arrivals: int, rejected: int, peak_occupancy: int, dwell_ns: int
+) -> SimulationResult:
+    total_ns = sum(occupancy_ns)
+    mean_occupancy = p95_occupancy = full_time_share = 0
+    if total_ns:
+        mean_occupancy = sum(
+            level * level_ns for level, level_ns in enumerate(occupancy_ns)) / total_ns
+        full_time_share = occupancy_ns[config.capacity] / total_ns
+        cumulative_ns = 0
+        for level, level_ns in enumerate(occupancy_ns):
+            cumulative_ns += level_ns
+            if cumulative_ns >= 0.95 * total_ns:
+                p95_occupancy = level
+                break
+    parked = arrivals - rejected
+    return SimulationResult(
+        config.capacity, arrivals, rejected, mean_occupancy, p95_occupancy,
+        peak_occupancy, full_time_share,
+        dwell_ns / parked / NS_PER_MINUTE if parked else 0.0
+    )
+
+def sweep_capacities(
+    config: SimulationConfig, capacities: List[int],
+    max_workers: Optional[int] = None
+) -> List[SimulationResult]:
+    """
+    Simulate every capacity across a process pool, max_workers=1
+    simulates serially in this process.
+    Return results in capacities' order.
+    """
+    configs = [config._replace(capacity=capacity) for capacity in capacities]
+    if max_workers == 1:
+        return [simulate(config) for config in configs]
+    with ProcessPoolExecutor(max_workers) as executor:
+        return list(executor.map(simulate, configs))
+
+def write_simulation_report(results: List[SimulationResult], out: TextIO) -> None:
+    """
+    Write one line of statistics per capacity simulated.
+    """
+    out.write(
+        f"{'slots':>8}{'arrivals':>11}{'rejected':>10}{'mean occ':>10}"
+        f"{'p95 occ':>9}{'peak':>7}{'full':>8}{'dwell':>9}\n")
+    for result in results:
+        rejection_rate = result.rejected / result.arrivals if result.arrivals else 0
+        out.write(
+            f"{result.capacity:>8}{result.arrivals:>11}{rejection_rate:>10.2%}"
+            f"{result.mean_occupancy:>10.1f}{result.p95_occupancy:>9}"
+            f"{result.peak_occupancy:>7}{result.full_time_share:>8.1%}"
+            f"{result.mean_dwell_minutes:>8.1f}m\n")
@@ -0,0 +1,124 @@
+from bisect import bisect_left
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List
+
+
+class SortedList:
+    """
+    Sorted collection of unique values kept as a list of
+    sorted chunks, along with max value of every chunk.
+    Add and discard are O(log n) bisects plus a memmove bounded
+    by chunk size, in-order iteration from any position costs
+    O(n / chunk size) to locate the start and O(1) per value after.
+    Memory grows with number of values only.
+    """
+    LOAD = 1000
+
+    def __init__(self, iterable: Iterable = ()):
+        self._len = 0
+        self._lists: List[list] = []
+        self._maxes: list = []
+        for value in iterable:
+            self.add(value)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._lists)
+
+    def __contains__(self, value: Any) -> bool:
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        sub_list = self._lists[pos]
+        idx = bisect_left(sub_list, value)
+        return sub_list[idx] == value
+
+    def add(self, value: Any) -> None:
+        """
+        Add value, no-op if already present.
+        """
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._len += 1
+            return
+
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._lists[pos].append(value)
+            self._maxes[pos] = value
+        else:
+            sub_list = self._lists[pos]
+            idx = bisect_left(sub_list, value)
+            if sub_list[idx] == value:
+                return
+            sub_list.insert(idx, value)
+        self._len += 1
+
+        # split chunk once it grows twice the load
+        sub_list = self._lists[pos]
+        if len(sub_list) > 2 * SortedList.LOAD:
+            half = sub_list[SortedList.LOAD:]
+            del sub_list[SortedList.LOAD:]
+            self._maxes[pos] = sub_list[-1]
+            self._lists.insert(pos + 1, half)
+            self._maxes.insert(pos + 1, half[-1])
+
+    def discard(self, value: Any) -> bool:
+        """
+        Remove value if present.
+        Return bool, if value was removed.
+        """
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        sub_list = self._lists[pos]
+        idx = bisect_left(sub_list, value)
+        if sub_list[idx] != value:
+            return False
+
+        del sub_list[idx]
+        self._len -= 1
+        if not sub_list:
+            del self._lists[pos]
+            del self._maxes[pos]
+        elif idx == len(sub_list):
+            self._maxes[pos] = sub_list[-1]
+        return True
+
+    def irange(self, minimum: Any) -> Iterator:
+        """
+        Iterate values from minimum onwards in sorted order.
+        Locating minimum is O(log n), O(1) per value after.
+        """
+        pos = bisect_left(self._maxes, minimum)
+        if pos == len(self._maxes):
+            return iter(())
+        sub_list = self._lists[pos]
+        return chain(
+            islice(sub_list, bisect_left(sub_list, minimum), None),
+            chain.from_iterable(islice(self._lists, pos + 1, None))
+        )
+
+    def islice(self, start: int = 0, stop: int = None) -> Iterator:
+        """
+        Iterate values at positions [start, stop) in sorted order.
+        """
+        stop = self._len if stop is None else min(stop, self._len)
+        if start >= stop:
+            return iter(())
+
+        # locate chunk holding start position
+        pos = 0
+        while start >= len(self._lists[pos]):
+            start -= len(self._lists[pos])
+            stop -= len(self._lists[pos])
+            pos += 1
+        values = chain(
+            islice(self._lists[pos], start, None),
+            chain.from_iterable(islice(self._lists, pos + 1, None))
+        )
+        return islice(values, stop - start)
@@ -0,0 +1,431 @@
+from abc import ABC, abstractmethod
+from array import array
+import heapq
+from typing import Dict, List, Sequence
+
+from parking_lot.sorted_list import SortedList
+
+
+class SpotAllocator(ABC):
+    """
+    Free parking-spot bookkeeping of a parking-lot, and
+    its allocation policy: which free parking-spot goes next.
+    Spots are addressed by their index(zero based)
+    in parking-lot's list of parking-spots.
+    """
+    # if free pool can grow or shrink by resize
+    resizable = False
+
+    @abstractmethod
+    def acquire(self, gate: int = None) -> int:
+        """
+        Take next free parking-spot out of the free pool,
+        for a vehicle arriving at given gate(if known).
+        Return parking-spot's index, -1 if none available.
+        """
+        pass
+
+    def acquire_many(self, count: int, gate: int = None) -> List[int]:
+        """
+        Take next count free parking-spots out of the free pool, in the
+        order acquire would hand them out one by one.
+        Return their indexes, fewer than count if pool runs out.
+        """
+        res = []
+        for __ in range(count):
+            index = self.acquire(gate)
+            if index < 0:
+                break
+            res.append(index)
+        return res
+
+    @abstractmethod
+    def release(self, index: int) -> None:
+        """
+        Return parking-spot to the free pool.
+        """
+        pass
+
+    @abstractmethod
+    def claim(self, index: int) -> bool:
+        """
+        Take given parking-spot out of the free pool,
+        caller makes sure parking-spot is free.
+        Return bool, if parking-spot got claimed.
+        """
+        pass
+
+    @abstractmethod
+    def peek(self) -> int:
+        """
+        Return index of parking-spot next acquire would hand out,
+        -1 if none available.
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def resize(self, max_spots: int) -> None:
+        """
+        Add parking-spots to, or retire highest numbered ones from
+        the free pool, caller makes sure retired parking-spots are free.
+        """
+        raise Exception("Spot allocator can not be resized")
+
+class MinHeapSpotAllocator(SpotAllocator):
+    """
+    Hand out lowest numbered free parking-spot first.
+    Parking-spots never handed out are tracked by a single
+    watermark, released parking-spots are kept in a min-heap,
+    so acquire and release are O(log n) and memory grows
+    only with parking-spots released back.
+    Spots claimed out of order stay in the heap, marked
+    claimed, and are skipped once they surface.
+    Added parking-spots only move the watermark's limit.
+    """
+    resizable = True
+
+    def __init__(self, max_spots: int):
+        self._max_spots = max_spots
+        # spots from this index onwards were never handed out
+        self._next_untouched_spot = 0
+        # released spots, all below the watermark
+        self._free_spots = []
+        # spots in heap taken by claim
+        self._claimed_spots = set()
+
+    def _drop_claimed_spots(self) -> None:
+        while self._free_spots and self._free_spots[0] in self._claimed_spots:
+            self._claimed_spots.remove(heapq.heappop(self._free_spots))
+
+    def acquire(self, gate: int = None) -> int:
+        if self._claimed_spots:
+            self._drop_claimed_spots()
+        if self._free_spots:
+            return heapq.heappop(self._free_spots)
+        if self._next_untouched_spot < self._max_spots:
+            self._next_untouched_spot += 1
+            return self._next_untouched_spot - 1
+        return -1
+
+    def acquire_many(self, count: int, gate: int = None) -> List[int]:
+        free_spots = self._free_spots
+        if count < len(free_spots):
+            # unmirrored acquire, subclasses map the whole list
+            acquire = MinHeapSpotAllocator.acquire
+            res = [acquire(self) for __ in range(count)]
+            # claimed spots in heap may leave pool short
+            return [index for index in res if index >= 0]
+        # burst empties the heap: one sort, then a run off the watermark
+        if self._claimed_spots:
+            res = sorted(i for i in free_spots if i not in self._claimed_spots)
+            self._claimed_spots.clear()
+        else:
+            res = sorted(free_spots)
+        free_spots.clear()
+        start = self._next_untouched_spot
+        self._next_untouched_spot = min(self._max_spots, start + count - len(res))
+        res.extend(range(start, self._next_untouched_spot))
+        return res
+
+    def release(self, index: int) -> None:
+        if index in self._claimed_spots:
+            # still sitting in heap
+            self._claimed_spots.remove(index)
+            return
+        heapq.heappush(self._free_spots, index)
+
+    def claim(self, index: int) -> bool:
+        if not 0 <= index < self._max_spots:
+            return False
+        if index >= self._next_untouched_spot:
+            # spots skipped over by watermark become released spots
+            for i in range(self._next_untouched_spot, index):
+                heapq.heappush(self._free_spots, i)
+            self._next_untouched_spot = index + 1
+            return True
+        if index in self._claimed_spots:
+            return False
+        if self._free_spots and self._free_spots[0] == index:
+            heapq.heappop(self._free_spots)
+        else:
+            # below watermark a free spot is always in heap
+            self._claimed_spots.add(index)
+        return True
+
+    def peek(self) -> int:
+        if self._claimed_spots:
+            self._drop_claimed_spots()
+        if self._free_spots:
+            return self._free_spots[0]
+        if self._next_untouched_spot < self._max_spots:
+            return self._next_untouched_spot
+        return -1
+
+    def __len__(self) -> int:
+        return len(self._free_spots) - len(self._claimed_spots) \
+            + self._max_spots - self._next_untouched_spot
+
+    def resize(self, max_spots: int) -> None:
+        if max_spots < self._next_untouched_spot:
+            # retired spots below watermark sit in heap
+            self._next_untouched_spot = max_spots
+            self._claimed_spots = {i for i in self._claimed_spots if i < max_spots}
+            self._free_spots = [i for i in self._free_spots if i < max_spots]
+            heapq.heapify(self._free_spots)
+        self._max_spots = max_spots
+
+class FarEndFirstSpotAllocator(MinHeapSpotAllocator):
+    """
+    Hand out highest numbered free parking-spot first, filling
+    parking-lot from its far end. Same bookkeeping as
+    MinHeapSpotAllocator, over mirrored indexes.
+    """
+    # mirrored indexes move with size
+    resizable = False
+
+    def _mirror(self, index: int) -> int:
+        return self._max_spots - 1 - index if index >= 0 else -1
+
+    def acquire(self, gate: int = None) -> int:
+        return self._mirror(super().acquire())
+
+    def acquire_many(self, count: int, gate: int = None) -> List[int]:
+        return [self._mirror(index) for index in super().acquire_many(count)]
+
+    def release(self, index: int) -> None:
+        super().release(self._mirror(index))
+
+    def claim(self, index: int) -> bool:
+        return super().claim(self._mirror(index))
+
+    def peek(self) -> int:
+        return self._mirror(super().peek())
+
+    def resize(self, max_spots: int) -> None:
+        SpotAllocator.resize(self, max_spots)
+
+class NearestToGateSpotAllocator(SpotAllocator):
+    """
+    Hand out free parking-spot nearest to the gate vehicle
+    arrived at(gate 0 if not known), lowest numbered one on ties.
+    Every gate keeps a min-heap of free parking-spots keyed on
+    distance from it. Parking-spot taken through one gate goes
+    stale in other gates' heaps and is skipped once it surfaces;
+    a heap is rebuilt once its stale entries outnumber free
+    parking-spots, so acquire is O(log n) amortized and release
+    is O(gates * log n).
+    """
+    def __init__(self, gate_distances: Sequence[Sequence[float]]):
+        """
+        gate_distances[gate][index] is distance of parking-spot
+        at index from gate.
+        """
+        if not gate_distances \
+            or len(set(map(len, gate_distances))) != 1:
+            raise Exception("Invalid gate distances")
+        self._max_spots = len(gate_distances[0])
+        self._gate_distances = [list(distances) for distances in gate_distances]
+        self._is_free = bytearray(b'\x01') * self._max_spots
+        self._free_spots_count = self._max_spots
+        # sorted list is a valid heap
+        self._gate_heaps: List[list] = [
+            sorted(zip(distances, range(self._max_spots)))
+            for distances in self._gate_distances
+        ]
+
+    def _top(self, gate: int) -> list:
+        """
+        Drop stale entries off top of gate's heap.
+        Return gate's heap.
+        """
+        if not 0 <= gate < len(self._gate_heaps):
+            raise Exception("Invalid gate")
+        heap = self._gate_heaps[gate]
+        if len(heap) > 2 * self._free_spots_count + 16:
+            heap = self._gate_heaps[gate] = self._rebuild_heap(gate)
+        is_free = self._is_free
+        while heap and not is_free[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap
+
+    def _rebuild_heap(self, gate: int) -> list:
+        distances = self._gate_distances[gate]
+        heap = [
+            (distances[index], index)
+            for index in {index for __, index in self._gate_heaps[gate]}
+            if self._is_free[index]
+        ]
+        heapq.heapify(heap)
+        return heap
+
+    def acquire(self, gate: int = None) -> int:
+        heap = self._top(gate or 0)
+        if not heap:
+            return -1
+        __, index = heapq.heappop(heap)
+        self._is_free[index] = 0
+        self._free_spots_count -= 1
+        return index
+
+    def release(self, index: int) -> None:
+        if self._is_free[index]:
+            return
+        self._is_free[index] = 1
+        self._free_spots_count += 1
+        for distances, heap in zip(self._gate_distances, self._gate_heaps):
+            heapq.heappush(heap, (distances[index], index))
+
+    def claim(self, index: int) -> bool:
+        if not 0 <= index < self._max_spots or not self._is_free[index]:
+            return False
+        self._is_free[index] = 0
+        self._free_spots_count -= 1
+        return True
+
+    def peek(self) -> int:
+        heap = self._top(0)
+        return heap[0][1] if heap else -1
+
+    def __len__(self) -> int:
+        return self._free_spots_count
+
+class FloorBalancedSpotAllocator(SpotAllocator):
+    """
+    Balance load across floors: hand out lowest numbered free
+    parking-spot of the floor with least share of its parking-spots
+    taken, lower floor on ties.
+    Every floor keeps a MinHeapSpotAllocator over its own parking-spots,
+    floors are kept ordered by load, so acquire and release are O(log n).
+    """
+    def __init__(self, spot_floors: Sequence[int]):
+        """
+        spot_floors[index] is floor of parking-spot at index.
+        """
+        self._max_spots = len(spot_floors)
+        # floor -> indexes of its parking-spots, in order
+        self._floor_spots: Dict[int, List[int]] = {}
+        # index -> position of parking-spot within its floor
+        self._floor_positions = array('q', bytes(8 * self._max_spots))
+        for index, floor in enumerate(spot_floors):
+            floor_spots = self._floor_spots.setdefault(floor, [])
+            self._floor_positions[index] = len(floor_spots)
+            floor_spots.append(index)
+        self._spot_floors = list(spot_floors)
+        self._floor_allocators: Dict[int, MinHeapSpotAllocator] = {
+            floor: MinHeapSpotAllocator(len(floor_spots))
+            for floor, floor_spots in self._floor_spots.items()
+        }
+        self._taken_spots_count: Dict[int, int] = dict.fromkeys(self._floor_spots, 0)
+        # (share of parking-spots taken, floor)
+        self._floor_loads = SortedList((0.0, floor) for floor in self._floor_spots)
+
+    def _load(self, floor: int) -> tuple:
+        return (
+            self._taken_spots_count[floor] / len(self._floor_spots[floor]), floor)
+
+    def _update_load(self, floor: int, change: int) -> None:
+        self._floor_loads.discard(self._load(floor))
+        self._taken_spots_count[floor] += change
+        self._floor_loads.add(self._load(floor))
+
+    def _least_loaded_floor(self) -> int:
+        """
+        Return least loaded floor having free parking-spots, None if none.
+        """
+        for load, floor in self._floor_loads:
+            return floor if load < 1 else None
+        return None
+
+    def acquire(self, gate: int = None) -> int:
+        floor = self._least_loaded_floor()
+        if floor is None:
+            return -1
+        position = self._floor_allocators[floor].acquire()
+        self._update_load(floor, 1)
+        return self._floor_spots[floor][position]
+
+    def release(self, index: int) -> None:
+        floor = self._spot_floors[index]
+        self._floor_allocators[floor].release(self._floor_positions[index])
+        self._update_load(floor, -1)
+
+    def claim(self, index: int) -> bool:
+        if not 0 <= index < self._max_spots:
+            return False
+        floor = self._spot_floors[index]
+        if not self._floor_allocators[floor].claim(self._floor_positions[index]):
+            return False
+        self._update_load(floor, 1)
+        return True
+
+    def peek(self) -> int:
+        floor = self._least_loaded_floor()
+        if floor is None:
+            return -1
+        return self._floor_spots[floor][self._floor_allocators[floor].peek()]
+
+    def __len__(self) -> int:
+        return self._max_spots - sum(self._taken_spots_count.values())
+
+
+class SpotPool:
+    """
+    Free pool and counters of one parking-spot type of a parking-lot.
+    Parking-spots of a type take a contiguous block of parking-lot's
+    parking-spots; pool's allocator hands out positions within
+    the block, so pools of different types never meet.
+    """
+    def __init__(
+        self, parking_spot_type, first_index: int,
+        spot_allocator: SpotAllocator
+    ):
+        self.parking_spot_type = parking_spot_type
+        self.first_index = first_index
+        self.max_spots = len(spot_allocator)
+        self.spot_allocator = spot_allocator
+        # parking-spots taken, kept up to date by parking-lot
+        self.taken_spots = 0
+
+    def is_available(self) -> bool:
+        return self.taken_spots < self.max_spots
+
+    def __contains__(self, index: int) -> bool:
+        return self.first_index <= index < self.first_index + self.max_spots
+
+    def acquire(self, gate: int = None) -> int:
+        """
+        Take next free parking-spot of the pool.
+        Return its index in parking-lot, -1 if none available.
+        """
+        position = self.spot_allocator.acquire(gate)
+        return position + self.first_index if position >= 0 else -1
+
+    def acquire_many(self, count: int, gate: int = None) -> List[int]:
+        """
+        Take next count free parking-spots of the pool.
+        Return their indexes in parking-lot.
+        """
+        first_index = self.first_index
+        return [
+            position + first_index
+            for position in self.spot_allocator.acquire_many(count, gate)
+        ]
+
+    def release(self, index: int) -> None:
+        self.spot_allocator.release(index - self.first_index)
+
+    def claim(self, index: int) -> bool:
+        if index not in self:
+            return False
+        return self.spot_allocator.claim(index - self.first_index)
+
+    def resize(self, max_spots: int) -> None:
+        """
+        Grow or cut back pool's block to max_spots parking-spots,
+        caller makes sure retired parking-spots are free.
+        """
+        self.spot_allocator.resize(max_spots)
+        self.max_spots = max_spots
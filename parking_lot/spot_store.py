@@ -0,0 +1,125 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+from parking_lot.constants import ParkingSpotType
+from parking_lot.parking_spot import PARKING_SPOTS, ParkingSpot, ParkingSpotView
+
+
+class LazySpotStore:
+    """
+    Storage of parking-spots, one ParkingSpot object per spot,
+    created on first lookup. Creating a store costs the same
+    for any number of parking-spots, memory grows only with
+    parking-spots touched.
+    Behaves as a sequence of parking-spots, last block of
+    parking-spots can be grown or cut back by resize.
+    """
+    def __init__(self, spot_blocks: List[Tuple[ParkingSpotType, int]]):
+        # end index(excluded) and parking-spot class of every block
+        self._block_stops: List[int] = []
+        self._block_spot_classes: List[type] = []
+        max_spots = 0
+        for spot_type, block_spots in spot_blocks:
+            max_spots += block_spots
+            self._block_stops.append(max_spots)
+            self._block_spot_classes.append(PARKING_SPOTS[spot_type])
+        self._max_spots = max_spots
+        # index -> parking-spot, for parking-spots touched
+        self._spots: Dict[int, ParkingSpot] = {}
+
+    def __len__(self) -> int:
+        return self._max_spots
+
+    def __getitem__(self, index: int) -> ParkingSpot:
+        parking_spot = self._spots.get(index)
+        if parking_spot is not None:
+            return parking_spot
+        if not -self._max_spots <= index < self._max_spots:
+            raise IndexError("parking-spot index out of range")
+        index %= self._max_spots
+        spot_class = self._block_spot_classes[bisect_right(self._block_stops, index)]
+        # spot number is its position in parking-lot,
+        # setdefault keeps one object if threads race on first touch
+        return self._spots.setdefault(index, spot_class(index + 1))
+
+    def __iter__(self):
+        for i in range(self._max_spots):
+            yield self[i]
+
+    def is_free(self, index: int) -> bool:
+        parking_spot = self._spots.get(index)
+        return parking_spot is None or parking_spot.is_free()
+
+    def resize(self, max_spots: int) -> None:
+        """
+        Grow or cut back last block of parking-spots to make
+        max_spots parking-spots in all, caller makes sure
+        parking-spots cut off are free.
+        """
+        first_index = self._block_stops[-2] if len(self._block_stops) > 1 else 0
+        if max_spots < first_index:
+            raise Exception("Invalid number of parking-spots")
+        for index in range(max_spots, self._max_spots):
+            self._spots.pop(index, None)
+        self._block_stops[-1] = self._max_spots = max_spots
+
+
+class ColumnarSpotStore:
+    """
+    Array backed storage of parking-spots for very large lots.
+    Occupancy, spot type and parked vehicle of every parking-spot
+    are kept in parallel arrays indexed by spot's position,
+    instead of one ParkingSpot object per spot.
+    Behaves as a sequence of parking-spots, ParkingSpotView
+    is created only when a spot is looked up.
+    """
+    def __init__(
+        self, max_spots: int, parking_spot_type: ParkingSpotType
+    ):
+        self._occupancy = bytearray(max_spots)
+        self._spot_types = array('B', [parking_spot_type.value]) * max_spots
+        self._vehicles = [None] * max_spots
+
+    def __len__(self) -> int:
+        return len(self._occupancy)
+
+    def __getitem__(self, index: int) -> ParkingSpotView:
+        if not -len(self._occupancy) <= index < len(self._occupancy):
+            raise IndexError("parking-spot index out of range")
+        return ParkingSpotView(self, index % len(self._occupancy))
+
+    def __iter__(self):
+        for i in range(len(self._occupancy)):
+            yield ParkingSpotView(self, i)
+
+    def is_free(self, index: int) -> bool:
+        return not self._occupancy[index]
+
+    def resize(self, max_spots: int) -> None:
+        """
+        Grow or cut back parking-spots to max_spots, new parking-spots
+        take type of the last one, caller makes sure parking-spots
+        cut off are free.
+        """
+        old_max_spots = len(self._occupancy)
+        if max_spots < old_max_spots:
+            del self._occupancy[max_spots:]
+            del self._spot_types[max_spots:]
+            del self._vehicles[max_spots:]
+            return
+        added_spots = max_spots - old_max_spots
+        spot_type = self._spot_types[-1] if old_max_spots \
+            else ParkingSpotType.FOUR_WHEELER.value
+        self._occupancy.extend(bytes(added_spots))
+        self._spot_types.extend(array('B', [spot_type]) * added_spots)
+        self._vehicles.extend([None] * added_spots)
+
+    def set_spot_type(
+        self, start: int, stop: int, parking_spot_type: ParkingSpotType
+    ) -> None:
+        """
+        Set type of parking-spots at indexes start to stop(excluded).
+        """
+        self._spot_types[start:stop] = \
+            array('B', [parking_spot_type.value]) * (stop - start)
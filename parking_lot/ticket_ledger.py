@@ -0,0 +1,140 @@
+from array import array
+from collections import namedtuple
+import time
+from typing import Callable, Dict, Iterator, List
+
+from parking_lot.interning import COLORS, StringTable
+
+
+TicketLedgerEntry = namedtuple(
+    'TicketLedgerEntry',
+    ['ticket_id', 'spot_id', 'registration_number',
+     'entry_time_ns', 'exit_time_ns']
+)
+
+
+class TicketLedger:
+    """
+    Append-only history of parking-tickets issued by a parking-lot.
+    One row per visit, columns are kept in growable typed arrays:
+    ticket id, parking-spot id, plate id, colour id and monotonic
+    entry/exit time in nanoseconds. Registration numbers are stored
+    once and referred by plate id, colours by their id in COLORS.
+    Opening a row on park and closing it on exit are O(1).
+    """
+    OPEN = -1
+
+    def __init__(self, clock: Callable[[], int] = time.monotonic_ns):
+        self._clock = clock
+        # monotonic clock -> wall clock, for reports by time of day
+        self._wall_clock_offset_ns = time.time_ns() - time.monotonic_ns()
+
+        # columns
+        self._ticket_ids = array('q')
+        self._spot_ids = array('q')
+        self._plate_ids = array('q')
+        self._color_ids = array('q')
+        self._entry_times = array('q')
+        self._exit_times = array('q')
+
+        # registration number <-> plate id
+        self._plates = StringTable()
+
+        # ticket id -> row of visits still in progress
+        self._open_rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ticket_ids)
+
+    @property
+    def wall_clock_offset_ns(self) -> int:
+        """
+        Offset turning ledger's entry/exit times into
+        wall clock time(ns since epoch).
+        """
+        return self._wall_clock_offset_ns
+
+    @property
+    def colors(self) -> List[str]:
+        """
+        Colours recorded, indexed by colour id.
+        """
+        return COLORS.strings
+
+    def now(self) -> int:
+        """
+        Return current time of ledger's clock.
+        """
+        return self._clock()
+
+    def copy_columns(self, *names: str) -> List[array]:
+        """
+        Return copies of given columns(ticket_id, spot_id, plate_id,
+        color_id, entry_time_ns, exit_time_ns), cut to rows fully
+        written, so they can be read while visits keep being recorded.
+        """
+        columns = {
+            'ticket_id': self._ticket_ids,
+            'spot_id': self._spot_ids,
+            'plate_id': self._plate_ids,
+            'color_id': self._color_ids,
+            'entry_time_ns': self._entry_times,
+            'exit_time_ns': self._exit_times,
+        }
+        # exit time is the last column appended on open
+        rows = len(self._exit_times)
+        res = []
+        for name in names:
+            if name not in columns:
+                raise Exception(f"Invalid ticket ledger column: {name}")
+            res.append(columns[name][:rows])
+        return res
+
+    def open(
+        self, ticket_id: int, spot_id: int, registration_number: str,
+        color_id: int, entry_time_ns: int = None
+    ) -> int:
+        """
+        Record vehicle's entry, at entry_time_ns of ledger's clock if
+        given(vehicle restored after restart), else now.
+        Return row number of the visit.
+        """
+        row = len(self._ticket_ids)
+        self._ticket_ids.append(ticket_id)
+        self._spot_ids.append(spot_id)
+        self._plate_ids.append(self._plates.encode(registration_number))
+        self._color_ids.append(color_id)
+        self._entry_times.append(
+            self._clock() if entry_time_ns is None else entry_time_ns)
+        self._exit_times.append(TicketLedger.OPEN)
+        self._open_rows[ticket_id] = row
+        return row
+
+    def close(self, ticket_id: int) -> int:
+        """
+        Record vehicle's exit.
+        Return row number of the visit, -1 if ticket is not open.
+        """
+        row = self._open_rows.pop(ticket_id, -1)
+        if row >= 0:
+            self._exit_times[row] = self._clock()
+        return row
+
+    def is_open(self, ticket_id: int) -> bool:
+        return ticket_id in self._open_rows
+
+    def get_entry(self, row: int) -> TicketLedgerEntry:
+        """
+        Return visit recorded at given row.
+        """
+        return TicketLedgerEntry(
+            self._ticket_ids[row],
+            self._spot_ids[row],
+            self._plates.decode(self._plate_ids[row]),
+            self._entry_times[row],
+            self._exit_times[row],
+        )
+
+    def __iter__(self) -> Iterator[TicketLedgerEntry]:
+        for row in range(len(self._ticket_ids)):
+            yield self.get_entry(row)
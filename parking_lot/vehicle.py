@@ -1,6 +1,7 @@
 from abc import ABC
 
 from parking_lot.constants import VehicleType
+from parking_lot.interning import COLORS
 from parking_lot.parking_spot import ParkingSpot
 from parking_lot.parking_ticket import ParkingTicket
 
@@ -8,11 +9,14 @@ from parking_lot.parking_ticket import ParkingTicket
 class Vehicle(ABC):
     def __init__(
         self, registration_number: str, 
-        color: str, vehicle_type: VehicleType
+        color: str, vehicle_type: VehicleType, gate: int = None
     ):
         self._registration_number = registration_number.upper()
         self._type = vehicle_type
-        self._color = color.lower()
+        # colour is kept as id of shared colour table
+        self._color_id = COLORS.encode(color)
+        # gate vehicle arrived at, for gate aware spot allocation
+        self._gate = gate
         self._ticket = None
         self._parking_spot = None
 
@@ -26,7 +30,15 @@ class Vehicle(ABC):
 
     @property
     def color(self) -> str:
-        return self._color
+        return COLORS.strings[self._color_id]
+
+    @property
+    def color_id(self) -> int:
+        return self._color_id
+
+    @property
+    def gate(self) -> int:
+        return self._gate
 
     @property
     def parking_spot(self):
@@ -69,6 +81,33 @@ class Vehicle(ABC):
 
 
 class Car(Vehicle):
-    def __init__(self, registration_number: str, color: str):
+    def __init__(self, registration_number: str, color: str, gate: int = None):
         super().__init__(
-            registration_number, color, VehicleType.CAR)
+            registration_number, color, VehicleType.CAR, gate)
+
+
+class Motorbike(Vehicle):
+    def __init__(self, registration_number: str, color: str, gate: int = None):
+        super().__init__(
+            registration_number, color, VehicleType.MOTORBIKE, gate)
+
+
+class Van(Vehicle):
+    def __init__(self, registration_number: str, color: str, gate: int = None):
+        super().__init__(
+            registration_number, color, VehicleType.VAN, gate)
+
+
+class Truck(Vehicle):
+    def __init__(self, registration_number: str, color: str, gate: int = None):
+        super().__init__(
+            registration_number, color, VehicleType.TRUCK, gate)
+
+
+# vehicle type -> vehicle class
+VEHICLES = {
+    VehicleType.CAR: Car,
+    VehicleType.MOTORBIKE: Motorbike,
+    VehicleType.VAN: Van,
+    VehicleType.TRUCK: Truck,
+}
@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+
+from command_line_prompt import (
+    add_billing_arguments, add_event_stream_arguments, add_metrics_arguments,
+    enable_billing, enable_event_streams, enable_metrics
+)
+from parking_lot.command_server import serve
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+
+def main():
+    parser = argparse.ArgumentParser(description='Parking-lot command server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument(
+        '--unix', metavar='PATH',
+        help='listen on unix socket PATH instead of TCP')
+    parser.add_argument(
+        '--state-dir', metavar='DIR',
+        help='persist parking-lot in DIR and restore it on start')
+    add_metrics_arguments(parser)
+    add_event_stream_arguments(parser)
+    add_billing_arguments(parser)
+    args = parser.parse_args()
+
+    if args.state_dir:
+        FourWheelerParkingLotCommand.enable_persistence(args.state_dir)
+    metrics_server = enable_metrics(args)
+    enable_event_streams(args)
+    enable_billing(args)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        FourWheelerParkingLotCommand.close()
+        if metrics_server:
+            metrics_server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import sys
+import time
+
+from parking_lot.simulation import (
+    SimulationConfig, sweep_capacities, write_simulation_report
+)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Simulate parking-lots of given capacities, one capacity per worker.')
+    parser.add_argument(
+        'capacities', nargs='+', type=int, metavar='SLOTS', help='capacity to simulate')
+    parser.add_argument('--visits', type=int, default=1_000_000)
+    parser.add_argument('--arrivals-per-hour', type=float, default=200.0)
+    parser.add_argument('--median-dwell-minutes', type=float, default=120.0)
+    parser.add_argument(
+        '--dwell-sigma', type=float, default=0.8,
+        help='sigma of log-normal dwell time')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--warmup-visits', type=int, default=1000,
+        help='first visits, while lot fills up, left out of statistics')
+    parser.add_argument(
+        '--trace', metavar='FILE',
+        help="replay visits of FILE('arrival seconds,dwell seconds' per line) "
+             "instead of drawing them")
+    parser.add_argument(
+        '--workers', type=int,
+        help='worker processes(default: cpu count, 1 simulates serially)')
+    args = parser.parse_args()
+
+    config = SimulationConfig(
+        visits=args.visits, arrivals_per_hour=args.arrivals_per_hour,
+        median_dwell_minutes=args.median_dwell_minutes, dwell_sigma=args.dwell_sigma,
+        seed=args.seed, warmup_visits=args.warmup_visits, trace_path=args.trace)
+    start = time.perf_counter()
+    results = sweep_capacities(config, args.capacities, args.workers)
+    write_simulation_report(results, sys.stdout)
+    print(
+        f"Simulated {len(results)} capacities in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
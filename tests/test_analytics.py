@@ -0,0 +1,83 @@
+import itertools
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector, analytics
+from parking_lot.interning import COLORS
+from parking_lot.ticket_ledger import TicketLedger
+from parking_lot.vehicle import Car
+
+S = analytics.NS_PER_SECOND
+
+
+@unittest.skipUnless(analytics.HAS_NUMPY, "needs numpy")
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        # spot 1: 0-10s(white), 20-40s(red), spot 2: 5-15s(white), 30s-(in progress)
+        self.history = analytics.VisitHistory(
+            spot_ids=[1, 2, 1, 2],
+            color_ids=[0, 0, 1, 0],
+            entry_ns=[0, 5 * S, 20 * S, 30 * S],
+            exit_ns=[10 * S, 15 * S, 40 * S, -1],
+            colors=["white", "red"],
+            as_of_ns=50 * S,
+        )
+
+    def test_occupancy(self):
+        times, occupancy = analytics.occupancy_curve(self.history, 5 * S)
+        self.assertListEqual([0, 5, 10, 15, 20, 25, 30, 35, 40, 45], list(times // S))
+        self.assertListEqual([1, 2, 1, 0, 1, 1, 2, 2, 1, 1], list(occupancy))
+        self.assertEqual((2, 5 * S), analytics.peak_occupancy(self.history))
+        self.assertEqual((2, 30 * S), analytics.peak_occupancy(self.history, 16 * S))
+        self.assertEqual((1, 11 * S), analytics.peak_occupancy(self.history, 11 * S, 19 * S))
+
+    def test_dwell_times(self):
+        self.assertEqual(1, self.history.in_progress)
+        self.assertListEqual(
+            [10.0, 20.0],
+            list(analytics.dwell_time_percentiles(self.history, (0, 100))))
+        self.assertListEqual(
+            [10.0], list(analytics.dwell_time_percentiles(self.history, (50,), 0, 10 * S)))
+        by_hour = analytics.mean_dwell_time_by_hour(self.history, utc_offset_s=0)
+        self.assertAlmostEqual(40 / 3, by_hour[0])
+        self.assertEqual(23, sum(map(lambda x: x != x, by_hour)))
+        self.assertDictEqual(
+            {"white": 10.0, "red": 20.0},
+            analytics.mean_dwell_time_by_color(self.history))
+
+    def test_spots(self):
+        self.assertListEqual(
+            [0.6, 0.6, 0.0], list(analytics.spot_utilization(self.history, 3)))
+        self.assertListEqual(
+            [0.5, 0.5], list(analytics.spot_utilization(self.history, 2, 0, 20 * S)))
+        self.assertListEqual([2, 2, 0], list(analytics.spot_turnover(self.history, 3)))
+        self.assertListEqual([1, 1], list(analytics.spot_turnover(self.history, 2, 0, 20 * S)))
+
+    def test_from_ticket_ledger(self):
+        clock = itertools.count(start=100, step=10)
+        ticket_ledger = TicketLedger(clock=lambda: next(clock))
+        ticket_ledger.open(1, 3, "KA-01-HH-1234", COLORS.encode("white"))
+        ticket_ledger.open(2, 1, "KA-01-HH-9999", COLORS.encode("blue"))
+        ticket_ledger.close(1)
+        history = analytics.VisitHistory.from_ticket_ledger(ticket_ledger)
+
+        offset = ticket_ledger.wall_clock_offset_ns
+        self.assertListEqual([3, 1], list(history.spot_ids))
+        self.assertListEqual(["white", "blue"], [history.colors[i] for i in history.color_ids])
+        self.assertListEqual([100 + offset, 110 + offset], list(history.entry_ns))
+        self.assertListEqual([True, False], list(history.is_closed))
+        self.assertEqual(130 + offset, history.as_of_ns)
+        self.assertEqual(130 + offset, history.exit_ns[1])
+
+    def test_parking_lot_report(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2)
+        parking_lot = director.get_parking_lot()
+        parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White"))
+        parking_lot.allocate_parking_spot(Car("KA-01-HH-9999", "Red"))
+        parking_lot.free_up_parking_spot(1)
+
+        history = analytics.VisitHistory.from_ticket_ledger(parking_lot.ticket_ledger)
+        report = analytics.render_report(history, 2)
+        self.assertEqual("Visits: 2 (in progress: 1)", report[1])
+        self.assertTrue(report[2].startswith("Peak occupancy: 2 of 2 at "))
+        self.assertIn("White\t", '\n'.join(report))
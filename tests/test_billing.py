@@ -0,0 +1,108 @@
+import io
+import random
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector, billing
+from parking_lot.billing import Billing, NS_PER_HOUR, Tariff
+from parking_lot.command_runner import BatchCommandRunner
+from parking_lot.constants import ParkingSpotType
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+from parking_lot.vehicle import Car, Van
+
+H = NS_PER_HOUR
+TARIFF = Tariff(((2, 40), (6, 30), (24, 20)), daily_cap=400, overnight_fee=100)
+
+
+class TestTariff(unittest.TestCase):
+    def test_hour_bands(self):
+        # started hours are charged, daytime stays(entry at 08:00)
+        self.assertEqual(0, TARIFF.fee(8 * H, 8 * H))
+        self.assertEqual(40, TARIFF.fee(8 * H, 8 * H + 1))
+        self.assertEqual(80, TARIFF.fee(8 * H, 10 * H))
+        self.assertEqual(110, TARIFF.fee(8 * H, 10 * H + 1))
+        self.assertEqual(220, TARIFF.fee(8 * H, 15 * H))
+        self.assertEqual(20, Tariff(((2, 10),)).fee(0, 2 * H))
+        self.assertEqual(30, Tariff(((2, 10),)).fee(0, 2 * H + 1))
+
+    def test_daily_cap_and_overnight(self):
+        # 20 hours from 08:00 run into the cap and over one night
+        self.assertEqual(400 + 100, TARIFF.fee(8 * H, 28 * H))
+        # bands start over after 24 hours
+        self.assertEqual(400 + 40 + 100, TARIFF.fee(8 * H, 32 * H + 1))
+        self.assertEqual(3 * 400 + 3 * 100, TARIFF.fee(8 * H, 80 * H))
+        # overnight hour is local time
+        self.assertEqual(80 + 100, TARIFF.fee(23 * H, 25 * H))
+        self.assertEqual(80, TARIFF.fee(23 * H, 25 * H, utc_offset_ns=-2 * H))
+
+    def test_invalid_tariff(self):
+        for hour_bands in ((), ((6, 30), (2, 40)), ((0, 40),), ((2, -1),)):
+            with self.assertRaises(Exception):
+                Tariff(hour_bands)
+
+    @unittest.skipUnless(billing.HAS_NUMPY, "needs numpy")
+    def test_batch_matches_exit_fees(self):
+        rng = random.Random(7)
+        spot_blocks = [(1, ParkingSpotType.FOUR_WHEELER), (11, ParkingSpotType.LARGE)]
+        fees = Billing(spot_blocks, utc_offset_s=19800)
+        visits = []
+        for __ in range(5000):
+            entry_ns = 1_700_000_000 * 10 ** 9 + rng.randrange(30 * 24 * H)
+            exit_ns = entry_ns + rng.choice((rng.randrange(3 * H), rng.randrange(80 * H)))
+            visits.append((rng.randint(1, 15), entry_ns, exit_ns))
+        expected = [
+            fees.charge(row, fees.get_spot_type(spot_id), entry_ns, exit_ns)
+            for row, (spot_id, entry_ns, exit_ns) in enumerate(visits)
+        ]
+        self.assertListEqual(expected, fees.price_visits(*zip(*visits)).tolist())
+        self.assertEqual(expected[3], fees.get_fee(3))
+
+
+class TestParkingLotBilling(unittest.TestCase):
+    def setUp(self):
+        FourWheelerParkingLotCommand.reset()
+
+    def tearDown(self):
+        FourWheelerParkingLotCommand.reset()
+
+    def test_fee_on_exit(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(1, spot_counts={ParkingSpotType.LARGE: 1})
+        parking_lot = director.get_parking_lot()
+        now_ns = [0]
+        parking_lot.ticket_ledger._clock = lambda: now_ns[0]
+        parking_lot.enable_billing({
+            ParkingSpotType.FOUR_WHEELER: Tariff(((1, 10), (24, 5))),
+            ParkingSpotType.LARGE: Tariff(((24, 50),)),
+        })
+        parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White"))
+        parking_lot.allocate_parking_spot(Van("KA-01-V-0001", "Red"))
+        now_ns[0] = 3 * H
+        self.assertTrue(parking_lot.free_up_parking_spot(1))
+        self.assertEqual(20, parking_lot.billing.get_fee(0))
+        row = parking_lot.check_out(2)
+        self.assertEqual(1, row)
+        self.assertEqual(150, parking_lot.billing.get_fee(row))
+        self.assertEqual(-1, parking_lot.check_out(2))
+
+        if billing.HAS_NUMPY:
+            ticket_ids, fees = parking_lot.billing.price_ticket_ledger(
+                parking_lot.ticket_ledger)
+            self.assertListEqual([20, 150], fees.tolist())
+
+    def test_invoice_command(self):
+        FourWheelerParkingLotCommand.enable_billing()
+        out = io.StringIO()
+        BatchCommandRunner(out).run([
+            "invoice",
+            "create_parking_lot 2",
+            "park KA-01-HH-1234 White",
+            "leave 1",
+            "invoice",
+            "invoice 2000-01-01",
+        ])
+        res = out.getvalue().splitlines()
+        self.assertEqual("Sorry, parking lot not found", res[0])
+        self.assertEqual("Slot number 1 is free (fee: 40)", res[3])
+        if billing.HAS_NUMPY:
+            self.assertEqual("Visits: 1, total fee: 40", res[4])
+            self.assertEqual("Visits: 0, total fee: 0", res[5])
@@ -0,0 +1,210 @@
+import io
+import unittest
+
+from parking_lot.command_runner import (
+    BatchCommandRunner, COMMAND_TABLE, split_lot_id
+)
+from parking_lot.constants import ParkingSpotType
+from parking_lot.parking_lot_command import (
+    FourWheelerParkingLotCommand, ParkFourWheelerCommand
+)
+
+
+class TestBatchCommandRunner(unittest.TestCase):
+    def setUp(self):
+        FourWheelerParkingLotCommand.reset()
+
+    def tearDown(self):
+        FourWheelerParkingLotCommand.reset()
+
+    def _run(self, lines):
+        out = io.StringIO()
+        BatchCommandRunner(out).run(lines)
+        return out.getvalue()
+
+    def test_command_table(self):
+        command = COMMAND_TABLE['park']("KA-01-HH-1234 White")
+        self.assertIsInstance(command, ParkFourWheelerCommand)
+
+    def test_run(self):
+        lines = [
+            "create_parking_lot 2\n",
+            "park KA-01-HH-1234 White\n",
+            "park KA-01-HH-9999 Black\n",
+            "leave 1\n",
+            "status\n",
+            "slot_number_for_registration_number KA-01-HH-9999\n",
+        ]
+        self.assertEqual(
+            "Created a parking lot with 2 slots\n"
+            "Allocated slot number: 1\n"
+            "Allocated slot number: 2\n"
+            "Slot number 1 is free\n"
+            "Slot No.\tRegistration No\t\tColour\n"
+            "2\t\tKA-01-HH-9999\t\tBlack\n"
+            "\n"
+            "2\n",
+            self._run(lines)
+        )
+
+    def test_status_arguments(self):
+        lines = [
+            "create_parking_lot 3",
+            "park_many KA-01-HH-1234 White KA-01-HH-9999 Black KA-01-BB-0001 Red",
+            "status 1",
+            "status 1  1 extra",
+            "status foo",
+        ]
+        self.assertEqual(
+            "Created a parking lot with 3 slots\n"
+            "Allocated slot number: 1\n"
+            "Allocated slot number: 2\n"
+            "Allocated slot number: 3\n"
+            "Slot No.\tRegistration No\t\tColour\n"
+            "2\t\tKA-01-HH-9999\t\tBlack\n"
+            "3\t\tKA-01-BB-0001\t\tRed\n"
+            "\n"
+            "Slot No.\tRegistration No\t\tColour\n"
+            "2\t\tKA-01-HH-9999\t\tBlack\n"
+            "\n"
+            "*** Invalid arguments: status foo\n",
+            self._run(lines)
+        )
+
+    def test_park_many_reasons(self):
+        lines = [
+            "create_parking_lot 2",
+            "park KA-01-HH-1234 White",
+            "park_many KA-01-HH-1234 White KA-01-HH-9999 Black KA-01-HH-9999 Black KA-01-BB-0001 Red",
+        ]
+        self.assertEqual(
+            "Created a parking lot with 2 slots\n"
+            "Allocated slot number: 1\n"
+            "Sorry, vehicle is already parked\n"
+            "Allocated slot number: 2\n"
+            "Sorry, vehicle is already parked\n"
+            "Sorry, parking lot is full\n",
+            self._run(lines)
+        )
+
+    def test_blank_unknown_and_exit(self):
+        lines = [
+            "create_parking_lot 1",
+            "park KA-01-HH-1234 White",
+            "",
+            "unknown command",
+            "exit",
+            "park KA-01-HH-9999 Black",
+        ]
+        self.assertEqual(
+            "Created a parking lot with 1 slots\n"
+            "Allocated slot number: 1\n"
+            "Sorry, parking lot is full\n"
+            "*** Unknown syntax: unknown command\n",
+            self._run(lines)
+        )
+
+    def test_multiple_parking_lots(self):
+        self._run(["create_parking_lot 1"])
+        lot_id = FourWheelerParkingLotCommand.create_parking_lot(2)
+        lines = [
+            "park KA-01-HH-1234 White",
+            f"park KA-01-HH-1234 White @{lot_id}",
+            f"park KA-01-HH-9999 Black @{lot_id}",
+            "park_anywhere KA-01-HH-7777 Red",
+            "park_anywhere KA-01-HH-2701 Blue",
+            "lot_for_registration_number KA-01-HH-7777",
+            f"slot_numbers_for_cars_with_colour Black @{lot_id}",
+            f"status @{lot_id + 1}",
+        ]
+        self.assertEqual(
+            "Allocated slot number: 1\n"
+            "Sorry, parking lot is full\n"
+            "Allocated slot number: 1\n"
+            f"Allocated slot number: 2 (lot id: {lot_id})\n"
+            "Sorry, parking lot is full\n"
+            f"Lot id: {lot_id}, slot number: 2\n"
+            "1\n"
+            "Sorry, parking lot not found\n",
+            self._run(lines)
+        )
+
+    def test_vehicle_types(self):
+        lines = [
+            "create_parking_lot 1 two_wheeler=1 heavy=1",
+            "park KA-01-M-0001 Red motorbike",
+            "park KA-01-T-0001 Blue truck",
+            "park KA-01-V-0001 White van",
+            "park KA-01-M-0002 Red motorbike",
+        ]
+        self.assertEqual(
+            "Created a parking lot with 3 slots\n"
+            "Allocated slot number: 2\n"
+            "Allocated slot number: 3\n"
+            "Sorry, parking lot is full\n"
+            "Allocated slot number: 1\n",
+            self._run(lines)
+        )
+        with self.assertRaises(Exception):
+            COMMAND_TABLE['park']("KA-01-B-0001 Red bicycle")
+
+    def test_reservations(self):
+        lines = [
+            "create_parking_lot 2",
+            "reserve KA-01-HH-1234 2099-01-01T18:00 2099-01-01T22:00 2",
+            "reserve KA-01-HH-9999 2099-01-01T20:00 2099-01-01T23:00 2",
+            "reserve KA-01-HH-9999 2099-01-01T20:00 2099-01-01T23:00",
+            "reserve KA-01-HH-7777 2099-01-01T20:00 2099-01-01T19:00",
+            "cancel_reservation 1",
+            "cancel_reservation 1",
+            "park KA-01-BB-0001 Black",
+        ]
+        self.assertEqual(
+            "Created a parking lot with 2 slots\n"
+            "Reserved slot number: 2 (reservation id: 1)\n"
+            "Sorry, slot number 2 is not free for that time\n"
+            "Reserved slot number: 1 (reservation id: 2)\n"
+            "Sorry, invalid reservation window\n"
+            "Cancelled reservation 1\n"
+            "Reservation not found\n"
+            "Allocated slot number: 1\n",
+            self._run(lines)
+        )
+
+    def test_expand_and_shrink(self):
+        self._run(["create_parking_lot 1"])
+        default_lot_id = FourWheelerParkingLotCommand.get_parking_lot_().id_
+        lot_id = FourWheelerParkingLotCommand.create_parking_lot(1)
+        mixed_lot_id = FourWheelerParkingLotCommand.create_parking_lot(
+            1, {ParkingSpotType.LARGE: 1})
+        lines = [
+            "park KA-01-HH-1234 White",
+            "expand_parking_lot 2",
+            "park_anywhere KA-01-HH-9999 White",
+            "park_anywhere KA-01-HH-7777 Red",
+            "shrink_parking_lot 2",
+            "leave 2",
+            "leave 3",
+            "shrink_parking_lot 4",
+            "shrink_parking_lot 2",
+            f"expand_parking_lot 1 @{lot_id}",
+            f"expand_parking_lot 1 @{mixed_lot_id}",
+        ]
+        self.assertEqual(
+            "Allocated slot number: 1\n"
+            "Parking lot now has 3 slots\n"
+            f"Allocated slot number: 2 (lot id: {default_lot_id})\n"
+            f"Allocated slot number: 3 (lot id: {default_lot_id})\n"
+            "Sorry, slots to retire are not free\n"
+            "Slot number 2 is free\n"
+            "Slot number 3 is free\n"
+            "Sorry, parking lot can not be resized\n"
+            "Parking lot now has 1 slots\n"
+            "Parking lot now has 2 slots\n"
+            "Sorry, parking lot can not be resized\n",
+            self._run(lines)
+        )
+
+    def test_split_lot_id(self):
+        self.assertEqual(("KA-01-HH-1234 White", 3), split_lot_id("KA-01-HH-1234 White @3"))
+        self.assertEqual(("1 10", None), split_lot_id("1 10"))
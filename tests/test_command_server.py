@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+
+from parking_lot.command_server import start_server
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+
+
+class TestCommandServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        FourWheelerParkingLotCommand.reset()
+        self.server = await start_server('127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        FourWheelerParkingLotCommand.reset()
+
+    async def _read_response(self, reader):
+        lines = []
+        while True:
+            line = (await reader.readline()).decode()
+            if line in ('\n', ''):
+                return lines
+            lines.append(line.rstrip('\n'))
+
+    async def test_pipelined_requests(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(
+            b"create_parking_lot 2\n"
+            b"park KA-01-HH-1234 White\n"
+            b"park KA-01-HH-9999 Black\n"
+            b"status\n"
+            b"leave 1\n"
+            b"unknown command\n"
+            b"leave one\n"
+        )
+        self.assertEqual(["Created a parking lot with 2 slots"], await self._read_response(reader))
+        self.assertEqual(["Allocated slot number: 1"], await self._read_response(reader))
+        self.assertEqual(["Allocated slot number: 2"], await self._read_response(reader))
+        self.assertEqual(
+            [
+                "Slot No.\tRegistration No\t\tColour",
+                "1\t\tKA-01-HH-1234\t\tWhite",
+                "2\t\tKA-01-HH-9999\t\tBlack",
+            ],
+            await self._read_response(reader)
+        )
+        self.assertEqual(["Slot number 1 is free"], await self._read_response(reader))
+        self.assertEqual(["*** Unknown syntax: unknown command"], await self._read_response(reader))
+        self.assertEqual(["*** Invalid arguments: leave one"], await self._read_response(reader))
+        writer.write(b"exit\n")
+        self.assertEqual(b'', await reader.read())
+        writer.close()
+
+    async def test_failing_commands(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(
+            b"create_parking_lot 2\n"
+            b"park KA-01-HH-1234 White\n"
+            b"park KA-01-HH-9999 Black spaceship\n"
+            b"status -1 2\n"
+            b"slot_number_for_registration_number KA-01-HH-1234\n"
+        )
+        self.assertEqual(["Created a parking lot with 2 slots"], await self._read_response(reader))
+        self.assertEqual(["Allocated slot number: 1"], await self._read_response(reader))
+        self.assertEqual(
+            ["*** Invalid arguments: park KA-01-HH-9999 Black spaceship"],
+            await self._read_response(reader))
+        self.assertEqual([], await self._read_response(reader))
+        self.assertEqual(["1"], await self._read_response(reader))
+        writer.close()
+
+    async def test_connections_share_parking_lot(self):
+        first = await asyncio.open_connection('127.0.0.1', self.port)
+        second = await asyncio.open_connection('127.0.0.1', self.port)
+        first[1].write(b"create_parking_lot 1\npark KA-01-HH-1234 White\n")
+        await self._read_response(first[0])
+        await self._read_response(first[0])
+        # partial line is held till rest of it arrives
+        second[1].write(b"slot_number_for_reg")
+        second[1].write(b"istration_number KA-01-HH-1234\n")
+        self.assertEqual(["1"], await self._read_response(second[0]))
+        for __, writer in (first, second):
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import random
+import sys
+import threading
+import unittest
+
+from parking_lot import ConcurrentFourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.constants import ParkingSpotType
+from parking_lot.vehicle import Car
+
+
+class TestConcurrentParkingLot(unittest.TestCase):
+    threads_count = 8
+
+    def setUp(self):
+        # switch threads often to surface races under the GIL
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self._switch_interval)
+
+    def _build_parking_lot(self, max_four_wheeler_spots):
+        director = ParkingLotDirector(ConcurrentFourWheelerParkingLotBuilder())
+        director.build_parking_lot(max_four_wheeler_spots)
+        return director.get_parking_lot()
+
+    def _run_threads(self, target):
+        threads = [
+            threading.Thread(target=target, args=(i,))
+            for i in range(self.threads_count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _assert_consistent(self, parking_lot):
+        parked = parking_lot.parked_vehicles
+        occupied = [
+            parking_spot.id_ for parking_spot in parking_lot._parking_spots
+            if not parking_spot.is_free()
+        ]
+        self.assertEqual(len(parked), len(occupied))
+        self.assertEqual(
+            parking_lot.max_four_wheeler_spots - len(parked),
+            parking_lot.available_four_wheeler_spots)
+        self.assertEqual(
+            len(parking_lot._spot_pools[ParkingSpotType.FOUR_WHEELER].spot_allocator),
+            parking_lot.available_four_wheeler_spots)
+        self.assertEqual(
+            occupied, [i + 1 for i in parking_lot._occupied_spots])
+        self.assertEqual(
+            sorted(occupied),
+            sorted(i + 1 for spots in parking_lot.color_spots_map.values() for i in spots))
+        self.assertEqual(
+            sorted(occupied),
+            parking_lot.get_parking_spot_numbers_of_registration_prefix(""))
+        for reg_no, vehicle in parked.items():
+            self.assertIs(vehicle, vehicle.parking_spot.vehicle)
+            self.assertTrue(parking_lot.ticket_ledger.is_open(vehicle.ticket.id_))
+
+    def test_fill_parking_lot(self):
+        parking_lot = self._build_parking_lot(100)
+        results = [[] for __ in range(self.threads_count)]
+
+        def gate(i):
+            for j in range(50):
+                results[i].append(
+                    parking_lot.allocate_parking_spot(Car(f"KA-{i}-{j}", "White")))
+
+        self._run_threads(gate)
+        self.assertEqual(100, sum(sum(r) for r in results))
+        self.assertEqual(0, parking_lot.available_four_wheeler_spots)
+        self._assert_consistent(parking_lot)
+
+    def test_same_vehicle_parked_once(self):
+        parking_lot = self._build_parking_lot(100)
+        results = []
+
+        def gate(i):
+            results.append(
+                parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White")))
+
+        self._run_threads(gate)
+        self.assertEqual(1, sum(results))
+
+    def test_park_and_leave_stress(self):
+        parking_lot = self._build_parking_lot(50)
+        colors = ("White", "Black", "Red", "Blue")
+
+        def gate(i):
+            rng = random.Random(i)
+            for __ in range(2000):
+                if rng.random() < 0.5:
+                    parking_lot.allocate_parking_spot(
+                        Car(f"KA-{rng.randrange(200)}", rng.choice(colors)))
+                else:
+                    parking_lot.free_up_parking_spot(rng.randint(1, 50))
+                    parking_lot.get_parking_lot_status()
+
+        self._run_threads(gate)
+        self._assert_consistent(parking_lot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.constants import ParkingLotEvent
+from parking_lot.event_stream import ParkingLotEventStream
+from parking_lot.vehicle import Car
+
+
+class TestEventStream(unittest.TestCase):
+    def _publish(self, event_stream, count):
+        for i in range(count):
+            event_stream.publish(ParkingLotEvent.PARK, i + 1, f"KA-{i}", "white", i, i)
+
+    def test_parking_lot_events(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2)
+        parking_lot = director.get_parking_lot()
+        subscription = parking_lot.get_event_stream().subscribe()
+
+        car = Car("KA-01-HH-1234", "White")
+        parking_lot.allocate_parking_spot(car)
+        ticket_id = car.ticket.id_
+        parking_lot.free_up_parking_spot(1)
+
+        park, unpark = subscription.read()
+        self.assertEqual(
+            (0, ParkingLotEvent.PARK, 1, "KA-01-HH-1234", "white", ticket_id),
+            park[:6])
+        self.assertEqual(
+            (1, ParkingLotEvent.UNPARK, 1, "KA-01-HH-1234", "white", ticket_id),
+            unpark[:6])
+        self.assertLessEqual(park.time_ns, unpark.time_ns)
+        self.assertEqual([], subscription.read())
+
+    def test_read_in_batches(self):
+        event_stream = ParkingLotEventStream(8)
+        subscription = event_stream.subscribe()
+        self._publish(event_stream, 5)
+        self.assertEqual([0, 1, 2], [e.seq for e in subscription.read(3)])
+        self.assertEqual([3, 4], [e.seq for e in subscription.read(3)])
+        self.assertEqual(5, subscription.cursor)
+        self.assertEqual(0, subscription.missed)
+
+        # cursor from the future never moves backwards
+        self.assertEqual(([], 9, 0), event_stream.read(9))
+        self._publish(event_stream, 5)
+        self.assertEqual([9], [e.seq for e in event_stream.read(9).events])
+
+    def test_overflow(self):
+        event_stream = ParkingLotEventStream(4)
+        subscription = event_stream.subscribe()
+        self._publish(event_stream, 10)
+        self.assertEqual(4, len(event_stream))
+        self.assertEqual(6, event_stream.first_seq)
+
+        batch = event_stream.read(0, 2)
+        self.assertEqual(([6, 7], 8, 6), ([e.seq for e in batch.events], batch.cursor, batch.missed))
+        self.assertEqual([6, 7, 8, 9], [e.seq for e in subscription.read()])
+        self.assertEqual(6, subscription.missed)
+        self.assertEqual(
+            [6, 7, 8, 9], [e.seq for e in event_stream.subscribe(from_start=True).read()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from parking_lot.interning import StringTable
+
+
+class TestStringTable(unittest.TestCase):
+    def test_encode_decode(self):
+        table = StringTable()
+        self.assertEqual(0, table.encode("KA-01-HH-1234"))
+        self.assertEqual(1, table.encode("KA-01-HH-9999"))
+        self.assertEqual(0, table.encode("KA-01-HH-1234"))
+        self.assertEqual(2, len(table))
+        self.assertEqual("KA-01-HH-9999", table.decode(1))
+        self.assertIsNone(table.find("KA-01-BB-0001"))
+        self.assertEqual(2, len(table))
+
+    def test_normalize(self):
+        table = StringTable(str.lower)
+        self.assertEqual(0, table.encode("White"))
+        self.assertEqual(0, table.encode("WHITE"))
+        self.assertEqual(1, table.encode("black"))
+        self.assertListEqual(["white", "black"], table.strings)
+        self.assertEqual(1, table.find("Black"))
+        self.assertIsNone(table.find("Red"))
+
+    def test_spellings_bounded(self):
+        table = StringTable(str.lower, str.capitalize, max_spellings=2)
+        for spelling in ("Red", "rEd", "reD", "RED"):
+            self.assertEqual(0, table.encode(spelling))
+        self.assertEqual(0, table.find("RED"))
+        # normalized string plus two spellings
+        self.assertEqual(3, len(table._ids))
+        self.assertEqual("Red", table.label(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import threading
+import unittest
+import urllib.request
+
+from parking_lot import (
+    ConcurrentFourWheelerParkingLotBuilder, FourWheelerParkingLotBuilder,
+    ParkingLotDirector
+)
+from parking_lot.metrics import Histogram, render_prometheus, serve_prometheus_http
+from parking_lot.parking_lot import FourWheelerParkingLot
+from parking_lot.vehicle import Car
+
+
+class TestMetrics(unittest.TestCase):
+    def _build_parking_lot(self, max_four_wheeler_spots):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(max_four_wheeler_spots)
+        return director.get_parking_lot()
+
+    def test_histogram(self):
+        histogram = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(
+            [(1.0, 2), (2.0, 3), (float('inf'), 4)], histogram.cumulative_counts())
+        self.assertEqual(4, histogram.count)
+        self.assertEqual(6.0, histogram.sum)
+
+    def test_counters(self):
+        parking_lot = self._build_parking_lot(2)
+        metrics = parking_lot.enable_metrics()
+        parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White"))
+        parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White"))
+        parking_lot.park_many([
+            Car("KA-01-HH-9999", "Black"), Car("KA-01-HH-9999", "Black"),
+            Car("KA-01-BB-0001", "Red")
+        ])
+        parking_lot.free_up_parking_spot(1)
+        parking_lot.leave_many([1, 2])
+        parking_lot.get_parking_lot_status()
+
+        self.assertEqual(2, metrics.parks)
+        self.assertEqual(2, metrics.leaves)
+        self.assertEqual(1, metrics.rejected_full)
+        self.assertEqual(2, metrics.rejected_duplicate)
+        self.assertEqual(2, metrics.latencies['park'].count)
+        self.assertEqual(1, metrics.latencies['park_many'].count)
+        self.assertEqual(1, metrics.latencies['status'].count)
+
+    def test_concurrent_gates(self):
+        director = ParkingLotDirector(ConcurrentFourWheelerParkingLotBuilder())
+        director.build_parking_lot(64)
+        parking_lot = director.get_parking_lot()
+        metrics = parking_lot.enable_metrics()
+
+        def gate(gate_id):
+            for i in range(500):
+                car = Car(f"KA-{gate_id}-{i}", "White")
+                if parking_lot.allocate_parking_spot(car):
+                    parking_lot.free_up_parking_spot(car.parking_spot.id_)
+
+        threads = [threading.Thread(target=gate, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(2000, metrics.parks)
+        self.assertEqual(2000, metrics.leaves)
+        self.assertEqual(2000, metrics.latencies['park'].count)
+        self.assertEqual(2000, metrics.latencies['leave'].count)
+
+    def test_disable_metrics(self):
+        parking_lot = self._build_parking_lot(2)
+        parking_lot.enable_metrics()
+        parking_lot.disable_metrics()
+        self.assertIsNone(parking_lot.metrics)
+        self.assertIs(FourWheelerParkingLot, type(parking_lot))
+
+    def test_prometheus_export(self):
+        parking_lot = self._build_parking_lot(2)
+        parking_lot.enable_metrics()
+        parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White"))
+        text = render_prometheus([parking_lot, self._build_parking_lot(1)])
+        lot = f'lot="{parking_lot.id_}"'
+        self.assertIn(f'parking_lot_parks_total{{{lot}}} 1\n', text)
+        self.assertIn(f'parking_lot_occupied_spots{{{lot}}} 1\n', text)
+        self.assertIn(
+            f'parking_lot_operation_seconds_bucket{{{lot},operation="park",le="+Inf"}} 1\n',
+            text)
+        self.assertEqual(1, text.count('parking_lot_spots{'))
+
+        server = serve_prometheus_http(lambda: text, port=0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                self.assertEqual(text, response.read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
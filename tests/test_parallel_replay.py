@@ -0,0 +1,152 @@
+import io
+import os
+import tempfile
+import unittest
+
+from parking_lot.command_runner import BatchCommandRunner
+from parking_lot.parallel_replay import (
+    ReplayResult, replay_shards, replay_tagged_command_log, shard_command_logs,
+    shard_tagged_command_log, write_replay_report
+)
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+
+
+class TestParallelReplay(unittest.TestCase):
+    # multi-lot log as run in the shell
+    tagged_log = (
+        "create_parking_lot 1\n"
+        "create_parking_lot 2\n"
+        "park KA-01-HH-1234 White @2\n"
+        "park KA-01-HH-7777 Red\n"
+        "park KA-01-HH-9999 Black @2\n"
+        "\n"
+        "leave 1 @2\n"
+        "exit\n"
+        "park KA-01-BB-0001 Blue\n"
+    )
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self._dir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_shard_tagged_command_log(self):
+        path = self._write('tagged.txt', self.tagged_log)
+        shards = shard_tagged_command_log(path, self._dir.name)
+        self.assertEqual([1, 2], [shard.name for shard in shards])
+        with open(shards[1].path) as f:
+            # blank line repeats last command, nothing runs after exit
+            self.assertEqual(
+                "create_parking_lot 2\n"
+                "park KA-01-HH-1234 White\n"
+                "park KA-01-HH-9999 Black\n"
+                "park KA-01-HH-9999 Black\n"
+                "leave 1\n",
+                f.read()
+            )
+
+        path = self._write('anywhere.txt', "create_parking_lot 1\npark_anywhere KA-01-HH-1234 White\n")
+        with self.assertRaises(Exception):
+            shard_tagged_command_log(path, self._dir.name)
+
+    def test_parallel_replay_matches_serial(self):
+        path = self._write('tagged.txt', self.tagged_log)
+        shards = shard_tagged_command_log(path, self._dir.name)
+        serial = replay_shards(shards, max_workers=1)
+        self.assertEqual(serial, replay_shards(shards, max_workers=2))
+        self.assertEqual(
+            [
+                ReplayResult(
+                    1,
+                    "Created a parking lot with 1 slots\nAllocated slot number: 1\n",
+                    [(1, 'KA-01-HH-7777', 'Red')]),
+                ReplayResult(
+                    2,
+                    "Created a parking lot with 2 slots\nAllocated slot number: 1\n"
+                    "Allocated slot number: 2\nSorry, parking lot is full\n"
+                    "Slot number 1 is free\n",
+                    [(2, 'KA-01-HH-9999', 'Black')]),
+            ],
+            serial
+        )
+
+    def test_lots_created_by_shell(self):
+        path = self._write(
+            'shell.txt',
+            "create_parking_lot 2\ncreate_parking_lot 3\n"
+            "park KA-01-HH-1234 White @2\npark KA-01-HH-9999 Red\nstatus @2\n")
+        FourWheelerParkingLotCommand.reset()
+        self.addCleanup(FourWheelerParkingLotCommand.reset)
+        FourWheelerParkingLotCommand.create_parking_lot(1)
+        parking_lot = FourWheelerParkingLotCommand.get_parking_lot_()
+
+        results = replay_shards(shard_tagged_command_log(path, self._dir.name), 1)
+        self.assertEqual(
+            "Created a parking lot with 3 slots\nAllocated slot number: 1\n"
+            "Slot No.\tRegistration No\t\tColour\n1\t\tKA-01-HH-1234\t\tWhite\n\n",
+            results[1].output)
+        self.assertEqual([(1, 'KA-01-HH-9999', 'Red')], results[0].status)
+        # replay leaves parking-lots of this process alone
+        self.assertIs(parking_lot, FourWheelerParkingLotCommand.get_parking_lot_())
+        # nor does it take lot ids from this process
+        self.assertEqual(
+            parking_lot.id_ + 1, FourWheelerParkingLotCommand.create_parking_lot(1))
+
+    def test_vehicle_moving_between_lots(self):
+        log = (
+            "create_parking_lot 2\ncreate_parking_lot 2\n"
+            "park KA-01-HH-1234 White\n"
+            "park KA-01-HH-1234 White @2\n"
+            "leave 1\n"
+            "park_many KA-01-HH-9999 Red KA-01-HH-1234 White @2\n"
+            "status @2\n"
+        )
+        path = self._write('moving.txt', log)
+        # shard of lot 2 would park the vehicle while lot 1 holds it
+        self.assertIsNone(shard_tagged_command_log(path, self._dir.name))
+
+        results = replay_tagged_command_log(path)
+        self.assertEqual([1, 2], [result.name for result in results])
+        self.assertEqual([], results[0].status)
+        self.assertEqual(
+            [(1, 'KA-01-HH-9999', 'Red'), (2, 'KA-01-HH-1234', 'White')],
+            results[1].status)
+        # per-lot outputs are the shell's output, split by lot
+        out = io.StringIO()
+        with FourWheelerParkingLotCommand.isolated_state():
+            BatchCommandRunner(out).run(log.splitlines())
+        shell_lines = out.getvalue().splitlines()
+        self.assertEqual(
+            [shell_lines[i] for i in (0, 2, 4)], results[0].output.splitlines())
+        self.assertEqual(
+            [shell_lines[i] for i in (1, 3, 5, 6, 7, 8, 9, 10)],
+            results[1].output.splitlines())
+
+    def test_command_logs_report(self):
+        paths = [
+            self._write('b.txt', "create_parking_lot 1\npark KA-01-HH-1234 White\n"),
+            self._write('a.txt', "create_parking_lot 1\n"),
+        ]
+        out = io.StringIO()
+        write_replay_report(replay_shards(shard_command_logs(paths), 1), out)
+        self.assertEqual(
+            f"=== lot {paths[0]} output ===\n"
+            "Created a parking lot with 1 slots\nAllocated slot number: 1\n"
+            f"=== lot {paths[1]} output ===\n"
+            "Created a parking lot with 1 slots\n"
+            f"=== lot {paths[0]} final state ===\n"
+            "Parked vehicles: 1\n"
+            "1\t\tKA-01-HH-1234\t\tWhite\n"
+            f"=== lot {paths[1]} final state ===\n"
+            "Parked vehicles: 0\n",
+            out.getvalue()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
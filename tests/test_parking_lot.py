@@ -2,9 +2,11 @@ from collections import defaultdict
 import unittest
 
 from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
-from parking_lot.parking_spot import FourWheelerSpot, ParkingSpot
+from parking_lot.constants import ParkingSpotType, ParkOutcome, VehicleType
+from parking_lot.interning import COLORS
+from parking_lot.parking_spot import FourWheelerSpot, ParkingSpot, TwoWheelerSpot
 from parking_lot.parking_ticket import FourWheelerParkingTicket, ParkingTicket
-from parking_lot.vehicle import Car
+from parking_lot.vehicle import Car, Motorbike, Truck, Van
 
 
 class TestParkingLot(unittest.TestCase):
@@ -138,3 +140,215 @@ class TestParkingLot(unittest.TestCase):
 
         status = parking_lot.get_parking_lot_status()
         self.assertListEqual(expected_results, status)
+
+    def test_allocate_lowest_free_parking_spot(self):
+        four_wheeler_parking_lot_builder = FourWheelerParkingLotBuilder()
+        director = ParkingLotDirector(four_wheeler_parking_lot_builder)
+        director.build_parking_lot(6)
+        parking_lot = director.get_parking_lot()
+        cars = [Car(*config) for config in TestParkingLot.cars_config]
+        for car in cars:
+            parking_lot.allocate_parking_spot(car)
+        self.assertFalse(parking_lot.allocate_parking_spot(Car("DUMMY3", "Red")))
+
+        parking_lot.free_up_parking_spot(5)
+        parking_lot.free_up_parking_spot(2)
+        car = Car("DUMMY4", "Red")
+        parking_lot.allocate_parking_spot(car)
+        self.assertEqual(2, car.parking_spot.id_)
+        car = Car("DUMMY5", "Red")
+        parking_lot.allocate_parking_spot(car)
+        self.assertEqual(5, car.parking_spot.id_)
+
+    def test_iter_parking_lot_status(self):
+        four_wheeler_parking_lot_builder = FourWheelerParkingLotBuilder()
+        director = ParkingLotDirector(four_wheeler_parking_lot_builder)
+        director.build_parking_lot(10)
+        parking_lot = director.get_parking_lot()
+        for config in TestParkingLot.cars_config:
+            parking_lot.allocate_parking_spot(Car(*config))
+        parking_lot.free_up_parking_spot(2)
+        parking_lot.free_up_parking_spot(5)
+
+        self.assertListEqual(
+            [1, 3, 4, 6], [r[0] for r in parking_lot.iter_parking_lot_status()])
+        self.assertListEqual(
+            [(3, "KA-01-BB-0001", "Black"), (4, "KA-01-HH-7777", "Red")],
+            list(parking_lot.iter_parking_lot_status(1, 2))
+        )
+        self.assertListEqual([], list(parking_lot.iter_parking_lot_status(4)))
+        self.assertListEqual([], list(parking_lot.iter_parking_lot_status(-1, 2)))
+        self.assertListEqual([], list(parking_lot.iter_parking_lot_status(0, -1)))
+
+    def test_park_many_leave_many(self):
+        four_wheeler_parking_lot_builder = FourWheelerParkingLotBuilder()
+        director = ParkingLotDirector(four_wheeler_parking_lot_builder)
+        director.build_parking_lot(4)
+        parking_lot = director.get_parking_lot()
+        cars = [Car(*config) for config in TestParkingLot.cars_config]
+        # duplicate registration number within the burst
+        cars.insert(1, Car("KA-01-HH-1234", "White"))
+
+        parked, duplicate, full = ParkOutcome.PARKED, ParkOutcome.DUPLICATE, ParkOutcome.FULL
+        self.assertListEqual(
+            [parked, duplicate, parked, parked, parked, full, full],
+            parking_lot.park_many(cars)
+        )
+        self.assertListEqual(
+            [1, 2, 3, 4], [r[0] for r in parking_lot.iter_parking_lot_status()])
+        self.assertIsNone(cars[1].parking_spot)
+
+        self.assertListEqual(
+            [True, True, False, False], parking_lot.leave_many([3, 1, 3, 11]))
+        self.assertIsNone(cars[0].parking_spot)
+        self.assertListEqual(
+            [2, 4], [r[0] for r in parking_lot.iter_parking_lot_status()])
+
+        car = Car("DUMMY6", "Red")
+        self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertEqual(1, car.parking_spot.id_)
+        self.assertListEqual(
+            [parked, duplicate], parking_lot.park_many([cars[5], cars[2]]))
+        self.assertEqual(3, cars[5].parking_spot.id_)
+
+    def test_color_queries_in_spot_order(self):
+        four_wheeler_parking_lot_builder = FourWheelerParkingLotBuilder()
+        director = ParkingLotDirector(four_wheeler_parking_lot_builder)
+        director.build_parking_lot(10)
+        parking_lot = director.get_parking_lot()
+        for config in TestParkingLot.cars_config:
+            parking_lot.allocate_parking_spot(Car(*config))
+        parking_lot.free_up_parking_spot(1)
+        parking_lot.allocate_parking_spot(Car("KA-01-P-333", "White"))
+        parking_lot.allocate_parking_spot(Car("DL-12-AA-9999", "White"))
+
+        self.assertListEqual(
+            [1, 2, 7],
+            parking_lot.get_parking_spot_numbers_of_vehicles_with_color("White"))
+        self.assertListEqual(
+            ["KA-01-P-333", "KA-01-HH-9999", "DL-12-AA-9999"],
+            parking_lot.get_registration_numbers_of_vehicle_with_color("WHITE"))
+        self.assertListEqual(
+            [3, 6], parking_lot.get_parking_spot_numbers_of_vehicles_with_color("black"))
+
+        parking_lot.free_up_parking_spot(4)
+        self.assertListEqual(
+            [], parking_lot.get_parking_spot_numbers_of_vehicles_with_color("Red"))
+        self.assertIsNotNone(COLORS.find("red"))
+        self.assertNotIn(COLORS.find("red"), parking_lot.color_spots_map)
+
+    def test_registration_prefix(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(10)
+        parking_lot = director.get_parking_lot()
+        for config in TestParkingLot.cars_config:
+            parking_lot.allocate_parking_spot(Car(*config))
+        parking_lot.allocate_parking_spot(Car("DL-12-AA-9999", "White"))
+        parking_lot.allocate_parking_spot(Car("KA-011-X-1", "White"))
+
+        self.assertListEqual(
+            [1, 2, 3, 4, 5, 6, 8],
+            parking_lot.get_parking_spot_numbers_of_registration_prefix("KA-01"))
+        self.assertListEqual(
+            [1, 2, 4, 5, 6],
+            parking_lot.get_parking_spot_numbers_of_registration_prefix("ka-01-hh"))
+        parking_lot.free_up_parking_spot(2)
+        self.assertListEqual(
+            [1, 4, 5, 6],
+            parking_lot.get_parking_spot_numbers_of_registration_prefix("KA-01-HH"))
+        self.assertListEqual(
+            [7], parking_lot.get_parking_spot_numbers_of_registration_prefix("DL"))
+        self.assertListEqual(
+            [], parking_lot.get_parking_spot_numbers_of_registration_prefix("MH"))
+
+    def test_vehicle_types(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2, spot_counts={
+            ParkingSpotType.TWO_WHEELER: 1, ParkingSpotType.LARGE: 1})
+        parking_lot = director.get_parking_lot()
+        self.assertEqual(4, parking_lot.max_spots())
+        self.assertEqual(0, parking_lot.max_spots(ParkingSpotType.HEAVY))
+
+        # two-wheeler parking-spots follow four-wheeler ones
+        bike = Motorbike("KA-01-M-0001", "Red")
+        self.assertTrue(parking_lot.allocate_parking_spot(bike))
+        self.assertIsInstance(bike.parking_spot, TwoWheelerSpot)
+        self.assertEqual(3, bike.parking_spot.id_)
+        # motorbike falls back to a four-wheeler parking-spot
+        bike = Motorbike("KA-01-M-0002", "Red")
+        self.assertTrue(parking_lot.allocate_parking_spot(bike))
+        self.assertEqual(1, bike.parking_spot.id_)
+        self.assertEqual(1, parking_lot.available_four_wheeler_spots)
+
+        van = Van("KA-01-V-0001", "White")
+        self.assertTrue(parking_lot.allocate_parking_spot(van))
+        self.assertEqual(4, van.parking_spot.id_)
+        self.assertFalse(parking_lot.allocate_parking_spot(Van("KA-01-V-0002", "White")))
+        self.assertFalse(parking_lot.allocate_parking_spot(Truck("KA-01-T-0001", "Blue")))
+        self.assertTrue(parking_lot.allocate_parking_spot(Car("KA-01-HH-1234", "White")))
+        self.assertEqual(0, parking_lot.available_spots())
+
+        # freed parking-spot goes back to its own type's pool
+        parking_lot.free_up_parking_spot(3)
+        self.assertEqual(1, parking_lot.available_spots(ParkingSpotType.TWO_WHEELER))
+        self.assertFalse(parking_lot.allocate_parking_spot(Car("KA-01-HH-9999", "Red")))
+        self.assertListEqual(
+            [1, 2, 4], [r[0] for r in parking_lot.iter_parking_lot_status()])
+        self.assertListEqual(
+            [1], parking_lot.get_parking_spot_numbers_of_vehicles_with_color("Red"))
+
+    def test_invalid_vehicle_type(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2, spot_type_rules={
+            VehicleType.CAR: (ParkingSpotType.FOUR_WHEELER,)})
+        parking_lot = director.get_parking_lot()
+        with self.assertRaises(Exception):
+            parking_lot.allocate_parking_spot(Motorbike("KA-01-M-0003", "Red"))
+
+    def test_expand_and_shrink(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2)
+        parking_lot = director.get_parking_lot()
+        parking_lot.enable_reservations(clock=lambda: 0)
+        for config in TestParkingLot.cars_config[:2]:
+            parking_lot.allocate_parking_spot(Car(*config))
+        parking_lot.expand_parking_lot(3)
+        self.assertEqual(5, parking_lot.max_four_wheeler_spots)
+        self.assertEqual(3, parking_lot.available_four_wheeler_spots)
+        car = Car("KA-01-BB-0001", "Black")
+        self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertEqual(3, car.parking_spot.id_)
+        self.assertIsNotNone(parking_lot.reserve_parking_spot("KA-01-HH-7777", 10, 20, 5))
+
+        # taken or reserved parking-spots are not retired
+        self.assertFalse(parking_lot.shrink_parking_lot(3))
+        self.assertFalse(parking_lot.shrink_parking_lot(1))
+        parking_lot.cancel_reservation(1)
+        self.assertTrue(parking_lot.shrink_parking_lot(2))
+        self.assertEqual(3, parking_lot.max_spots())
+        self.assertEqual(0, parking_lot.available_four_wheeler_spots)
+        self.assertFalse(parking_lot.allocate_parking_spot(Car("KA-01-HH-2701", "Blue")))
+        self.assertIsNone(parking_lot.reserve_parking_spot("KA-01-HH-7777", 10, 20, 4))
+
+        parking_lot.free_up_parking_spot(3)
+        self.assertTrue(parking_lot.shrink_parking_lot(1))
+        self.assertEqual(2, parking_lot.max_spots())
+        with self.assertRaises(Exception):
+            parking_lot.shrink_parking_lot(4)
+
+    def test_resize_only_last_block(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2, spot_counts={ParkingSpotType.LARGE: 1})
+        parking_lot = director.get_parking_lot()
+        self.assertFalse(parking_lot.is_resizable())
+        with self.assertRaises(Exception):
+            parking_lot.expand_parking_lot(1)
+
+        parking_lot.expand_parking_lot(2, ParkingSpotType.LARGE)
+        van = Van("KA-01-V-0001", "White")
+        parking_lot.allocate_parking_spot(van)
+        parking_lot.allocate_parking_spot(Van("KA-01-V-0002", "White"))
+        self.assertEqual(3, van.parking_spot.id_)
+        self.assertEqual(1, parking_lot.available_spots(ParkingSpotType.LARGE))
+        self.assertTrue(parking_lot.shrink_parking_lot(1, ParkingSpotType.LARGE))
+        self.assertEqual(4, parking_lot.max_spots())
@@ -0,0 +1,61 @@
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.parking_lot_registry import ParkingLotRegistry
+from parking_lot.vehicle import Car
+
+
+class TestParkingLotRegistry(unittest.TestCase):
+    def _build_parking_lot(self, max_four_wheeler_spots):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(max_four_wheeler_spots)
+        return director.get_parking_lot()
+
+    def setUp(self):
+        self.small_parking_lot = self._build_parking_lot(1)
+        self.big_parking_lot = self._build_parking_lot(3)
+        self.registry = ParkingLotRegistry()
+        self.registry.register(self.small_parking_lot)
+        self.registry.register(self.big_parking_lot)
+
+    def test_park_routes_to_emptiest_parking_lot(self):
+        registry = self.registry
+        big_id, small_id = self.big_parking_lot.id_, self.small_parking_lot.id_
+        self.assertEqual(big_id, registry.park(Car("KA-01-HH-1234", "White")))
+        self.assertEqual(big_id, registry.park(Car("KA-01-HH-9999", "White")))
+        # tie on 1 free spot goes to lowest parking-lot id
+        self.assertEqual(
+            min(big_id, small_id), registry.park(Car("KA-01-BB-0001", "Black")))
+        self.assertIsNotNone(registry.park(Car("KA-01-HH-7777", "Red")))
+        self.assertIsNone(registry.park(Car("KA-01-HH-2701", "Blue")))
+        self.assertIsNone(registry.get_emptiest_parking_lot_id())
+
+    def test_parking_spots_held_for_reservations(self):
+        registry = self.registry
+        now_ns = 100
+        self.big_parking_lot.enable_reservations(lead_time_ns=10, clock=lambda: now_ns)
+        # held right away, without any event
+        self.big_parking_lot.reserve_parking_spot("KA-01-HH-1234", 105, 200)
+        self.big_parking_lot.reserve_parking_spot("KA-01-HH-9999", 105, 200)
+        self.assertEqual(self.big_parking_lot.id_, registry.park(Car("KA-01-BB-0001", "Black")))
+        self.assertEqual(self.small_parking_lot.id_, registry.park(Car("KA-01-HH-7777", "Red")))
+        self.assertIsNone(registry.park(Car("KA-01-HH-2701", "Blue")))
+
+    def test_vehicle_parked_in_one_parking_lot(self):
+        registry = self.registry
+        small_id = self.small_parking_lot.id_
+        self.assertEqual(small_id, registry.park(Car("KA-01-HH-1234", "White"), small_id))
+        self.assertIsNone(
+            registry.park(Car("KA-01-HH-1234", "White"), self.big_parking_lot.id_))
+        self.assertEqual((small_id, 1), registry.locate_vehicle("ka-01-hh-1234"))
+
+        # leaving directly on parking-lot keeps registry in sync
+        self.small_parking_lot.free_up_parking_spot(1)
+        self.assertIsNone(registry.locate_vehicle("KA-01-HH-1234"))
+        self.assertEqual(small_id, registry.park(Car("KA-01-HH-1234", "White"), small_id))
+        self.assertTrue(registry.leave(1, small_id))
+        self.assertFalse(registry.leave(1, small_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import os
+import tempfile
+import time
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.constants import ParkingLotEvent, ParkingSpotType, VehicleType
+from parking_lot.persistence import (
+    ParkingLotJournal, iter_journal, read_snapshot, read_snapshot_journal_offset,
+    restore_parking_lot, write_snapshot
+)
+from parking_lot.vehicle import Car, Motorbike, Van
+
+
+class TestPersistence(unittest.TestCase):
+    cars_config = (
+        ("KA-01-HH-1234", "White"), 
+        ("KA-01-HH-9999", "White"), 
+        ("KA-01-BB-0001", "Black"), 
+        ("KA-01-HH-7777", "Red"), 
+    )
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self._tmp_dir.name, 'lot.snapshot')
+        self.journal_path = os.path.join(self._tmp_dir.name, 'lot.journal')
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _build_parking_lot(self, max_four_wheeler_spots):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(max_four_wheeler_spots)
+        return director.get_parking_lot()
+
+    def test_snapshot(self):
+        parking_lot = self._build_parking_lot(5)
+        for config in TestPersistence.cars_config:
+            parking_lot.allocate_parking_spot(Car(*config))
+        parking_lot.free_up_parking_spot(2)
+        write_snapshot(parking_lot, self.snapshot_path)
+
+        spot_counts, journal_offset, __, records = read_snapshot(self.snapshot_path)
+        self.assertEqual(5, spot_counts[ParkingSpotType.FOUR_WHEELER])
+        self.assertEqual(0, journal_offset)
+        self.assertListEqual(
+            [(1, "KA-01-HH-1234", "white"), (3, "KA-01-BB-0001", "black"),
+             (4, "KA-01-HH-7777", "red")],
+            [(r[0], r[3], r[4]) for r in records]
+        )
+
+        restored = restore_parking_lot(self.snapshot_path)
+        self.assertListEqual(
+            parking_lot.get_parking_lot_status(), restored.get_parking_lot_status())
+        car = Car("DUMMY1", "Blue")
+        restored.allocate_parking_spot(car)
+        self.assertEqual(2, car.parking_spot.id_)
+        self.assertGreater(car.ticket.id_, records[-1][1])
+
+    def test_vehicle_types(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2, spot_counts={
+            ParkingSpotType.TWO_WHEELER: 1, ParkingSpotType.LARGE: 1})
+        parking_lot = director.get_parking_lot()
+        journal = ParkingLotJournal(self.journal_path)
+        parking_lot.add_event_listener(journal)
+        parking_lot.allocate_parking_spot(Motorbike("KA-01-M-0001", "Red"))
+        write_snapshot(parking_lot, self.snapshot_path, journal)
+        parking_lot.allocate_parking_spot(Motorbike("KA-01-M-0002", "Red"))
+        parking_lot.allocate_parking_spot(Van("KA-01-V-0001", "White"))
+        journal.close()
+
+        spot_counts, __, __, records = read_snapshot(self.snapshot_path)
+        self.assertEqual(1, spot_counts[ParkingSpotType.LARGE])
+        self.assertEqual(0, spot_counts[ParkingSpotType.HEAVY])
+        self.assertEqual(VehicleType.MOTORBIKE, records[0][5])
+        self.assertListEqual(
+            [VehicleType.MOTORBIKE, VehicleType.MOTORBIKE, VehicleType.VAN],
+            [r[6] for r in iter_journal(self.journal_path)])
+
+        restored = restore_parking_lot(self.snapshot_path, self.journal_path)
+        self.assertListEqual(
+            parking_lot.get_parking_lot_status(), restored.get_parking_lot_status())
+        self.assertEqual(0, restored.available_spots(ParkingSpotType.TWO_WHEELER))
+        self.assertEqual(0, restored.available_spots(ParkingSpotType.LARGE))
+        self.assertEqual(1, restored.available_four_wheeler_spots)
+
+    def test_journal_tail_replay(self):
+        parking_lot = self._build_parking_lot(5)
+        journal = ParkingLotJournal(self.journal_path, group_size=2)
+        parking_lot.add_event_listener(journal)
+        cars = [Car(*config) for config in TestPersistence.cars_config]
+        parking_lot.allocate_parking_spot(cars[0])
+        parking_lot.allocate_parking_spot(cars[1])
+        write_snapshot(parking_lot, self.snapshot_path, journal)
+
+        parking_lot.allocate_parking_spot(cars[2])
+        parking_lot.free_up_parking_spot(1)
+        parking_lot.allocate_parking_spot(cars[3])
+        journal.close()
+
+        journal_offset = read_snapshot(self.snapshot_path)[1]
+        self.assertEqual(journal_offset, read_snapshot_journal_offset(self.snapshot_path))
+        events = [
+            (r[0], r[1], r[4])
+            for r in iter_journal(self.journal_path, journal_offset)
+        ]
+        self.assertListEqual(
+            [
+                (ParkingLotEvent.PARK, 3, "KA-01-BB-0001"),
+                (ParkingLotEvent.UNPARK, 1, "KA-01-HH-1234"),
+                (ParkingLotEvent.PARK, 1, "KA-01-HH-7777"),
+            ],
+            events
+        )
+
+        restored = restore_parking_lot(self.snapshot_path, self.journal_path)
+        self.assertListEqual(
+            parking_lot.get_parking_lot_status(), restored.get_parking_lot_status())
+        self.assertListEqual(
+            [1], restored.get_parking_spot_numbers_of_vehicles_with_color("red"))
+
+    def test_torn_journal_tail(self):
+        journal = ParkingLotJournal(self.journal_path)
+        journal.append(ParkingLotEvent.PARK, 1, 1, 0, "KA-01-HH-1234", "white")
+        journal.append(ParkingLotEvent.PARK, 2, 2, 0, "KA-01-HH-9999", "white")
+        journal.close()
+        with open(self.journal_path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.journal_path) - 3)
+        self.assertEqual(1, len(list(iter_journal(self.journal_path))))
+
+        # records appended after restart follow last complete record
+        journal = ParkingLotJournal(self.journal_path)
+        journal.append(ParkingLotEvent.PARK, 3, 3, 0, "KA-01-BB-0001", "black")
+        journal.close()
+        self.assertListEqual(
+            ["KA-01-HH-1234", "KA-01-BB-0001"],
+            [r[4] for r in iter_journal(self.journal_path)])
+
+    def test_idle_group_committed(self):
+        journal = ParkingLotJournal(self.journal_path, group_size=100, group_interval=0.01)
+        journal.commit()
+        journal.append(ParkingLotEvent.PARK, 1, 1, 0, "KA-01-HH-1234", "white")
+        journal.append(ParkingLotEvent.PARK, 2, 2, 0, "KA-01-HH-9999", "white")
+        # no further event comes to commit the group
+        for __ in range(100):
+            if len(list(iter_journal(self.journal_path))) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(2, len(list(iter_journal(self.journal_path))))
+        journal.close()
+
+    def test_restored_entry_time(self):
+        parking_lot = self._build_parking_lot(2)
+        car = Car(*TestPersistence.cars_config[0])
+        parking_lot.allocate_parking_spot(car)
+        write_snapshot(parking_lot, self.snapshot_path)
+
+        restored = restore_parking_lot(self.snapshot_path)
+        ticket_ledger = restored.ticket_ledger
+        self.assertEqual(
+            car.ticket.entry_time_ns,
+            ticket_ledger.get_entry(0).entry_time_ns + ticket_ledger.wall_clock_offset_ns)
@@ -0,0 +1,78 @@
+import io
+import os
+import pstats
+import tempfile
+import unittest
+
+from parking_lot.command_runner import BatchCommandRunner, ProfilingBatchCommandRunner
+from parking_lot.parking_lot_command import FourWheelerParkingLotCommand
+from parking_lot.profiling import CommandProfiler, StackSampler
+
+
+class TestProfiling(unittest.TestCase):
+    lines = [
+        "create_parking_lot 2",
+        "park KA-01-HH-1234 White",
+        "park KA-01-HH-9999 Black",
+        "status",
+        "leave 1",
+        "status",
+    ]
+
+    def setUp(self):
+        FourWheelerParkingLotCommand.reset()
+
+    def tearDown(self):
+        FourWheelerParkingLotCommand.reset()
+
+    def test_profiled_output_matches_batch(self):
+        out = io.StringIO()
+        BatchCommandRunner(out).run(self.lines)
+        FourWheelerParkingLotCommand.reset()
+
+        profiler = CommandProfiler(CommandProfiler.FULL)
+        profiled_out = io.StringIO()
+        ProfilingBatchCommandRunner(profiled_out, profiler).run(self.lines)
+        self.assertEqual(out.getvalue(), profiled_out.getvalue())
+
+        report = io.StringIO()
+        profiler.write_phase_report(report)
+        rows = {
+            line.split()[0]: line.split()[1]
+            for line in report.getvalue().splitlines()[1:]
+        }
+        self.assertEqual({'create_parking_lot': '1', 'park': '2', 'status': '2', 'leave': '1'}, rows)
+
+    def test_stack_sampler(self):
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        try:
+            while sampler.samples < 5:
+                sum(i * i for i in range(10000))
+        finally:
+            sampler.stop()
+        out = io.StringIO()
+        sampler.write_collapsed(out)
+        stack, count = out.getvalue().splitlines()[0].rsplit(' ', 1)
+        self.assertIn('test_profiling.py:test_stack_sampler', stack)
+        self.assertGreater(int(count), 0)
+
+    def test_write_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            prefix = os.path.join(tmp_dir, 'profile')
+            profiler = CommandProfiler(CommandProfiler.FULL, prefix)
+            profiler.start()
+            ProfilingBatchCommandRunner(io.StringIO(), profiler).run(self.lines)
+            profiler.stop()
+            self.assertEqual(
+                [prefix + '.collapsed', prefix + '.pstats', prefix + '.phases.txt'],
+                profiler.write_output())
+            pstats.Stats(prefix + '.pstats')
+
+            profiler = CommandProfiler(CommandProfiler.SAMPLE, prefix)
+            self.assertFalse(profiler.is_timing_phases)
+            self.assertEqual([prefix + '.collapsed'], profiler.write_output())
+
+
+if __name__ == '__main__':
+    unittest.main()
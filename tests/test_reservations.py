@@ -0,0 +1,220 @@
+import random
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.reservations import GapIndex, ReservationBook, SpotIdSet
+from parking_lot.vehicle import Car
+
+
+class TestReservationBook(unittest.TestCase):
+    def test_spot_windows(self):
+        book = ReservationBook(2)
+        reservation = book.reserve("KA-01-HH-1234", 10, 20, 1)
+        self.assertEqual(1, reservation.id_)
+        self.assertFalse(book.is_spot_free(1, 15, 25))
+        self.assertFalse(book.is_spot_free(1, 5, 11))
+        self.assertTrue(book.is_spot_free(1, 20, 30))
+        self.assertTrue(book.is_spot_free(1, 0, 10))
+        self.assertIsNone(book.reserve("KA-01-HH-9999", 19, 21, 1))
+        self.assertIsNone(book.reserve("KA-01-HH-9999", 1, 2, 3))
+
+        # reserved parking-spot is packed first, then lowest unreserved one
+        self.assertEqual(1, book.reserve("KA-01-HH-9999", 20, 30).spot_id)
+        self.assertEqual(2, book.reserve("KA-01-BB-0001", 15, 25).spot_id)
+        self.assertIsNone(book.find_free_spot(18, 22))
+        self.assertIn(book.find_free_spot(0, 10), (1, 2))
+
+        self.assertEqual(reservation, book.cancel(1))
+        self.assertIsNone(book.cancel(1))
+        self.assertEqual(1, book.find_free_spot(18, 19))
+        self.assertEqual(2, len(book))
+
+    def test_pop_starting_and_ended(self):
+        book = ReservationBook(3)
+        for start in (30, 10, 20):
+            book.reserve("KA-01-HH-1234", start, start + 15)
+        book.cancel(3)
+        self.assertListEqual([10, 30], [r.start_ns for r in book.pop_starting(30)])
+        self.assertListEqual([], book.pop_starting(30))
+        self.assertListEqual([], book.pop_ended(24))
+        self.assertListEqual([10], [r.start_ns for r in book.pop_ended(25)])
+        self.assertIsNone(book.get(2))
+        self.assertEqual(1, len(book))
+        self.assertTrue(book.is_spot_free(1, 10, 25))
+
+    def test_against_brute_force(self):
+        GapIndex.LOAD, load = 4, GapIndex.LOAD
+        try:
+            rng = random.Random(3)
+            book = ReservationBook(8)
+            booked = {}
+            taken = set()
+
+            def is_free(spot_id, start, end):
+                return all(
+                    s != spot_id or e <= start or end <= b
+                    for s, b, e in booked.values())
+
+            for __ in range(3000):
+                start = rng.randrange(200)
+                end = start + rng.randint(1, 40)
+                if rng.random() < 0.2:
+                    spot_id = rng.randint(1, 8)
+                    taken ^= {spot_id}
+                    book.set_spot_taken(spot_id, spot_id in taken)
+                vacant_spot_id = book.find_free_spot(start, end, vacant_only=True)
+                if vacant_spot_id is None:
+                    self.assertFalse(any(
+                        is_free(s, start, end) for s in range(1, 9) if s not in taken))
+                else:
+                    self.assertNotIn(vacant_spot_id, taken)
+                    self.assertTrue(is_free(vacant_spot_id, start, end))
+                if rng.random() < 0.3 and booked:
+                    reservation_id = rng.choice(list(booked))
+                    book.cancel(reservation_id)
+                    del booked[reservation_id]
+                    continue
+                spot_id = rng.choice((None, rng.randint(1, 8)))
+                reservation = book.reserve("KA-01-HH-1234", start, end, spot_id)
+                if spot_id is None:
+                    free = any(is_free(s, start, end) for s in range(1, 9))
+                else:
+                    free = is_free(spot_id, start, end)
+                self.assertEqual(free, reservation is not None)
+                if reservation is not None:
+                    self.assertTrue(is_free(reservation.spot_id, start, end))
+                    booked[reservation.id_] = (reservation.spot_id, start, end)
+            self.assertEqual(len(booked), len(book))
+        finally:
+            GapIndex.LOAD = load
+
+    def test_vacant_spots(self):
+        book = ReservationBook(4)
+        book.reserve("KA-01-HH-1234", 10, 20, 3)
+        book.set_spot_taken(3, True)
+        book.set_spot_taken(1, True)
+        self.assertEqual(3, book.find_free_spot(30, 40))
+        self.assertEqual(2, book.find_free_spot(30, 40, vacant_only=True))
+        book.set_spot_taken(3, False)
+        self.assertEqual(3, book.find_free_spot(30, 40, vacant_only=True))
+
+        # parking-spot whose reservations left the book is vacant again
+        book.set_spot_taken(2, True)
+        book.set_spot_taken(3, True)
+        self.assertEqual(4, book.find_free_spot(30, 40, vacant_only=True))
+        book.cancel(1)
+        book.set_spot_taken(3, False)
+        self.assertEqual(3, book.find_free_spot(30, 40, vacant_only=True))
+
+
+class TestSpotIdSet(unittest.TestCase):
+    def test_tail_and_stored_ids(self):
+        spot_ids = SpotIdSet(5)
+        self.assertEqual(1, spot_ids.first())
+        spot_ids.discard(1)
+        spot_ids.discard(4)
+        self.assertEqual(2, spot_ids.first())
+        self.assertNotIn(4, spot_ids)
+        self.assertIn(5, spot_ids)
+        for spot_id in (2, 3, 5):
+            spot_ids.discard(spot_id)
+        self.assertIsNone(spot_ids.first())
+
+        spot_ids.add(4)
+        spot_ids.resize(7)
+        self.assertListEqual([4, 6, 7], [s for s in range(1, 8) if s in spot_ids])
+        spot_ids.resize(3)
+        self.assertIsNone(spot_ids.first())
+
+
+class TestParkingLotReservations(unittest.TestCase):
+    def setUp(self):
+        self.now_ns = 100
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2)
+        self.parking_lot = director.get_parking_lot()
+        self.parking_lot.enable_reservations(
+            lead_time_ns=10, clock=lambda: self.now_ns)
+
+    def test_held_spot_and_walk_ins(self):
+        parking_lot = self.parking_lot
+        reservation = parking_lot.reserve_parking_spot("KA-01-HH-1234", 200, 300, 1)
+        self.assertFalse(parking_lot.is_spot_free_between(1, 250, 260))
+        self.assertEqual(2, parking_lot.find_spot_free_between(250, 260))
+
+        # walk-ins outside reservation's window may take it
+        car = Car("KA-01-HH-9999", "White")
+        self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertEqual(1, car.parking_spot.id_)
+        parking_lot.free_up_parking_spot(1)
+
+        # held from lead time before start
+        self.now_ns = 190
+        car = Car("KA-01-BB-0001", "Black")
+        self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertEqual(2, car.parking_spot.id_)
+        self.assertEqual(0, parking_lot.available_four_wheeler_spots)
+        self.assertFalse(parking_lot.allocate_parking_spot(Car("KA-01-HH-7777", "Red")))
+
+        car = Car("KA-01-HH-1234", "White")
+        self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertEqual(1, car.parking_spot.id_)
+        parking_lot.free_up_parking_spot(1)
+        self.assertEqual(1, parking_lot.available_four_wheeler_spots)
+        self.assertIsNone(parking_lot.cancel_reservation(reservation.id_ + 1))
+
+    def test_cancel_and_end_give_spot_back(self):
+        parking_lot = self.parking_lot
+        first = parking_lot.reserve_parking_spot("KA-01-HH-1234", 105, 200)
+        second = parking_lot.reserve_parking_spot("KA-01-HH-9999", 105, 150)
+        self.assertEqual(0, parking_lot.available_four_wheeler_spots)
+        parking_lot.cancel_reservation(first.id_)
+        self.assertEqual(1, parking_lot.available_four_wheeler_spots)
+
+        self.now_ns = 150
+        car = Car("KA-01-HH-7777", "Red")
+        self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertTrue(parking_lot.allocate_parking_spot(Car("KA-01-HH-2701", "Blue")))
+        self.assertSetEqual(
+            {first.spot_id, second.spot_id},
+            {int(r[0]) for r in parking_lot.iter_parking_lot_status()})
+
+    def test_spot_taken_by_walk_in(self):
+        parking_lot = self.parking_lot
+        car = Car("KA-01-HH-9999", "White")
+        parking_lot.allocate_parking_spot(car)
+        parking_lot.reserve_parking_spot("KA-01-HH-1234", 150, 300, 1)
+
+        # reserved car comes while walk-in still holds its parking-spot
+        self.now_ns = 160
+        reserved_car = Car("KA-01-HH-1234", "Black")
+        self.assertTrue(parking_lot.allocate_parking_spot(reserved_car))
+        self.assertEqual(2, reserved_car.parking_spot.id_)
+        parking_lot.free_up_parking_spot(1)
+        self.assertEqual(1, parking_lot.available_four_wheeler_spots)
+
+    def test_spot_taken_now_is_not_held(self):
+        parking_lot = self.parking_lot
+        parking_lot.allocate_parking_spot(Car("KA-01-HH-9999", "White"))
+        # held from now on, walk-in's parking-spot is passed over
+        self.assertEqual(2, parking_lot.reserve_parking_spot("KA-01-HH-1234", 105, 200).spot_id)
+        self.assertIsNone(parking_lot.reserve_parking_spot("KA-01-BB-0001", 105, 200))
+        # held later, walk-in may be gone by then
+        self.assertEqual(1, parking_lot.reserve_parking_spot("KA-01-BB-0001", 150, 200).spot_id)
+
+    def test_queries_leave_reservations_disabled(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2)
+        parking_lot = director.get_parking_lot()
+        self.assertTrue(parking_lot.is_spot_free_between(2, 10, 20))
+        self.assertFalse(parking_lot.is_spot_free_between(3, 10, 20))
+        self.assertFalse(parking_lot.is_spot_free_between(1, 20, 10))
+        self.assertEqual(1, parking_lot.find_spot_free_between(10, 20))
+        self.assertIsNone(parking_lot.find_spot_free_between(20, 20))
+        self.assertIsNone(parking_lot.reservations)
+
+    def test_invalid_window(self):
+        with self.assertRaises(Exception):
+            self.parking_lot.reserve_parking_spot("KA-01-HH-1234", 50, 300)
+        with self.assertRaises(Exception):
+            self.parking_lot.reserve_parking_spot("KA-01-HH-1234", 300, 300)
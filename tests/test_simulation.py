@@ -0,0 +1,70 @@
+import io
+import os
+import tempfile
+import unittest
+
+from parking_lot.simulation import (
+    SimulationConfig, SimulationResult, read_trace, simulate,
+    sweep_capacities, write_simulation_report
+)
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def _write_trace(self, content):
+        path = os.path.join(self._dir.name, 'trace.csv')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_trace(self):
+        # second car finds lot full, third one comes as first one leaves
+        path = self._write_trace(
+            "# arrival seconds,dwell seconds\n"
+            "0,600\n"
+            "300,600\n"
+            "600,300\n"
+            "1200,300\n"
+        )
+        self.assertEqual(
+            SimulationResult(
+                capacity=1, arrivals=4, rejected=1, mean_occupancy=0.8,
+                p95_occupancy=1, peak_occupancy=1, full_time_share=0.8,
+                mean_dwell_minutes=20 / 3),
+            simulate(SimulationConfig(capacity=1, trace_path=path))
+        )
+
+        path = self._write_trace("10,60\n5,60\n")
+        with self.assertRaises(Exception):
+            list(read_trace(path))
+
+    def test_reproducible(self):
+        config = SimulationConfig(
+            capacity=20, visits=3000, arrivals_per_hour=60, seed=7, warmup_visits=100)
+        result = simulate(config)
+        self.assertEqual(result, simulate(config))
+        self.assertEqual(2900, result.arrivals)
+        self.assertTrue(0 < result.rejected < result.arrivals)
+        self.assertLessEqual(result.p95_occupancy, result.peak_occupancy)
+        self.assertLessEqual(result.peak_occupancy, 20)
+
+    def test_sweep_capacities(self):
+        config = SimulationConfig(visits=2000, arrivals_per_hour=60, seed=3)
+        serial = sweep_capacities(config, [10, 40], max_workers=1)
+        self.assertEqual(serial, sweep_capacities(config, [10, 40], max_workers=2))
+        self.assertListEqual([10, 40], [result.capacity for result in serial])
+        # same visits, fewer turned away by larger lot
+        self.assertGreater(serial[0].rejected, serial[1].rejected)
+
+        out = io.StringIO()
+        write_simulation_report(serial, out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertEqual("10", lines[1].split()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import random
+import unittest
+
+from parking_lot.sorted_list import SortedList
+
+
+class TestSortedList(unittest.TestCase):
+    def test_add_discard(self):
+        sorted_list = SortedList([5, 1, 3])
+        sorted_list.add(3)
+        self.assertEqual(3, len(sorted_list))
+        self.assertListEqual([1, 3, 5], list(sorted_list))
+        self.assertIn(3, sorted_list)
+        self.assertTrue(sorted_list.discard(3))
+        self.assertFalse(sorted_list.discard(3))
+        self.assertNotIn(3, sorted_list)
+        self.assertNotIn(9, sorted_list)
+        self.assertListEqual([1, 5], list(sorted_list))
+
+    def test_irange(self):
+        sorted_list = SortedList(["KA-01-HH-1234", "DL-12-AA-9999", "KA-01-BB-0001", "KA-02-A-1"])
+        self.assertListEqual(
+            ["KA-01-BB-0001", "KA-01-HH-1234", "KA-02-A-1"], list(sorted_list.irange("KA")))
+        self.assertListEqual([], list(sorted_list.irange("MH")))
+
+    def test_chunked_against_sorted(self):
+        rng = random.Random(7)
+        values = set()
+        sorted_list = SortedList()
+        for __ in range(20 * SortedList.LOAD):
+            value = rng.randrange(10 * SortedList.LOAD)
+            if value in values:
+                values.remove(value)
+                self.assertTrue(sorted_list.discard(value))
+            else:
+                values.add(value)
+                sorted_list.add(value)
+        expected = sorted(values)
+        self.assertEqual(len(expected), len(sorted_list))
+        self.assertListEqual(expected, list(sorted_list))
+        for start, stop in ((0, 10), (1500, 4200), (len(expected) - 3, None)):
+            self.assertListEqual(
+                expected[start:stop], list(sorted_list.islice(start, stop)))
+        self.assertListEqual([], list(sorted_list.islice(len(expected), None)))
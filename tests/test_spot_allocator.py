@@ -0,0 +1,196 @@
+import random
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.constants import ParkOutcome
+from parking_lot.spot_allocator import (
+    FarEndFirstSpotAllocator, FloorBalancedSpotAllocator,
+    MinHeapSpotAllocator, NearestToGateSpotAllocator
+)
+from parking_lot.vehicle import Car
+
+
+class TestMinHeapSpotAllocator(unittest.TestCase):
+    def test_acquire_lowest_free_spot(self):
+        spot_allocator = MinHeapSpotAllocator(5)
+        for i in range(5):
+            self.assertEqual(i, spot_allocator.peek())
+            self.assertEqual(i, spot_allocator.acquire())
+        self.assertEqual(-1, spot_allocator.peek())
+        self.assertEqual(-1, spot_allocator.acquire())
+
+    def test_release(self):
+        spot_allocator = MinHeapSpotAllocator(5)
+        for __ in range(5):
+            spot_allocator.acquire()
+        spot_allocator.release(3)
+        spot_allocator.release(1)
+        self.assertEqual(2, len(spot_allocator))
+        self.assertEqual(1, spot_allocator.acquire())
+        self.assertEqual(3, spot_allocator.acquire())
+        self.assertEqual(0, len(spot_allocator))
+
+    def test_claim(self):
+        spot_allocator = MinHeapSpotAllocator(6)
+        self.assertTrue(spot_allocator.claim(2))
+        self.assertFalse(spot_allocator.claim(6))
+        self.assertEqual(5, len(spot_allocator))
+        self.assertTrue(spot_allocator.claim(1))
+        self.assertFalse(spot_allocator.claim(1))
+        self.assertEqual(0, spot_allocator.acquire())
+        self.assertEqual(3, spot_allocator.peek())
+
+        spot_allocator.release(1)
+        self.assertEqual(1, spot_allocator.acquire())
+        self.assertEqual(3, spot_allocator.acquire())
+        self.assertEqual(2, len(spot_allocator))
+
+    def test_acquire_many(self):
+        rng = random.Random(7)
+        for make in (MinHeapSpotAllocator, FarEndFirstSpotAllocator):
+            bulk, single = make(64), make(64)
+            taken = []
+            for __ in range(200):
+                if taken and rng.random() < 0.5:
+                    index = taken.pop(rng.randrange(len(taken)))
+                    bulk.release(index)
+                    single.release(index)
+                elif rng.random() < 0.1:
+                    index = rng.randrange(64)
+                    if index not in taken:
+                        self.assertTrue(bulk.claim(index))
+                        self.assertTrue(single.claim(index))
+                        taken.append(index)
+                else:
+                    count = rng.randrange(1, 20)
+                    indexes = bulk.acquire_many(count)
+                    self.assertEqual(
+                        [i for i in (single.acquire() for __ in range(count)) if i >= 0],
+                        indexes)
+                    taken.extend(indexes)
+                self.assertEqual(len(single), len(bulk))
+
+    def test_resize(self):
+        spot_allocator = MinHeapSpotAllocator(4)
+        for __ in range(4):
+            spot_allocator.acquire()
+        spot_allocator.resize(6)
+        self.assertEqual(2, len(spot_allocator))
+        self.assertEqual(4, spot_allocator.acquire())
+
+        spot_allocator.release(3)
+        spot_allocator.release(1)
+        self.assertTrue(spot_allocator.claim(3))
+        spot_allocator.resize(3)
+        self.assertEqual(1, len(spot_allocator))
+        self.assertEqual(1, spot_allocator.acquire())
+        self.assertEqual(-1, spot_allocator.acquire())
+        with self.assertRaises(Exception):
+            FarEndFirstSpotAllocator(4).resize(5)
+
+
+class TestAllocationPolicies(unittest.TestCase):
+    def test_far_end_first(self):
+        spot_allocator = FarEndFirstSpotAllocator(4)
+        self.assertEqual(3, spot_allocator.peek())
+        self.assertEqual([3, 2], [spot_allocator.acquire() for __ in range(2)])
+        self.assertTrue(spot_allocator.claim(0))
+        self.assertFalse(spot_allocator.claim(4))
+        spot_allocator.release(3)
+        self.assertEqual([3, 1, -1], [spot_allocator.acquire() for __ in range(3)])
+
+    def test_nearest_to_gate(self):
+        # gate 0 at spot 0, gate 1 at spot 4
+        spot_allocator = NearestToGateSpotAllocator(
+            [[0, 1, 2, 3, 4], [4, 3, 2, 1, 0]])
+        self.assertEqual(4, spot_allocator.acquire(1))
+        self.assertEqual(0, spot_allocator.acquire())
+        self.assertEqual(3, spot_allocator.acquire(1))
+        self.assertTrue(spot_allocator.claim(1))
+        self.assertFalse(spot_allocator.claim(1))
+        self.assertEqual(1, len(spot_allocator))
+        self.assertEqual(2, spot_allocator.acquire(0))
+        self.assertEqual(-1, spot_allocator.acquire(1))
+
+        spot_allocator.release(3)
+        spot_allocator.release(0)
+        self.assertEqual(0, spot_allocator.peek())
+        self.assertEqual(3, spot_allocator.acquire(1))
+        self.assertEqual(0, spot_allocator.acquire(1))
+        self.assertRaises(Exception, spot_allocator.acquire, 2)
+        self.assertRaises(Exception, NearestToGateSpotAllocator, [[0, 1], [0]])
+
+    def test_floor_balanced(self):
+        spot_allocator = FloorBalancedSpotAllocator([0, 0, 0, 0, 1, 1])
+        self.assertEqual(
+            [0, 4, 1, 2, 5, 3, -1],
+            [spot_allocator.acquire() for __ in range(7)])
+        spot_allocator.release(1)
+        spot_allocator.release(5)
+        spot_allocator.release(2)
+        self.assertEqual(3, len(spot_allocator))
+        # floor 1 is half full, floor 0 at half too: lower floor first
+        self.assertEqual(1, spot_allocator.peek())
+        self.assertTrue(spot_allocator.claim(1))
+        self.assertEqual([5, 2, -1], [spot_allocator.acquire() for __ in range(3)])
+
+    def test_policies_against_scan(self):
+        rng = random.Random(7)
+        spots = 50
+        gate_distances = [
+            [abs(i - gate_spot) for i in range(spots)] for gate_spot in (0, 25, 49)]
+        spot_floors = [i % 3 for i in range(spots)]
+
+        def nearest(free, gate):
+            return min(free, key=lambda i: (gate_distances[gate][i], i))
+
+        def floor_balanced(free, gate):
+            def load(floor):
+                floor_spots = [i for i in range(spots) if spot_floors[i] == floor]
+                return sum(i not in free for i in floor_spots) / len(floor_spots)
+            floor = min(
+                (f for f in range(3) if any(spot_floors[i] == f for i in free)),
+                key=lambda f: (load(f), f))
+            return min(i for i in free if spot_floors[i] == floor)
+
+        policies = [
+            (MinHeapSpotAllocator(spots), lambda free, gate: min(free)),
+            (FarEndFirstSpotAllocator(spots), lambda free, gate: max(free)),
+            (NearestToGateSpotAllocator(gate_distances), nearest),
+            (FloorBalancedSpotAllocator(spot_floors), floor_balanced),
+        ]
+        for spot_allocator, scan in policies:
+            free = set(range(spots))
+            for __ in range(2000):
+                gate = rng.randrange(3)
+                if free and (rng.random() < 0.55 or len(free) == spots):
+                    expected = scan(free, gate)
+                    self.assertEqual(expected, spot_allocator.acquire(gate))
+                    free.discard(expected)
+                elif rng.random() < 0.1 and free:
+                    index = rng.choice(sorted(free))
+                    self.assertTrue(spot_allocator.claim(index))
+                    free.discard(index)
+                else:
+                    index = rng.choice(sorted(set(range(spots)) - free))
+                    spot_allocator.release(index)
+                    free.add(index)
+                self.assertEqual(len(free), len(spot_allocator))
+
+    def test_parking_lot_with_policy(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(
+            3, NearestToGateSpotAllocator([[0, 1, 2], [2, 1, 0]]))
+        parking_lot = director.get_parking_lot()
+        car = Car("KA-01-HH-1234", "White", gate=1)
+        self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertEqual(3, car.parking_spot.id_)
+        cars = [Car("KA-01-HH-9999", "Red"), Car("KA-01-BB-0001", "Red")]
+        self.assertEqual([ParkOutcome.PARKED] * 2, parking_lot.park_many(cars))
+        self.assertEqual([1, 2], [car.parking_spot.id_ for car in cars])
+        self.assertFalse(
+            parking_lot.allocate_parking_spot(Car("KA-01-HH-7777", "Red", gate=1)))
+
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        self.assertRaises(
+            Exception, director.build_parking_lot, 4, FarEndFirstSpotAllocator(3))
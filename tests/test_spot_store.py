@@ -0,0 +1,111 @@
+import unittest
+
+from parking_lot import ColumnarFourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.constants import ParkingSpotType
+from parking_lot.parking_spot import BaseParkingSpot, FourWheelerSpot, LargeSpot
+from parking_lot.spot_store import ColumnarSpotStore, LazySpotStore
+from parking_lot.vehicle import Car
+
+
+class TestLazySpotStore(unittest.TestCase):
+    def test_spots_made_on_first_touch(self):
+        store = LazySpotStore(
+            [(ParkingSpotType.FOUR_WHEELER, 3), (ParkingSpotType.LARGE, 2)])
+        self.assertEqual(5, len(store))
+        self.assertDictEqual({}, store._spots)
+        self.assertTrue(store.is_free(4))
+
+        parking_spot = store[3]
+        self.assertIsInstance(parking_spot, LargeSpot)
+        self.assertEqual(4, parking_spot.id_)
+        self.assertIs(parking_spot, store[-2])
+        self.assertIsInstance(store[2], FourWheelerSpot)
+        self.assertEqual(2, len(store._spots))
+        with self.assertRaises(IndexError):
+            store[5]
+
+    def test_resize(self):
+        store = LazySpotStore(
+            [(ParkingSpotType.FOUR_WHEELER, 1), (ParkingSpotType.LARGE, 2)])
+        store[2].occupy_spot(Car("DUMMY1", "White"))
+        store.resize(5)
+        self.assertIsInstance(store[4], LargeSpot)
+        self.assertFalse(store.is_free(2))
+
+        store.resize(2)
+        self.assertEqual(2, len(store))
+        self.assertListEqual([1, 2], [parking_spot.id_ for parking_spot in store])
+        store.resize(3)
+        self.assertTrue(store[2].is_free())
+        with self.assertRaises(Exception):
+            store.resize(0)
+
+        store = ColumnarSpotStore(2, ParkingSpotType.FOUR_WHEELER)
+        store.resize(4)
+        self.assertIs(ParkingSpotType.FOUR_WHEELER, store[3].parking_spot_type)
+        store.resize(1)
+        self.assertEqual(1, len(store))
+
+
+class TestColumnarSpotStore(unittest.TestCase):
+    cars_config = (
+        ("KA-01-HH-1234", "White"), 
+        ("KA-01-HH-9999", "White"), 
+        ("KA-01-BB-0001", "Black"), 
+        ("KA-01-HH-7777", "Red"), 
+    )
+
+    def _build_parking_lot(self, max_four_wheeler_spots):
+        director = ParkingLotDirector(ColumnarFourWheelerParkingLotBuilder())
+        director.build_parking_lot(max_four_wheeler_spots)
+        return director.get_parking_lot()
+
+    def test_parking_spot_view(self):
+        store = ColumnarSpotStore(3, ParkingSpotType.FOUR_WHEELER)
+        self.assertEqual(3, len(store))
+        parking_spot = store[1]
+        self.assertIsInstance(parking_spot, BaseParkingSpot)
+        # view carries only its position, no unused spot slots
+        self.assertNotIn('_vehicle', dir(parking_spot))
+        self.assertEqual(2, parking_spot.id_)
+        self.assertIs(ParkingSpotType.FOUR_WHEELER, parking_spot.parking_spot_type)
+        self.assertTrue(parking_spot.is_free())
+
+        car = Car("DUMMY1", "White")
+        parking_spot.occupy_spot(car)
+        self.assertFalse(store[1].is_free())
+        self.assertIs(car, store[1].vehicle)
+        self.assertTrue(store.is_free(0))
+
+        store[1].free_up_spot()
+        self.assertTrue(parking_spot.is_free())
+        self.assertIsNone(parking_spot.vehicle)
+        with self.assertRaises(IndexError):
+            store[3]
+
+    def test_columnar_parking_lot(self):
+        parking_lot = self._build_parking_lot(4)
+        cars = [Car(*config) for config in TestColumnarSpotStore.cars_config]
+        for car in cars:
+            self.assertTrue(parking_lot.allocate_parking_spot(car))
+        self.assertFalse(parking_lot.allocate_parking_spot(Car("DUMMY2", "Red")))
+        self.assertEqual(3, parking_lot.get_vehicle_spot_number("KA-01-BB-0001"))
+
+        self.assertTrue(parking_lot.free_up_parking_spot(2))
+        self.assertIsNone(cars[1].parking_spot)
+        self.assertFalse(parking_lot.free_up_parking_spot(2))
+        self.assertListEqual(
+            [1], parking_lot.get_parking_spot_numbers_of_vehicles_with_color("White"))
+        self.assertListEqual(
+            [
+                ('Slot No.', 'Registration No', 'Colour'),
+                (1, "KA-01-HH-1234", "White"),
+                (3, "KA-01-BB-0001", "Black"),
+                (4, "KA-01-HH-7777", "Red"),
+            ],
+            parking_lot.get_parking_lot_status()
+        )
+
+        car = Car("DUMMY3", "Blue")
+        parking_lot.allocate_parking_spot(car)
+        self.assertEqual(2, car.parking_spot.id_)
@@ -0,0 +1,57 @@
+import itertools
+import unittest
+
+from parking_lot import FourWheelerParkingLotBuilder, ParkingLotDirector
+from parking_lot.interning import COLORS
+from parking_lot.ticket_ledger import TicketLedger
+from parking_lot.vehicle import Car
+
+
+class TestTicketLedger(unittest.TestCase):
+    def test_open_close(self):
+        clock = itertools.count(start=100, step=10)
+        ticket_ledger = TicketLedger(clock=lambda: next(clock))
+        white = COLORS.encode("white")
+        self.assertEqual(0, ticket_ledger.open(7, 1, "KA-01-HH-1234", white))
+        self.assertEqual(1, ticket_ledger.open(8, 2, "KA-01-HH-9999", white))
+        self.assertTrue(ticket_ledger.is_open(7))
+
+        self.assertEqual(0, ticket_ledger.close(7))
+        self.assertFalse(ticket_ledger.is_open(7))
+        self.assertEqual(-1, ticket_ledger.close(7))
+
+        self.assertEqual(2, len(ticket_ledger))
+        self.assertEqual(
+            (7, 1, "KA-01-HH-1234", 100, 120), ticket_ledger.get_entry(0))
+        self.assertEqual(
+            (8, 2, "KA-01-HH-9999", 110, TicketLedger.OPEN),
+            ticket_ledger.get_entry(1))
+
+    def test_plates_stored_once(self):
+        ticket_ledger = TicketLedger()
+        white = COLORS.encode("white")
+        for ticket_id in range(3):
+            ticket_ledger.open(ticket_id, 1, "KA-01-HH-1234", white)
+            ticket_ledger.close(ticket_id)
+        self.assertEqual(1, len(ticket_ledger._plates))
+        self.assertListEqual(
+            ["KA-01-HH-1234"] * 3,
+            [entry.registration_number for entry in ticket_ledger]
+        )
+
+    def test_parking_lot_ticket_ledger(self):
+        director = ParkingLotDirector(FourWheelerParkingLotBuilder())
+        director.build_parking_lot(2)
+        parking_lot = director.get_parking_lot()
+        car = Car("KA-01-HH-1234", "White")
+        parking_lot.allocate_parking_spot(car)
+        ticket_id = car.ticket.id_
+        parking_lot.free_up_parking_spot(car.parking_spot.id_)
+
+        ticket_ledger = parking_lot.ticket_ledger
+        self.assertEqual(1, len(ticket_ledger))
+        entry = ticket_ledger.get_entry(0)
+        self.assertEqual(ticket_id, entry.ticket_id)
+        self.assertEqual(1, entry.spot_id)
+        self.assertEqual("KA-01-HH-1234", entry.registration_number)
+        self.assertGreaterEqual(entry.exit_time_ns, entry.entry_time_ns)
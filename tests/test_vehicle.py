@@ -23,6 +23,15 @@ class TestVehicle(unittest.TestCase):
             car = Car(*car_config)
             self.assertTrue(car.color.islower())
     
+    def test_vehicle_color_id(self):
+        """
+        Assert if cars of same color, in any case, share color id.
+        """
+        car = Car("KA-01-HH-1234", "White")
+        self.assertEqual(car.color_id, Car("KA-01-HH-9999", "WHITE").color_id)
+        self.assertNotEqual(car.color_id, Car("KA-01-BB-0001", "Black").color_id)
+        self.assertIs(car.color, Car("KA-01-HH-7777", "white").color)
+
     def test_vehicle_reg_no_is_upper_case(self):
         """
         Assert if car's registration number is upper-case.